@@ -225,6 +225,51 @@ class DatabaseClient:
                 results = await cur.fetchall()
                 return [dict(row) for row in results]
 
+    
+    async def get_coupling_loops(
+        self,
+        cascade_domain: Optional[str] = None,
+        component: Optional[str] = None,
+        limit: int = 50
+    ) -> List[Dict[str, Any]]:
+        """
+        Get active coupling loops from the latest loop scan.
+        
+        Args:
+            cascade_domain: Filter by cascade domain (power, timing, ...)
+            component: Only loops through a node whose name matches
+            limit: Maximum results
+            
+        Returns:
+            List of loops, shortest and most critical first
+        """
+        async with self.get_connection() as conn:
+            sql = """
+                SELECT
+                    loop_key, cascade_domain, loop_length, component_size,
+                    node_names, node_ids, relationship_ids,
+                    has_critical_edge, min_strength,
+                    first_detected_at, last_seen_at
+                FROM kg_coupling_loops
+                WHERE is_active
+            """
+            params = []
+            
+            if cascade_domain:
+                sql += " AND cascade_domain = %s"
+                params.append(cascade_domain)
+            if component:
+                sql += " AND EXISTS (SELECT 1 FROM unnest(node_names) AS n WHERE n ILIKE %s)"
+                params.append(f"%{component}%")
+            
+            sql += " ORDER BY has_critical_edge DESC, loop_length, min_strength DESC NULLS LAST LIMIT %s"
+            params.append(limit)
+            
+            async with conn.cursor() as cur:
+                await cur.execute(sql, params)
+                results = await cur.fetchall()
+                return [dict(row) for row in results]
+
 
 # Singleton instance
 db = DatabaseClient()
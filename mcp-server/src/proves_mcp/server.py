@@ -210,6 +210,39 @@ async def list_components(
         return {"error": str(e)}
 
 
+@mcp.tool()
+async def find_coupling_loops(
+    cascade_domain: Optional[str] = None,
+    component: Optional[str] = None,
+    limit: int = 50
+) -> dict:
+    """
+    Find feedback loops between components.
+    
+    A loop (e.g. power manager -> watchdog -> reset controller -> power
+    manager) means a failure can cascade back to where it started.
+    
+    Args:
+        cascade_domain: Filter by cascade domain (e.g., "power", "timing")
+        component: Only loops through this component (e.g., "watchdog")
+        limit: Maximum results (default 50)
+        
+    Returns:
+        Loops with their components in order, critical and shortest first
+    """
+    try:
+        loops = await db.get_coupling_loops(cascade_domain, component, limit)
+        return {
+            "loops": loops,
+            "count": len(loops),
+            "cascade_domain": cascade_domain,
+            "component": component
+        }
+    except Exception as e:
+        logger.error(f"find_coupling_loops failed: {e}")
+        return {"error": str(e)}
+
+
 # ============================================
 # REGISTRY TOOLS (Source location lookup)
 # ============================================
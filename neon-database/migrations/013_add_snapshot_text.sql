@@ -0,0 +1,35 @@
+-- ============================================================================
+-- Migration 013: Precomputed Snapshot Text
+-- ============================================================================
+-- Purpose: Store the stripped, whitespace-normalized text of each snapshot
+--          once, so lineage verification is a substring search instead of
+--          re-stripping the full payload for every candidate
+-- Date: 2026-10-19
+-- ============================================================================
+
+BEGIN;
+
+-- Keyed by content_hash: identical payloads captured from different URLs
+-- (or re-captured later) share one row
+CREATE TABLE IF NOT EXISTS snapshot_text (
+    content_hash TEXT PRIMARY KEY,
+    normalizer_version INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    text_size_bytes INTEGER NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- Rows written by an older normalizer are recomputed on read; this finds them
+CREATE INDEX IF NOT EXISTS idx_snapshot_text_version
+    ON snapshot_text(normalizer_version);
+
+COMMENT ON TABLE snapshot_text IS
+    'Stripped + whitespace-normalized text of raw_snapshots payloads (one row per content_hash)';
+
+COMMENT ON COLUMN snapshot_text.normalizer_version IS
+    'html_text.NORMALIZER_VERSION used to produce text; stale rows are recomputed by the validator';
+
+COMMENT ON COLUMN snapshot_text.text IS
+    'Payload with <script>/<style> removed, tags replaced by spaces, whitespace collapsed - the text evidence is quoted from';
+
+COMMIT;
@@ -0,0 +1,38 @@
+-- ============================================================================
+-- Migration 014: MinHash / LSH Near-Duplicate Index
+-- ============================================================================
+-- Purpose: Find near-duplicate pending extractions (same coupling extracted
+--          from overlapping pages with slightly different keys/evidence)
+--          with an index lookup instead of pairwise comparison
+-- Date: 2026-10-19
+-- ============================================================================
+
+BEGIN;
+
+-- MinHash signature over key + payload + evidence (production/core/minhash.py)
+ALTER TABLE staging_extractions ADD COLUMN IF NOT EXISTS
+    minhash_signature BIGINT[];
+
+-- One row per LSH band; extractions sharing (band, band_hash) are candidates
+CREATE TABLE IF NOT EXISTS extraction_lsh_bands (
+    extraction_id UUID NOT NULL REFERENCES staging_extractions(extraction_id) ON DELETE CASCADE,
+    band SMALLINT NOT NULL,
+    band_hash BIGINT NOT NULL,
+    PRIMARY KEY (extraction_id, band)
+);
+
+CREATE INDEX IF NOT EXISTS idx_lsh_bands_lookup
+    ON extraction_lsh_bands(band, band_hash);
+
+-- Backfill / streaming job picks up rows without a signature
+CREATE INDEX IF NOT EXISTS idx_extractions_minhash_missing
+    ON staging_extractions(created_at)
+    WHERE minhash_signature IS NULL;
+
+COMMENT ON COLUMN staging_extractions.minhash_signature IS
+    'MinHash signature (128 slots) of candidate key, payload and evidence for near-duplicate detection';
+
+COMMENT ON TABLE extraction_lsh_bands IS
+    'LSH band hashes of staging_extractions.minhash_signature; shared (band, band_hash) = near-duplicate candidate';
+
+COMMIT;
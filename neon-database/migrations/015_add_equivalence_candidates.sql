@@ -0,0 +1,47 @@
+-- ============================================================================
+-- Migration 015: Equivalence Candidates
+-- ============================================================================
+-- Purpose: Ranked cross-ecosystem equivalence proposals for human review,
+--          written by production/scripts/generate_equivalence_candidates.py.
+--          Accepted candidates are recorded in core_equivalences.
+-- Date: 2026-10-19
+-- ============================================================================
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS equivalence_candidates (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+
+    -- Pair is stored once, ordered entity_a_id < entity_b_id
+    entity_a_id UUID NOT NULL REFERENCES core_entities(id) ON DELETE CASCADE,
+    entity_b_id UUID NOT NULL REFERENCES core_entities(id) ON DELETE CASCADE,
+
+    score NUMERIC(5,4) NOT NULL,
+    -- Best rank of this pair among either entity's candidates (1 = top)
+    candidate_rank SMALLINT NOT NULL,
+    -- Blocks the pair was found in, e.g. {"component|tok:i2c", "component|bus:i2c"}
+    block_keys TEXT[] NOT NULL,
+
+    -- pending -> accepted (moved to core_equivalences) / rejected
+    status TEXT NOT NULL DEFAULT 'pending',
+    generated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    reviewed_at TIMESTAMPTZ,
+    reviewed_by TEXT,
+
+    CONSTRAINT equivalence_candidates_ordered CHECK (entity_a_id < entity_b_id),
+    CONSTRAINT unique_equivalence_candidate UNIQUE (entity_a_id, entity_b_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_equivalence_candidates_review
+    ON equivalence_candidates(status, score DESC);
+
+CREATE INDEX IF NOT EXISTS idx_equivalence_candidates_b
+    ON equivalence_candidates(entity_b_id);
+
+COMMENT ON TABLE equivalence_candidates IS
+    'Machine-proposed cross-ecosystem equivalences (blocking + embedding similarity) awaiting review';
+
+COMMENT ON COLUMN equivalence_candidates.block_keys IS
+    'Blocking keys shared by the pair: entity_type plus name token, bus type or address';
+
+COMMIT;
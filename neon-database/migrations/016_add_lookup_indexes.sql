@@ -0,0 +1,29 @@
+-- ============================================================================
+-- Migration 016: Indexes for Snapshot and Pipeline Run Lookups
+-- ============================================================================
+-- Purpose: Serve the two lookups every store call makes (cache misses in
+--          production/core/lookup_cache.py) from an index:
+--          - latest raw_snapshots row for a source_url
+--          - active (pending) pipeline_runs row for a run_name
+-- Date: 2026-10-19
+-- ============================================================================
+
+BEGIN;
+
+-- WHERE source_url = ? ORDER BY captured_at DESC LIMIT 1, and
+-- DISTINCT ON (source_url) ... ORDER BY source_url, captured_at DESC
+CREATE INDEX IF NOT EXISTS idx_raw_snapshots_url_captured
+    ON raw_snapshots(source_url, captured_at DESC);
+
+-- WHERE run_name = ? AND score_status = 'pending' ORDER BY created_at DESC LIMIT 1
+CREATE INDEX IF NOT EXISTS idx_pipeline_runs_pending_name
+    ON pipeline_runs(run_name, created_at DESC)
+    WHERE score_status = 'pending';
+
+COMMENT ON INDEX idx_raw_snapshots_url_captured IS
+    'Latest snapshot per source_url (store_extraction / store_extractions_bulk snapshot resolution)';
+
+COMMENT ON INDEX idx_pipeline_runs_pending_name IS
+    'Active pipeline run per run_name (get_or_create_pipeline_run)';
+
+COMMIT;
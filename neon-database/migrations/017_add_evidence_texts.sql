@@ -0,0 +1,57 @@
+-- ============================================================================
+-- Migration 017: Deduplicated Evidence Text Store
+-- ============================================================================
+-- Purpose: Store each evidence quote once, keyed by evidence_checksum,
+--          instead of embedding raw_text in the evidence JSONB of every
+--          staging_extractions row that cites it
+-- Date: 2026-10-19
+-- ============================================================================
+
+BEGIN;
+
+-- One row per distinct quote. The snapshot byte range is where the quote
+-- was first located; each extraction keeps its own evidence_byte_offset.
+CREATE TABLE IF NOT EXISTS evidence_texts (
+    evidence_checksum TEXT PRIMARY KEY,      -- 'sha256:' || hex digest of raw_text (UTF-8)
+    raw_text TEXT NOT NULL,
+    text_size_bytes INTEGER NOT NULL,
+    snapshot_id UUID REFERENCES raw_snapshots(id) ON DELETE SET NULL,
+    byte_offset INTEGER,
+    byte_length INTEGER,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- Backfill from existing rows (earliest extraction wins the byte range)
+INSERT INTO evidence_texts (
+    evidence_checksum, raw_text, text_size_bytes, snapshot_id, byte_offset, byte_length
+)
+SELECT DISTINCT ON (evidence_checksum)
+    evidence_checksum,
+    evidence->>'raw_text',
+    octet_length(evidence->>'raw_text'),
+    snapshot_id,
+    evidence_byte_offset,
+    evidence_byte_length
+FROM staging_extractions
+WHERE evidence_checksum IS NOT NULL
+  AND evidence->>'raw_text' IS NOT NULL
+ORDER BY evidence_checksum, created_at
+ON CONFLICT (evidence_checksum) DO NOTHING;
+
+-- Drop the embedded copies that now live in evidence_texts
+UPDATE staging_extractions s
+SET evidence = s.evidence - 'raw_text'
+FROM evidence_texts et
+WHERE et.evidence_checksum = s.evidence_checksum
+  AND s.evidence ? 'raw_text';
+
+COMMENT ON TABLE evidence_texts IS
+    'Evidence quotes stored once per evidence_checksum; staging_extractions rows reference them by evidence_checksum';
+
+COMMENT ON COLUMN evidence_texts.byte_offset IS
+    'Byte offset of the quote in snapshot_id payload where it was first located (NULL if not found)';
+
+COMMENT ON COLUMN staging_extractions.evidence_checksum IS
+    'SHA256 of the evidence quote; the quote itself is evidence_texts.raw_text (legacy rows may still carry evidence->>''raw_text'')';
+
+COMMIT;
@@ -0,0 +1,51 @@
+-- ============================================================================
+-- Migration 018: Change Tracking for Knowledge Graph Tables
+-- ============================================================================
+-- Purpose: Let the in-memory graph cache (production/core/graph_cache.py)
+--          refresh incrementally: every kg_nodes / kg_relationships change
+--          bumps updated_at, and the cache re-reads rows past its watermark
+-- Date: 2026-10-19
+-- ============================================================================
+
+BEGIN;
+
+ALTER TABLE kg_nodes ADD COLUMN IF NOT EXISTS
+    updated_at TIMESTAMPTZ DEFAULT NOW();
+
+ALTER TABLE kg_relationships ADD COLUMN IF NOT EXISTS
+    updated_at TIMESTAMPTZ DEFAULT NOW();
+
+CREATE OR REPLACE FUNCTION update_kg_updated_at()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.updated_at = NOW();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trigger_update_kg_node_timestamp ON kg_nodes;
+CREATE TRIGGER trigger_update_kg_node_timestamp
+BEFORE UPDATE ON kg_nodes
+FOR EACH ROW
+EXECUTE FUNCTION update_kg_updated_at();
+
+DROP TRIGGER IF EXISTS trigger_update_kg_relationship_timestamp ON kg_relationships;
+CREATE TRIGGER trigger_update_kg_relationship_timestamp
+BEFORE UPDATE ON kg_relationships
+FOR EACH ROW
+EXECUTE FUNCTION update_kg_updated_at();
+
+-- Incremental refresh: WHERE updated_at > watermark
+CREATE INDEX IF NOT EXISTS idx_kg_nodes_updated_at
+    ON kg_nodes(updated_at);
+
+CREATE INDEX IF NOT EXISTS idx_kg_relationships_updated_at
+    ON kg_relationships(updated_at);
+
+COMMENT ON COLUMN kg_nodes.updated_at IS
+    'Last insert/update time (trigger-maintained); graph cache refresh watermark';
+
+COMMENT ON COLUMN kg_relationships.updated_at IS
+    'Last insert/update time (trigger-maintained); graph cache refresh watermark';
+
+COMMIT;
@@ -0,0 +1,44 @@
+-- ============================================================================
+-- Migration 019: Predicted Couplings
+-- ============================================================================
+-- Purpose: Candidate kg_relationships proposed by the GraphSAGE link
+--          predictor (production/scripts/predict_couplings.py) for review.
+--          Accepted candidates become kg_relationships rows.
+-- Date: 2026-10-19
+-- ============================================================================
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS predicted_couplings (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+
+    -- Pair is stored once, ordered node_a_id < node_b_id (the model is undirected)
+    node_a_id UUID NOT NULL REFERENCES kg_nodes(id) ON DELETE CASCADE,
+    node_b_id UUID NOT NULL REFERENCES kg_nodes(id) ON DELETE CASCADE,
+
+    score NUMERIC(5,4) NOT NULL,             -- sigmoid(embedding dot product)
+    model_version TEXT NOT NULL,             -- e.g. 'graphsage-20261019T120000Z'
+
+    -- pending -> accepted (added to kg_relationships) / rejected
+    status TEXT NOT NULL DEFAULT 'pending',
+    generated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    reviewed_at TIMESTAMPTZ,
+    reviewed_by TEXT,
+
+    CONSTRAINT predicted_couplings_ordered CHECK (node_a_id < node_b_id),
+    CONSTRAINT unique_predicted_coupling UNIQUE (node_a_id, node_b_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_predicted_couplings_review
+    ON predicted_couplings(status, score DESC);
+
+CREATE INDEX IF NOT EXISTS idx_predicted_couplings_b
+    ON predicted_couplings(node_b_id);
+
+COMMENT ON TABLE predicted_couplings IS
+    'Hidden couplings predicted by GraphSAGE link prediction over kg_nodes / kg_relationships, awaiting review';
+
+COMMENT ON COLUMN predicted_couplings.score IS
+    'Link probability from the model that produced the row (model_version); re-runs overwrite pending rows';
+
+COMMIT;
@@ -0,0 +1,49 @@
+-- ============================================================================
+-- Migration 020: Cached Knowledge Graph Node Metrics
+-- ============================================================================
+-- Purpose: Store centrality / criticality metrics per node and cascade_domain
+--          (production/core/graph_metrics.py) so reviewers can rank coupling
+--          hubs without recomputing them. kg_metrics_state records what each
+--          domain was computed from, so only domains with edge churn are
+--          recomputed.
+-- Date: 2026-10-19
+-- ============================================================================
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS kg_node_metrics (
+    node_id UUID NOT NULL REFERENCES kg_nodes(id) ON DELETE CASCADE,
+    cascade_domain TEXT NOT NULL,            -- power, data, thermal, timing, or 'all'
+    in_degree INTEGER NOT NULL,
+    out_degree INTEGER NOT NULL,
+    pagerank DOUBLE PRECISION NOT NULL,
+    betweenness DOUBLE PRECISION NOT NULL,   -- unnormalized; sampled estimate on large domains
+    is_articulation_point BOOLEAN NOT NULL,
+    computed_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+
+    PRIMARY KEY (cascade_domain, node_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_kg_node_metrics_pagerank
+    ON kg_node_metrics(cascade_domain, pagerank DESC);
+
+CREATE INDEX IF NOT EXISTS idx_kg_node_metrics_betweenness
+    ON kg_node_metrics(cascade_domain, betweenness DESC);
+
+CREATE INDEX IF NOT EXISTS idx_kg_node_metrics_node
+    ON kg_node_metrics(node_id);
+
+CREATE TABLE IF NOT EXISTS kg_metrics_state (
+    cascade_domain TEXT PRIMARY KEY,
+    edge_count INTEGER NOT NULL,             -- dependency edges when computed
+    edges_updated_at TIMESTAMPTZ,            -- latest kg_relationships.updated_at when computed
+    computed_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+COMMENT ON TABLE kg_node_metrics IS
+    'PageRank, degree, betweenness and articulation points over depends_on/requires edges, per cascade_domain (''all'' = every edge)';
+
+COMMENT ON TABLE kg_metrics_state IS
+    'Edge fingerprint each kg_node_metrics domain was computed from; a changed fingerprint triggers recomputation';
+
+COMMIT;
@@ -0,0 +1,51 @@
+-- ============================================================================
+-- Migration 021: Coupling Loop Report
+-- ============================================================================
+-- Purpose: Feedback loops in kg_relationships per cascade_domain, found by
+--          production/core/coupling_loops.py (Tarjan SCC + Johnson cycles),
+--          for the MCP server and the progress report
+-- Date: 2026-10-19
+-- ============================================================================
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS kg_coupling_loops (
+    -- sha1 of cascade_domain + node UUID sequence (rotated to start at the smallest)
+    loop_key TEXT PRIMARY KEY,
+    cascade_domain TEXT NOT NULL,
+
+    component_size INTEGER NOT NULL,         -- nodes in the SCC containing the loop
+    loop_length INTEGER NOT NULL,            -- relationships in the loop
+    node_ids UUID[] NOT NULL,                -- in loop order
+    node_names TEXT[] NOT NULL,
+    relationship_ids UUID[] NOT NULL,        -- relationship_ids[i] links node_ids[i] -> node_ids[i+1]
+    has_critical_edge BOOLEAN NOT NULL,
+    min_strength NUMERIC(5,4),               -- weakest link (NULL if no strengths recorded)
+
+    first_detected_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    last_seen_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    is_active BOOLEAN NOT NULL DEFAULT TRUE  -- FALSE once a full scan no longer finds it
+);
+
+CREATE INDEX IF NOT EXISTS idx_kg_coupling_loops_domain
+    ON kg_coupling_loops(cascade_domain, is_active, loop_length);
+
+CREATE INDEX IF NOT EXISTS idx_kg_coupling_loops_nodes
+    ON kg_coupling_loops USING GIN (node_ids);
+
+CREATE TABLE IF NOT EXISTS kg_loop_scans (
+    cascade_domain TEXT PRIMARY KEY,
+    components INTEGER NOT NULL,             -- SCCs with a loop (size > 1 or self-loop)
+    nodes_in_loops INTEGER NOT NULL,
+    loops_found INTEGER NOT NULL,
+    truncated BOOLEAN NOT NULL,              -- cycle cap reached; loops_found is a lower bound
+    scanned_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+COMMENT ON TABLE kg_coupling_loops IS
+    'Elementary feedback loops (A -> ... -> A) within one cascade_domain; inactive rows are loops that have since been broken';
+
+COMMENT ON TABLE kg_loop_scans IS
+    'Latest coupling loop scan per cascade_domain';
+
+COMMIT;
@@ -0,0 +1,29 @@
+-- ============================================================================
+-- Migration 022: Indexes for Batched Relationship Lookups
+-- ============================================================================
+-- Purpose: Serve GraphManager.get_relationships_for_nodes() and
+--          relationship_exists() (production/core/graph_manager.py) from an
+--          index when the graph cache is disabled:
+--          - edges of many nodes at once (source/target = ANY(...))
+--          - one (source, relationship_type, target) existence probe
+-- Date: 2026-10-19
+-- ============================================================================
+
+BEGIN;
+
+-- WHERE source_node_id = ANY(?) [AND relationship_type = ANY(?)], and
+-- WHERE source_node_id = ? AND relationship_type = ? AND target_node_id = ?
+CREATE INDEX IF NOT EXISTS idx_kg_relationships_source_type_target
+    ON kg_relationships(source_node_id, relationship_type, target_node_id);
+
+-- WHERE target_node_id = ANY(?) [AND relationship_type = ANY(?)]
+CREATE INDEX IF NOT EXISTS idx_kg_relationships_target_type
+    ON kg_relationships(target_node_id, relationship_type);
+
+COMMENT ON INDEX idx_kg_relationships_source_type_target IS
+    'Outgoing edges per node and duplicate checks (get_relationships_for_nodes / relationship_exists)';
+
+COMMENT ON INDEX idx_kg_relationships_target_type IS
+    'Incoming edges per node (get_relationships_for_nodes)';
+
+COMMIT;
@@ -0,0 +1,20 @@
+-- ============================================================================
+-- Migration 023: Keyset Pagination Index for kg_nodes
+-- ============================================================================
+-- Purpose: Serve GraphManager.search_nodes() pages and iter_nodes()
+--          (production/core/graph_manager.py) in (created_at, id) order from
+--          an index, so page N costs the same as page 1
+-- Date: 2026-10-19
+-- ============================================================================
+
+BEGIN;
+
+-- ORDER BY created_at DESC, id DESC, and
+-- WHERE (created_at, id) < (?, ?) ORDER BY created_at DESC, id DESC LIMIT ?
+CREATE INDEX IF NOT EXISTS idx_kg_nodes_created_id
+    ON kg_nodes(created_at, id);
+
+COMMENT ON INDEX idx_kg_nodes_created_id IS
+    'Keyset cursor for kg_nodes searches, newest first (search_nodes / iter_nodes)';
+
+COMMIT;
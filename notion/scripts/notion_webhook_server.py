@@ -159,12 +159,16 @@ async def sync_extraction_to_notion(extraction_id: str):
             async with conn.cursor() as cur:
                 await cur.execute("""
                     SELECT
-                        extraction_id, candidate_type, candidate_key, status,
-                        confidence_score, confidence_reason, ecosystem, evidence,
-                        created_at, lineage_verified, lineage_confidence,
-                        candidate_payload, snapshot_id, evidence_type
-                    FROM staging_extractions
-                    WHERE extraction_id = %s::uuid
+                        s.extraction_id, s.candidate_type, s.candidate_key, s.status,
+                        s.confidence_score, s.confidence_reason, s.ecosystem,
+                        CASE WHEN et.raw_text IS NULL THEN s.evidence
+                             ELSE jsonb_build_object('raw_text', et.raw_text) || COALESCE(s.evidence, '{}'::jsonb)
+                        END AS evidence,
+                        s.created_at, s.lineage_verified, s.lineage_confidence,
+                        s.candidate_payload, s.snapshot_id, s.evidence_type
+                    FROM staging_extractions s
+                    LEFT JOIN evidence_texts et ON et.evidence_checksum = s.evidence_checksum
+                    WHERE s.extraction_id = %s::uuid
                 """, (extraction_id,))
 
                 row = await cur.fetchone()
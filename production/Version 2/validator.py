@@ -224,13 +224,10 @@ def check_if_dependency_exists(source: str, target: str, relationship_type: str)
         if not source_node:
             return f"[NEW] Component '{source}' doesn't exist yet. Safe to add."
 
-        # Check existing relationships
-        existing = gm.get_node_relationships(source_node['id'], direction='outgoing')
-
         # Check for exact match
-        for rel in existing:
-            if rel['target_name'] == target and rel['relationship_type'] == relationship_type:
-                return f"[DUPLICATE] Already exists: {source} --[{relationship_type}]--> {target}"
+        target_node = gm.get_node_by_name(target)
+        if target_node and gm.relationship_exists(source_node['id'], target_node['id'], relationship_type):
+            return f"[DUPLICATE] Already exists: {source} --[{relationship_type}]--> {target}"
 
         # Check for conflicts
         if relationship_type == 'conflicts_with':
@@ -276,11 +273,13 @@ def search_similar_dependencies(component_name: str) -> str:
         if not similar:
             return f"No similar components found for '{component_name}'"
 
+        # Get their dependencies
+        deps_by_node = gm.get_relationships_for_nodes([node['id'] for node in similar], direction='outgoing')
+
         result = f"Found {len(similar)} similar components:\n"
         for node in similar:
             result += f"  - {node['name']} ({node['node_type']})\n"
-            # Get their dependencies
-            deps = gm.get_node_relationships(node['id'], direction='outgoing')
+            deps = deps_by_node[str(node['id'])]
             if deps:
                 result += f"    Has {len(deps)} dependencies\n"
 
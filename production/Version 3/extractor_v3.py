@@ -23,16 +23,26 @@ Supports:
 All fetched content is stored in raw_snapshots for auditability.
 """
 import os
-import re
+import sys
 import hashlib
 import uuid
 from datetime import datetime
+from pathlib import Path
 import httpx
 from langchain_anthropic import ChatAnthropic
 from langchain_core.tools import tool
 from langgraph.prebuilt import create_react_agent
 from langsmith import traceable
 
+# Add production/core to path for shared utilities
+version3_folder = Path(__file__).parent  # production/Version 3/
+project_root = version3_folder.parent.parent  # PROVES_LIBRARY/
+core_path = project_root / 'production' / 'core'
+sys.path.insert(0, str(core_path))
+
+from html_text import NORMALIZER_VERSION, get_text_view
+from lookup_cache import get_lookup_cache, get_or_create_pipeline_run
+
 
 @tool
 def get_ontology() -> str:
@@ -79,29 +89,6 @@ def get_db_connection():
     return psycopg.connect(db_url)
 
 
-def get_or_create_pipeline_run(conn, run_name: str = "curator_extraction") -> str:
-    """Get or create a pipeline run for tracking. Returns run_id."""
-    import json
-    with conn.cursor() as cur:
-        # Check for existing active run
-        cur.execute("""
-            SELECT id FROM pipeline_runs
-            WHERE run_name = %s AND score_status = 'pending'
-            ORDER BY created_at DESC LIMIT 1
-        """, (run_name,))
-        existing = cur.fetchone()
-        if existing:
-            return str(existing[0])
-
-        # Create new run
-        cur.execute("""
-            INSERT INTO pipeline_runs (run_name, run_type, triggered_by)
-            VALUES (%s, 'extraction', 'extractor_agent')
-            RETURNING id
-        """, (run_name,))
-        return str(cur.fetchone()[0])
-
-
 # create_lineage_data() REMOVED - lineage is computed deterministically by storage.py
 # This ensures single-source-of-truth for lineage computation with:
 # - Exact UTF-8 byte matching
@@ -110,6 +97,35 @@ def get_or_create_pipeline_run(conn, run_name: str = "curator_extraction") -> st
 # - Persisted verification metadata
 
 
+def store_snapshot_text(cur, snapshots) -> None:
+    """
+    Store stripped text for snapshots in snapshot_text (one row per content_hash).
+
+    Lineage verification searches this text instead of re-stripping the payload.
+
+    Args:
+        cur: Open cursor (caller commits)
+        snapshots: Iterable of (content_hash, content) pairs
+    """
+    rows = []
+    for content_hash, content in snapshots:
+        text = get_text_view(content, content_hash).text
+        rows.append((content_hash, NORMALIZER_VERSION, text, len(text.encode('utf-8'))))
+    if not rows:
+        return
+
+    cur.executemany("""
+        INSERT INTO snapshot_text (content_hash, normalizer_version, text, text_size_bytes)
+        VALUES (%s, %s, %s, %s)
+        ON CONFLICT (content_hash) DO UPDATE SET
+            normalizer_version = EXCLUDED.normalizer_version,
+            text = EXCLUDED.text,
+            text_size_bytes = EXCLUDED.text_size_bytes,
+            created_at = NOW()
+        WHERE snapshot_text.normalizer_version <> EXCLUDED.normalizer_version
+    """, rows)
+
+
 def store_raw_snapshot(source_url: str, source_type: str, ecosystem: str, content: str, content_hash: str) -> str:
     """Store raw content in raw_snapshots table. Returns snapshot_id."""
     import json
@@ -129,7 +145,7 @@ def store_raw_snapshot(source_url: str, source_type: str, ecosystem: str, conten
                 return str(existing[0])  # Return existing snapshot ID
 
             # Get or create pipeline run
-            run_id = get_or_create_pipeline_run(conn)
+            run_id = get_or_create_pipeline_run(conn, triggered_by="extractor_agent")
 
             # Store content as JSONB payload
             payload = json.dumps({"content": content, "format": "text"})
@@ -152,8 +168,14 @@ def store_raw_snapshot(source_url: str, source_type: str, ecosystem: str, conten
                 run_id
             ))
             snapshot_id = cur.fetchone()[0]
+
+            # Precompute the text evidence is verified against
+            store_snapshot_text(cur, [(content_hash, content)])
         conn.commit()
         conn.close()
+
+        # Storage resolves this page's snapshot by URL next
+        get_lookup_cache().remember_snapshot(source_url, snapshot_id)
         return str(snapshot_id)
     except Exception as e:
         return f"ERROR: {str(e)}"
@@ -236,11 +258,8 @@ def fetch_webpage(url: str) -> str:
             content_hash=content_hash
         )
 
-        # Strip HTML tags for cleaner extraction (basic approach)
-        text_content = re.sub(r'<script[^>]*>.*?</script>', '', content, flags=re.DOTALL)
-        text_content = re.sub(r'<style[^>]*>.*?</style>', '', text_content, flags=re.DOTALL)
-        text_content = re.sub(r'<[^>]+>', ' ', text_content)
-        text_content = re.sub(r'\s+', ' ', text_content).strip()
+        # Strip HTML tags for cleaner extraction (shared with lineage verification)
+        text_content = get_text_view(content, content_hash).text
 
         max_chars = 50000
         if len(text_content) > max_chars:
@@ -324,6 +343,50 @@ def fetch_github_file(owner: str, repo: str, path: str, branch: str = "main") ->
         return f"Error fetching {owner}/{repo}/{path}: {str(e)}"
 
 
+@tool
+def read_snapshot(source_url: str) -> str:
+    """
+    Read the latest stored snapshot for a URL without fetching it again.
+
+    Use this for GitHub file URLs queued by production/scripts/ingest_repo.py
+    (https://github.com/<owner>/<repo>/blob/<branch>/<path>). Those files were
+    already captured in raw_snapshots in bulk, so no network access is needed.
+
+    Returns the file content with its Snapshot ID for citation.
+    """
+    try:
+        import json
+        conn = get_db_connection()
+        with conn.cursor() as cur:
+            cur.execute("""
+                SELECT id, payload
+                FROM raw_snapshots
+                WHERE source_url = %s AND status = 'captured'::snapshot_status
+                ORDER BY captured_at DESC
+                LIMIT 1
+            """, (source_url,))
+            row = cur.fetchone()
+        conn.close()
+
+        if not row:
+            return f"No snapshot found for {source_url}. Use fetch_webpage or fetch_github_file instead."
+
+        snapshot_id, payload = row
+        if not isinstance(payload, dict):
+            payload = json.loads(payload)
+        content = payload.get('content', '')
+        chars = len(content)
+        lines = content.count('\n') + 1
+
+        max_chars = 50000
+        if chars > max_chars:
+            content = content[:max_chars] + f"\n\n... (truncated, showing first {max_chars} of {chars} characters)"
+
+        return f"Source: {source_url}\nSnapshot ID: {snapshot_id}\nSize: {chars} characters, {lines} lines\n\nContent:\n{content}"
+    except Exception as e:
+        return f"Error reading snapshot for {source_url}: {str(e)}"
+
+
 @tool
 def list_github_directory(owner: str, repo: str, path: str = "", branch: str = "main") -> str:
     """
@@ -35,6 +35,7 @@ load_dotenv(project_root / '.env')
 
 # Import from v3 agent
 from agent_v3 import graph
+from write_behind_v3 import replay_orphaned_journals
 
 
 def ensure_webhook_server_running():
@@ -343,6 +344,9 @@ def main():
     ensure_webhook_server_running()
     print()
 
+    # Flush candidates journaled by write-behind runs that crashed
+    replay_orphaned_journals()
+
     if args.continuous:
         print("\nMode: Continuous (process until queue empty)")
         total_processed = 0
@@ -4,20 +4,21 @@ Specialized agent for storing findings and dependencies in the knowledge graph
 
 DOMAIN TABLE WORKFLOW (2024-12-22):
 1. store_extraction() - Store extracted entities in staging_extractions
-2. promote_to_core() - Move validated entities to core_entities
+2. promote_to_core() / promote_to_core_batch() - Move validated entities to core_entities
 3. store_equivalence() - Link entities across ecosystems
 
 Tables used:
 - staging_extractions: Raw extracted entities awaiting validation
 - core_entities: Validated, promoted entities (source of truth)
 - core_equivalences: Cross-ecosystem entity mappings
+- evidence_texts: Evidence quotes, stored once per evidence_checksum
 """
 import sys
 import os
 import hashlib
 import uuid
 from datetime import datetime
-from typing import Literal
+from typing import List, Literal
 from pathlib import Path
 
 # Add production/core to path for database utilities
@@ -32,6 +33,9 @@ from langgraph.prebuilt import create_react_agent
 from langsmith import traceable
 
 from graph_manager import GraphManager
+from html_text import get_text_view
+from lookup_cache import get_lookup_cache, get_or_create_pipeline_run
+import minhash
 
 
 def get_db_connection():
@@ -49,24 +53,223 @@ def get_db_connection():
     return psycopg.connect(db_url)
 
 
-def get_or_create_pipeline_run(conn, run_name: str = "curator_extraction") -> str:
-    """Get or create a pipeline run for tracking. Returns run_id."""
+def annotate_near_duplicates(conn, extraction_id: str) -> list:
+    """
+    Index an extraction's MinHash signature and annotate near-duplicates.
+
+    Computes the signature over key, payload and evidence, stores it with its
+    LSH bands, then looks up pending extractions sharing any band. Pairs whose
+    estimated Jaccard reaches minhash.NEAR_DUPLICATE_THRESHOLD are recorded in
+    evidence.duplicate_check.near_duplicates on BOTH extractions, along with a
+    near_duplicate_cluster id (the earliest cluster member's id) so reviewers
+    can handle a cluster together. Safe to re-run: an entry for a neighbour
+    that is already listed replaces the old one. Commits.
+
+    Returns:
+        List of {"extraction_id", "candidate_key", "similarity"} near-duplicates
+    """
+    import json
+
     with conn.cursor() as cur:
         cur.execute("""
-            SELECT id FROM pipeline_runs 
-            WHERE run_name = %s AND score_status = 'pending'
-            ORDER BY created_at DESC LIMIT 1
-        """, (run_name,))
-        existing = cur.fetchone()
-        if existing:
-            return str(existing[0])
-        
+            SELECT s.candidate_key, s.candidate_payload,
+                   COALESCE(et.raw_text, s.evidence->>'raw_text'),
+                   s.evidence->'duplicate_check'->>'near_duplicate_cluster'
+            FROM staging_extractions s
+            LEFT JOIN evidence_texts et ON et.evidence_checksum = s.evidence_checksum
+            WHERE s.extraction_id = %s::uuid
+        """, (extraction_id,))
+        row = cur.fetchone()
+        if not row:
+            return []
+        candidate_key, payload, raw_text, own_cluster = row
+
+        sig = minhash.signature(minhash.shingles(candidate_key, payload, raw_text))
+        bands = minhash.band_hashes(sig)
+
+        cur.execute("""
+            UPDATE staging_extractions SET minhash_signature = %s
+            WHERE extraction_id = %s::uuid
+        """, (sig, extraction_id))
+        cur.executemany("""
+            INSERT INTO extraction_lsh_bands (extraction_id, band, band_hash)
+            VALUES (%s::uuid, %s, %s)
+            ON CONFLICT (extraction_id, band) DO UPDATE SET band_hash = EXCLUDED.band_hash
+        """, [(extraction_id, band, band_hash) for band, band_hash in enumerate(bands)])
+
+        # Candidates: pending extractions sharing at least one band
         cur.execute("""
-            INSERT INTO pipeline_runs (run_name, run_type, triggered_by)
-            VALUES (%s, 'extraction', 'storage_agent')
-            RETURNING id
-        """, (run_name,))
-        return str(cur.fetchone()[0])
+            SELECT DISTINCT s.extraction_id::text, s.candidate_key, s.minhash_signature,
+                   s.evidence->'duplicate_check'->>'near_duplicate_cluster', s.created_at
+            FROM extraction_lsh_bands b
+            JOIN unnest(%s::smallint[], %s::bigint[]) AS q(band, band_hash)
+              ON b.band = q.band AND b.band_hash = q.band_hash
+            JOIN staging_extractions s ON s.extraction_id = b.extraction_id
+            WHERE b.extraction_id <> %s::uuid
+              AND s.status = 'pending'::candidate_status
+        """, (list(range(len(bands))), bands, extraction_id))
+        candidates = cur.fetchall()
+
+        near = []
+        for other_id, other_key, other_sig, other_cluster, created_at in candidates:
+            sim = minhash.estimate_jaccard(sig, other_sig or [])
+            if sim >= minhash.NEAR_DUPLICATE_THRESHOLD:
+                near.append((other_id, other_key, round(sim, 3), other_cluster, created_at))
+
+        if near:
+            # Join the earliest existing cluster, else start one at the earliest member
+            near.sort(key=lambda n: n[4])
+            cluster = own_cluster or next((n[3] for n in near if n[3]), None) or near[0][0]
+
+            def annotate(target_id: str, entries: list) -> None:
+                # Entries for the same neighbours replace earlier ones, so
+                # re-annotating (re-runs, bulk store + script) never repeats them
+                cur.execute("""
+                    UPDATE staging_extractions
+                    SET evidence = jsonb_set(
+                        COALESCE(evidence, '{}'::jsonb),
+                        '{duplicate_check}',
+                        CASE WHEN jsonb_typeof(evidence->'duplicate_check') = 'object'
+                             THEN evidence->'duplicate_check' ELSE '{}'::jsonb END
+                        || jsonb_build_object(
+                            'near_duplicates',
+                            COALESCE((
+                                SELECT jsonb_agg(e)
+                                FROM jsonb_array_elements(
+                                    CASE WHEN jsonb_typeof(evidence->'duplicate_check'->'near_duplicates') = 'array'
+                                         THEN evidence->'duplicate_check'->'near_duplicates' ELSE '[]'::jsonb END
+                                ) AS e
+                                WHERE COALESCE(e->>'extraction_id', '') <> ALL(%s::text[])
+                            ), '[]'::jsonb) || %s::jsonb,
+                            'near_duplicate_cluster',
+                            COALESCE(evidence->'duplicate_check'->>'near_duplicate_cluster', %s)
+                        )
+                    )
+                    WHERE extraction_id = %s::uuid
+                """, ([e["extraction_id"] for e in entries], json.dumps(entries), cluster, target_id))
+
+            annotate(extraction_id, [
+                {"extraction_id": other_id, "candidate_key": other_key, "similarity": sim}
+                for other_id, other_key, sim, _, _ in near
+            ])
+            for other_id, other_key, sim, _, _ in near:
+                annotate(other_id, [
+                    {"extraction_id": str(extraction_id), "candidate_key": candidate_key, "similarity": sim}
+                ])
+
+    conn.commit()
+    return [
+        {"extraction_id": other_id, "candidate_key": other_key, "similarity": sim}
+        for other_id, other_key, sim, _, _ in near
+    ]
+
+
+# Epistemic fields and their store_extraction() defaults. A default/override
+# value only replaces a field that is still at its default.
+EPISTEMIC_FIELDS = {
+    'observer_id': "unknown",
+    'observer_type': "unknown",
+    'contact_mode': "derived",
+    'contact_strength': 0.20,
+    'signal_type': "text",
+    'pattern_storage': "externalized",
+    'representation_media': None,
+    'dependencies': None,
+    'sequence_role': "none",
+    'validity_conditions': None,
+    'assumptions': None,
+    'scope': None,
+    'observed_at': None,
+    'valid_from': None,
+    'valid_to': None,
+    'refresh_trigger': None,
+    'staleness_risk': 0.20,
+    'author_id': None,
+    'intent': "unknown",
+    'uncertainty_notes': None,
+    'reenactment_required': False,
+    'practice_interval': None,
+    'skill_transferability': "portable",
+}
+
+# DETERMINISTIC MAPPING: signal_type → representation_media
+SIGNAL_TO_MEDIA = {
+    'text': ['text'],
+    'code': ['code', 'text'],
+    'spec': ['spec', 'text'],
+    'comment': ['comment', 'text'],
+    'diagram': ['diagram', 'image'],
+    'log': ['log', 'text'],
+    'telemetry': ['telemetry', 'data'],
+    'binary': ['binary'],
+    'audio': ['audio'],
+    'video': ['video'],
+    'image': ['image'],
+}
+
+
+def _snapshot_content(payload_jsonb) -> str:
+    """Page content from a raw_snapshots.payload value."""
+    if isinstance(payload_jsonb, dict):
+        return payload_jsonb.get('content', '')
+    return str(payload_jsonb)
+
+
+def _locate_evidence(raw_evidence: str, snapshot_text: str = None, snapshot_hash: str = None) -> tuple:
+    """
+    Deterministic lineage metadata for an evidence quote
+
+    Returns:
+        (evidence_checksum, evidence_byte_offset, evidence_byte_length); the
+        offset is None when the snapshot is unknown or the quote isn't in it
+    """
+    evidence_bytes = raw_evidence.encode('utf-8')
+    evidence_checksum = f"sha256:{hashlib.sha256(evidence_bytes).hexdigest()}"
+
+    if snapshot_text is None:
+        return evidence_checksum, None, len(evidence_bytes)
+
+    # UTF-8 byte offset computation
+    evidence_byte_offset = snapshot_text.encode('utf-8').find(evidence_bytes)
+
+    # Quotes usually come from the stripped text the extractor showed
+    # the LLM - map them back to the raw payload via the offset map
+    if evidence_byte_offset == -1:
+        raw_range = get_text_view(snapshot_text, snapshot_hash).find(raw_evidence)
+        evidence_byte_offset = raw_range[0] if raw_range else None
+
+    return evidence_checksum, evidence_byte_offset, len(evidence_bytes)
+
+
+def store_evidence_texts(cur, rows) -> None:
+    """
+    Store evidence quotes once per checksum in evidence_texts.
+
+    staging_extractions rows reference the quote by evidence_checksum instead
+    of embedding it in evidence JSONB. Existing checksums are left as-is (the
+    first located byte range wins).
+
+    Args:
+        cur: Open cursor (caller commits)
+        rows: Iterable of (evidence_checksum, raw_text, snapshot_id, byte_offset, byte_length)
+    """
+    unique = {}
+    for row in rows:
+        if row[0] and row[0] not in unique:
+            unique[row[0]] = row
+    if not unique:
+        return
+
+    checksums, texts, snapshot_ids, offsets, lengths = zip(*unique.values())
+    cur.execute("""
+        INSERT INTO evidence_texts (
+            evidence_checksum, raw_text, text_size_bytes, snapshot_id, byte_offset, byte_length
+        )
+        SELECT checksum, raw_text, octet_length(raw_text), snapshot_id, byte_offset, byte_length
+        FROM unnest(%s::text[], %s::text[], %s::uuid[], %s::int[], %s::int[])
+             AS t(checksum, raw_text, snapshot_id, byte_offset, byte_length)
+        ON CONFLICT (evidence_checksum) DO NOTHING
+    """, (list(checksums), list(texts), list(snapshot_ids), list(offsets), list(lengths)))
 
 
 @tool
@@ -226,7 +429,7 @@ def store_extraction(
         - evidence_checksum: SHA256 hash with explicit UTF-8 encoding
         - evidence_byte_offset: Byte position in snapshot (exact or normalized match)
         - evidence_byte_length: Length in bytes
-        - lineage_verified: TRUE if exact/normalized match found
+        - lineage_verified: TRUE if exact/normalized/fuzzy match found
         - lineage_confidence: 1.0 (exact), 0.85 (normalized), 0.7 (ambiguous), 0.0 (not found)
         - lineage_verification_details: JSONB with method, hashes, match locations
 
@@ -303,18 +506,9 @@ def store_extraction(
         # If snapshot_id not provided, try to find it from source_url
         if not source_snapshot_id and source_metadata and 'source_url' in source_metadata:
             source_url = source_metadata['source_url']
-            with conn.cursor() as cur:
-                cur.execute("""
-                    SELECT id FROM raw_snapshots
-                    WHERE source_url = %s
-                    ORDER BY captured_at DESC
-                    LIMIT 1
-                """, (source_url,))
-                row = cur.fetchone()
-                if row:
-                    source_snapshot_id = str(row[0])
-                else:
-                    return f"Error: No snapshot found for URL {source_url}. Cannot store extraction without source snapshot."
+            source_snapshot_id = get_lookup_cache().latest_snapshot(conn, source_url)
+            if not source_snapshot_id:
+                return f"Error: No snapshot found for URL {source_url}. Cannot store extraction without source snapshot."
 
         if not source_snapshot_id:
             return "Error: source_snapshot_id required (or provide source_url in source_metadata)"
@@ -344,38 +538,21 @@ def store_extraction(
                 }
         else:
             # STEP 1: Compute deterministic checksums and offsets
-            evidence_bytes = raw_evidence.encode('utf-8')
-            evidence_checksum = f"sha256:{hashlib.sha256(evidence_bytes).hexdigest()}"
-            evidence_byte_length = len(evidence_bytes)
-
-            # Compute byte offset if snapshot exists
+            # (byte offset only if the snapshot exists)
             with conn.cursor() as cur:
                 cur.execute("""
-                    SELECT payload
+                    SELECT payload, content_hash
                     FROM raw_snapshots
                     WHERE id = %s::uuid
                 """, (source_snapshot_id,))
                 snapshot_row = cur.fetchone()
 
-                if not snapshot_row:
-                    # Snapshot not found - cannot compute byte offset
-                    evidence_byte_offset = None
-                else:
-                    payload_jsonb = snapshot_row[0]
-
-                    # Extract content from JSONB payload
-                    if isinstance(payload_jsonb, dict):
-                        snapshot_text = payload_jsonb.get('content', '')
-                    else:
-                        snapshot_text = str(payload_jsonb)
-
-                    # UTF-8 byte offset computation
-                    snapshot_bytes = snapshot_text.encode('utf-8')
-                    evidence_byte_offset = snapshot_bytes.find(evidence_bytes)
-
-                    # If not found exactly, set to None (normalized matches don't have reliable byte offset)
-                    if evidence_byte_offset == -1:
-                        evidence_byte_offset = None
+            if snapshot_row:
+                evidence_checksum, evidence_byte_offset, evidence_byte_length = _locate_evidence(
+                    raw_evidence, _snapshot_content(snapshot_row[0]), snapshot_row[1]
+                )
+            else:
+                evidence_checksum, evidence_byte_offset, evidence_byte_length = _locate_evidence(raw_evidence)
 
             # STEP 2: Use validator's verification results (if provided)
             # If validator didn't verify, fall back to defaults
@@ -408,10 +585,17 @@ def store_extraction(
                 payload_dict.pop("criticality", None)
             payload = json.dumps(payload_dict)
 
-            # Build evidence JSONB with metadata for human verification
-            evidence_data = {
-                "raw_text": raw_evidence
-            }
+            # Build evidence JSONB with metadata for human verification.
+            # The quote itself lives in evidence_texts (keyed by checksum);
+            # only checksum-less (empty) evidence is kept inline.
+            evidence_data = {}
+            if evidence_checksum:
+                store_evidence_texts(cur, [(
+                    evidence_checksum, raw_evidence, source_snapshot_id,
+                    evidence_byte_offset, evidence_byte_length
+                )])
+            else:
+                evidence_data["raw_text"] = raw_evidence or ""
 
             # Add agent reasoning trail (helps human understand logic)
             if reasoning_trail:
@@ -460,21 +644,7 @@ def store_extraction(
             # Insert into knowledge_epistemics sidecar (epistemic metadata)
             # Derive representation_media deterministically from signal_type if not provided
             if representation_media is None:
-                # DETERMINISTIC MAPPING: signal_type → representation_media
-                signal_to_media = {
-                    'text': ['text'],
-                    'code': ['code', 'text'],
-                    'spec': ['spec', 'text'],
-                    'comment': ['comment', 'text'],
-                    'diagram': ['diagram', 'image'],
-                    'log': ['log', 'text'],
-                    'telemetry': ['telemetry', 'data'],
-                    'binary': ['binary'],
-                    'audio': ['audio'],
-                    'video': ['video'],
-                    'image': ['image'],
-                }
-                representation_media = signal_to_media.get(signal_type, ['text'])  # Fallback to text
+                representation_media = SIGNAL_TO_MEDIA.get(signal_type, ['text'])  # Fallback to text
 
             # Convert timestamps to proper format if provided as strings
             observed_at_ts = observed_at if observed_at else None
@@ -515,14 +685,324 @@ def store_extraction(
                 reenactment_required, practice_interval, skill_transferability
             ))
         conn.commit()
+
+        # Near-duplicate annotation is best-effort: the extraction is already
+        # stored, and annotate_near_duplicates.py picks up rows it missed
+        near_note = ""
+        try:
+            near = annotate_near_duplicates(conn, extraction_id)
+            if near:
+                near_note = f"\n  Near-duplicates: {', '.join(n['candidate_key'] for n in near)}"
+        except Exception:
+            conn.rollback()
         conn.close()
 
-        return f"[STAGED] Extraction recorded (ID: {extraction_id})\n  Type: {candidate_type}\n  Key: {candidate_key}\n  Confidence: {confidence_score}"
+        return f"[STAGED] Extraction recorded (ID: {extraction_id})\n  Type: {candidate_type}\n  Key: {candidate_key}\n  Confidence: {confidence_score}{near_note}"
 
     except Exception as e:
         return f"Error storing extraction: {str(e)}"
 
 
+# Column order for the COPY statements in store_extractions_bulk()
+STAGING_COPY_COLUMNS = (
+    "extraction_id", "pipeline_run_id", "snapshot_id", "agent_id", "agent_version",
+    "candidate_type", "candidate_key", "candidate_payload",
+    "ecosystem", "confidence_score", "confidence_reason",
+    "evidence", "evidence_type", "status",
+    "evidence_checksum", "evidence_byte_offset", "evidence_byte_length",
+    "lineage_verified", "lineage_confidence", "lineage_verified_at",
+    "lineage_verification_details",
+)
+
+EPISTEMICS_COPY_COLUMNS = (
+    "extraction_id", "domain",
+    "observer_id", "observer_type", "contact_mode", "contact_strength", "signal_type",
+    "pattern_storage", "representation_media",
+    "dependencies", "sequence_role",
+    "validity_conditions", "assumptions", "scope",
+    "observed_at", "valid_from", "valid_to", "refresh_trigger", "staleness_risk",
+    "author_id", "intent", "uncertainty_notes",
+    "reenactment_required", "practice_interval", "skill_transferability",
+)
+
+
+def stage_extractions_bulk(
+    conn,
+    candidates: List[dict],
+    source_url: str = None,
+    source_snapshot_id: str = None,
+    epistemic_defaults: dict = None,
+) -> tuple:
+    """
+    Write candidates to staging_extractions + knowledge_epistemics in one transaction.
+
+    Shared by store_extractions_bulk() and the write-behind flusher
+    (write_behind_v3.py). Snapshots are resolved with one query, checksums and
+    byte offsets are computed from a single payload read per snapshot, and
+    both tables are written with COPY. Commits.
+
+    A candidate may carry its own extraction_id (and epistemic_defaults);
+    candidates whose extraction_id is already stored are skipped, so
+    replaying a batch is idempotent.
+
+    Returns:
+        (staged, skipped): [(extraction_id, candidate_type, candidate_key)],
+        [(candidate, reason)]
+    """
+    import json
+
+    def candidate_url(candidate: dict):
+        metadata = candidate.get('source_metadata') or {}
+        return metadata.get('source_url') or source_url
+
+    # ========================================================================
+    # Resolve snapshots (cached per URL, one query for all misses + payloads)
+    # ========================================================================
+    urls = {
+        candidate_url(c) for c in candidates
+        if not (c.get('source_snapshot_id') or source_snapshot_id) and candidate_url(c)
+    }
+    snapshot_by_url = get_lookup_cache().latest_snapshots(conn, urls) if urls else {}
+
+    with conn.cursor() as cur:
+        given_ids = [str(c['extraction_id']) for c in candidates if c.get('extraction_id')]
+        stored_ids = set()
+        if given_ids:
+            cur.execute("""
+                SELECT extraction_id::text FROM staging_extractions
+                WHERE extraction_id = ANY(%s::uuid[])
+            """, (given_ids,))
+            stored_ids = {row[0] for row in cur.fetchall()}
+
+        resolved, skipped = [], []
+        for position, candidate in enumerate(candidates):
+            label = candidate.get('candidate_key') or f"#{position}"
+            if candidate.get('extraction_id') and str(candidate['extraction_id']) in stored_ids:
+                skipped.append((candidate, f"{label}: already stored ({candidate['extraction_id']})"))
+                continue
+            if not candidate.get('candidate_type') or not candidate.get('candidate_key'):
+                skipped.append((candidate, f"{label}: candidate_type and candidate_key are required"))
+                continue
+            snapshot_id = (
+                candidate.get('source_snapshot_id')
+                or source_snapshot_id
+                or snapshot_by_url.get(candidate_url(candidate))
+            )
+            if not snapshot_id:
+                url = candidate_url(candidate)
+                skipped.append((candidate,
+                    f"{label}: no snapshot found for URL {url}" if url
+                    else f"{label}: source_snapshot_id required (or provide source_url)"
+                ))
+                continue
+            resolved.append((candidate, snapshot_id))
+
+        if not resolved:
+            return [], skipped
+
+        cur.execute("""
+            SELECT id::text, payload, content_hash
+            FROM raw_snapshots
+            WHERE id = ANY(%s::uuid[])
+        """, (sorted({snapshot_id for _, snapshot_id in resolved}),))
+        snapshots = {
+            row[0]: (_snapshot_content(row[1]), row[2]) for row in cur.fetchall()
+        }
+
+    run_id = get_or_create_pipeline_run(conn)
+
+    # ========================================================================
+    # Build rows (client-side extraction ids, no per-row RETURNING)
+    # ========================================================================
+    staging_rows, epistemic_rows, evidence_rows, staged = [], [], [], []
+    for candidate, snapshot_id in resolved:
+        extraction_id = str(candidate.get('extraction_id') or uuid.uuid4())
+        raw_evidence = candidate.get('raw_evidence') or ""
+
+        lineage_verified = candidate.get('lineage_verified')
+        lineage_confidence = candidate.get('lineage_confidence')
+        lineage_details = candidate.get('lineage_verification_details')
+
+        if not raw_evidence.strip():
+            evidence_checksum, evidence_byte_offset, evidence_byte_length = None, None, 0
+            default_details = {"method": "not_computed", "notes": "No evidence text provided"}
+        else:
+            snapshot_text, snapshot_hash = snapshots.get(snapshot_id, (None, None))
+            evidence_checksum, evidence_byte_offset, evidence_byte_length = _locate_evidence(
+                raw_evidence, snapshot_text, snapshot_hash
+            )
+            default_details = {
+                "method": "not_verified",
+                "evidence_checksum": evidence_checksum,
+                "notes": "Validator did not verify lineage. Deterministic metadata computed by storage."
+            }
+        if lineage_verified is None:
+            lineage_verified = False
+        if lineage_confidence is None:
+            lineage_confidence = 0.0
+        if lineage_details is None:
+            lineage_details = default_details
+
+        payload_dict = candidate.get('properties') or {}
+        if isinstance(payload_dict, dict):
+            payload_dict = dict(payload_dict)
+            payload_dict.pop("criticality", None)
+
+        # Quotes go to evidence_texts (below); only empty evidence stays inline
+        evidence_data = {} if evidence_checksum else {"raw_text": raw_evidence}
+        if evidence_checksum:
+            evidence_rows.append((
+                evidence_checksum, raw_evidence, snapshot_id, evidence_byte_offset, evidence_byte_length
+            ))
+        for field in ('reasoning_trail', 'duplicate_check'):
+            if candidate.get(field):
+                evidence_data[field] = candidate[field]
+        source_metadata = candidate.get('source_metadata') or (
+            {"source_url": source_url} if source_url else None
+        )
+        if source_metadata:
+            evidence_data["source_metadata"] = source_metadata
+
+        staging_rows.append((
+            extraction_id, run_id, snapshot_id, 'storage_agent', '1.0',
+            candidate['candidate_type'], candidate['candidate_key'], json.dumps(payload_dict),
+            candidate.get('ecosystem', "external"),
+            candidate.get('confidence_score', 0.8),
+            candidate.get('confidence_reason', "LLM extraction"),
+            json.dumps(evidence_data),
+            candidate.get('evidence_type', "explicit_requirement"), 'pending',
+            evidence_checksum, evidence_byte_offset, evidence_byte_length,
+            lineage_verified, lineage_confidence,
+            datetime.now() if lineage_verified else None,
+            json.dumps(lineage_details),
+        ))
+
+        # Precedence: candidate values > overrides > defaults > parameter defaults
+        epistemics = {
+            field: candidate.get(field, default) for field, default in EPISTEMIC_FIELDS.items()
+        }
+        merged = dict(candidate.get('epistemic_defaults') or epistemic_defaults or {})
+        merged.update(candidate.get('epistemic_overrides') or {})
+        for field, value in merged.items():
+            if field in EPISTEMIC_FIELDS and epistemics[field] == EPISTEMIC_FIELDS[field]:
+                epistemics[field] = value
+        if epistemics['representation_media'] is None:
+            epistemics['representation_media'] = SIGNAL_TO_MEDIA.get(epistemics['signal_type'], ['text'])
+
+        epistemic_rows.append((
+            extraction_id, candidate.get('domain', "external"),
+            epistemics['observer_id'], epistemics['observer_type'], epistemics['contact_mode'],
+            epistemics['contact_strength'], epistemics['signal_type'],
+            epistemics['pattern_storage'], epistemics['representation_media'],
+            json.dumps(epistemics['dependencies']) if epistemics['dependencies'] else None,
+            epistemics['sequence_role'],
+            json.dumps(epistemics['validity_conditions']) if epistemics['validity_conditions'] else None,
+            epistemics['assumptions'], epistemics['scope'],
+            epistemics['observed_at'] or None, epistemics['valid_from'] or None,
+            epistemics['valid_to'] or None, epistemics['refresh_trigger'], epistemics['staleness_risk'],
+            epistemics['author_id'], epistemics['intent'], epistemics['uncertainty_notes'],
+            epistemics['reenactment_required'], epistemics['practice_interval'],
+            epistemics['skill_transferability'],
+        ))
+        staged.append((extraction_id, candidate['candidate_type'], candidate['candidate_key']))
+
+    # ========================================================================
+    # Write both tables in one transaction (COPY casts text to the column
+    # types, including the enums and JSONB)
+    # ========================================================================
+    with conn.cursor() as cur:
+        store_evidence_texts(cur, evidence_rows)
+        with cur.copy(
+            f"COPY staging_extractions ({', '.join(STAGING_COPY_COLUMNS)}) FROM STDIN"
+        ) as copy:
+            for row in staging_rows:
+                copy.write_row(row)
+        with cur.copy(
+            f"COPY knowledge_epistemics ({', '.join(EPISTEMICS_COPY_COLUMNS)}) FROM STDIN"
+        ) as copy:
+            for row in epistemic_rows:
+                copy.write_row(row)
+    conn.commit()
+    return staged, skipped
+
+
+@tool
+def store_extractions_bulk(
+    candidates: List[dict],
+    source_url: str = None,
+    source_snapshot_id: str = None,
+    epistemic_defaults: dict = None,
+) -> str:
+    """
+    Deliver many extractions to staging_extractions in ONE call.
+
+    Use this instead of calling store_extraction() once per candidate. All
+    snapshots are resolved with one query, every checksum and byte offset is
+    computed from a single payload read per snapshot, and staging_extractions
+    plus knowledge_epistemics are written with COPY in one transaction.
+
+    Args:
+        candidates: List of dicts using store_extraction()'s argument names
+            (candidate_type, candidate_key, raw_evidence, ecosystem, properties,
+            confidence_score, confidence_reason, evidence_type, reasoning_trail,
+            duplicate_check, source_metadata, lineage_*, epistemic_overrides,
+            domain and the Knowledge Capture Checklist fields).
+            candidate_type, candidate_key and raw_evidence are required.
+        source_url: Page URL shared by all candidates (a candidate's own
+            source_metadata.source_url or source_snapshot_id wins)
+        source_snapshot_id: Snapshot shared by all candidates
+        epistemic_defaults: Defaults for all candidates from this page/snapshot
+            (each candidate's epistemic_overrides win)
+
+    Near-duplicate annotation runs asynchronously for bulk stores
+    (production/scripts/annotate_near_duplicates.py picks up unsigned rows).
+
+    With PROVES_WRITE_BEHIND=1 the candidates are journaled locally and
+    written by a background flusher (see write_behind_v3.py); the returned
+    ids are the ids they will be stored under.
+
+    Returns:
+        Summary with one line per staged extraction, plus skipped candidates
+    """
+    try:
+        if not candidates:
+            return "Error: no candidates provided"
+
+        # Optional write-behind: queue locally, a background thread writes to Neon
+        from write_behind_v3 import get_write_behind_buffer, write_behind_enabled
+        if write_behind_enabled():
+            extraction_ids = get_write_behind_buffer().submit(
+                candidates, source_url, source_snapshot_id, epistemic_defaults
+            )
+            lines = [f"[QUEUED] {len(extraction_ids)} extraction(s) queued for storage (write-behind)"]
+            lines += [
+                f"  {c.get('candidate_key')} ({c.get('candidate_type')}) - ID: {eid}"
+                for c, eid in zip(candidates, extraction_ids)
+            ]
+            return "\n".join(lines)
+
+        conn = get_db_connection()
+        try:
+            staged, skipped = stage_extractions_bulk(
+                conn, candidates, source_url, source_snapshot_id, epistemic_defaults
+            )
+        finally:
+            conn.close()
+
+        if not staged:
+            return "Error: no candidates could be stored\n  " + "\n  ".join(reason for _, reason in skipped)
+
+        lines = [f"[STAGED] {len(staged)} extraction(s) recorded"]
+        lines += [f"  {key} ({ctype}) - ID: {eid}" for eid, ctype, key in staged]
+        if skipped:
+            lines.append(f"[SKIPPED] {len(skipped)} candidate(s)")
+            lines += [f"  {reason}" for _, reason in skipped]
+        return "\n".join(lines)
+
+    except Exception as e:
+        return f"Error storing extractions: {str(e)}"
+
+
 @tool
 def promote_to_core(
     extraction_id: str,
@@ -606,6 +1086,166 @@ def promote_to_core(
         return f"Error promoting extraction: {str(e)}"
 
 
+@tool
+def promote_to_core_batch(
+    extraction_ids: List[str],
+    merge_map: dict = None,
+    canonical_names: dict = None
+) -> str:
+    """
+    Promote a batch of validated extractions to core_entities in one transaction.
+
+    Use this for an approved review page instead of calling promote_to_core()
+    once per extraction. New entities are created with one INSERT ... SELECT,
+    merges are applied with one UPDATE ... FROM, and all statuses are flipped
+    with one UPDATE, all in one transaction: a database error rolls back the
+    whole batch. Extractions that fail the checks below are skipped (and
+    listed in the result) while the rest of the batch is promoted.
+
+    Args:
+        extraction_ids: IDs from staging_extractions
+        merge_map: {extraction_id: existing core entity id} for duplicates to
+                   merge into an existing entity instead of creating one.
+                   Several extractions may merge into the same entity (later
+                   extractions win on conflicting attribute keys).
+        canonical_names: {extraction_id: unified name} for new entities whose
+                         name differs from the extracted key
+
+    Extractions that are missing or already accepted, and merges whose target
+    entity does not exist, are skipped and listed in the result.
+    """
+    try:
+        merge_map = {str(k): str(v) for k, v in (merge_map or {}).items()}
+        canonical_names = {str(k): v for k, v in (canonical_names or {}).items() if v}
+        requested = list(dict.fromkeys(str(eid) for eid in extraction_ids))
+        if not requested:
+            return "Error: no extraction_ids provided"
+
+        conn = get_db_connection()
+        try:
+            run_id = get_or_create_pipeline_run(conn, "curator_promotion")
+            skipped = []
+
+            with conn.cursor() as cur:
+                # Lock the batch so a concurrent promotion can't double-insert
+                cur.execute("""
+                    SELECT extraction_id::text, status::text
+                    FROM staging_extractions
+                    WHERE extraction_id = ANY(%s::uuid[])
+                    FOR UPDATE
+                """, (requested,))
+                status_by_id = dict(cur.fetchall())
+
+                targets = sorted(set(merge_map.values()))
+                existing_targets = set()
+                if targets:
+                    cur.execute("""
+                        SELECT id::text FROM core_entities WHERE id = ANY(%s::uuid[])
+                    """, (targets,))
+                    existing_targets = {row[0] for row in cur.fetchall()}
+
+                merges, creates = [], []
+                for extraction_id in requested:
+                    status = status_by_id.get(extraction_id)
+                    if status is None:
+                        skipped.append(f"{extraction_id}: not found")
+                    elif status == 'accepted':
+                        skipped.append(f"{extraction_id}: already accepted")
+                    elif extraction_id in merge_map:
+                        if merge_map[extraction_id] in existing_targets:
+                            merges.append(extraction_id)
+                        else:
+                            skipped.append(f"{extraction_id}: merge target {merge_map[extraction_id]} not found")
+                    else:
+                        creates.append(extraction_id)
+
+                merged_entities = []
+                if merges:
+                    # Fold each target's payloads into one object (ordered by
+                    # created_at so later extractions win), then one UPDATE
+                    cur.execute("""
+                        UPDATE core_entities e
+                        SET attributes = e.attributes || m.payload,
+                            updated_at = NOW()
+                        FROM (
+                            SELECT mm.entity_id,
+                                   COALESCE(
+                                       jsonb_object_agg(kv.key, kv.value ORDER BY s.created_at)
+                                           FILTER (WHERE kv.key IS NOT NULL),
+                                       '{}'::jsonb
+                                   ) AS payload
+                            FROM unnest(%s::uuid[], %s::uuid[]) AS mm(extraction_id, entity_id)
+                            JOIN staging_extractions s ON s.extraction_id = mm.extraction_id
+                            LEFT JOIN LATERAL jsonb_each(
+                                CASE WHEN jsonb_typeof(s.candidate_payload) = 'object'
+                                     THEN s.candidate_payload ELSE '{}'::jsonb END
+                            ) AS kv ON TRUE
+                            GROUP BY mm.entity_id
+                        ) m
+                        WHERE e.id = m.entity_id
+                        RETURNING e.id::text, e.name
+                    """, (merges, [merge_map[eid] for eid in merges]))
+                    merged_entities = cur.fetchall()
+
+                created = []
+                if creates:
+                    # Entity ids are generated in the CTE so each new row can be
+                    # reported against the extraction it came from
+                    cur.execute("""
+                        WITH src AS (
+                            SELECT gen_random_uuid() AS entity_id, s.extraction_id,
+                                   s.candidate_type, s.candidate_key, s.candidate_payload,
+                                   s.ecosystem, s.snapshot_id,
+                                   COALESCE(n.name, s.candidate_key) AS final_name
+                            FROM staging_extractions s
+                            LEFT JOIN unnest(%s::uuid[], %s::text[]) AS n(extraction_id, name)
+                                   ON n.extraction_id = s.extraction_id
+                            WHERE s.extraction_id = ANY(%s::uuid[])
+                        ), ins AS (
+                            INSERT INTO core_entities (
+                                id, entity_type, canonical_key, name, display_name,
+                                ecosystem, attributes,
+                                source_snapshot_id, created_by_run_id
+                            )
+                            SELECT entity_id, candidate_type::text::entity_type, candidate_key,
+                                   final_name, final_name,
+                                   ecosystem::text::ecosystem_type, COALESCE(candidate_payload, '{}'::jsonb),
+                                   snapshot_id, %s::uuid
+                            FROM src
+                            RETURNING id
+                        )
+                        SELECT src.extraction_id::text, src.entity_id::text, src.final_name
+                        FROM src JOIN ins ON ins.id = src.entity_id
+                    """, (
+                        list(canonical_names.keys()), list(canonical_names.values()),
+                        creates, run_id
+                    ))
+                    created = cur.fetchall()
+
+                promoted = merges + creates
+                if promoted:
+                    cur.execute("""
+                        UPDATE staging_extractions
+                        SET status = 'accepted'::candidate_status
+                        WHERE extraction_id = ANY(%s::uuid[])
+                    """, (promoted,))
+
+            conn.commit()
+        finally:
+            conn.close()
+
+        lines = [f"[PROMOTED] {len(created)} created, {len(merges)} merged into {len(merged_entities)} existing entities"]
+        lines += [f"  {name} -> core_entities (ID: {entity_id})" for _, entity_id, name in created]
+        lines += [f"  merged -> {name} (ID: {entity_id})" for entity_id, name in merged_entities]
+        if skipped:
+            lines.append(f"[SKIPPED] {len(skipped)} extraction(s)")
+            lines += [f"  {reason}" for reason in skipped]
+        return "\n".join(lines)
+
+    except Exception as e:
+        return f"Error promoting extractions: {str(e)}"
+
+
 @tool
 def store_finding(
     finding_type: str,
@@ -713,6 +1353,46 @@ def store_equivalence(
         return f"Error storing equivalence: {str(e)}"
 
 
+@tool
+def suggest_equivalences(entity_id: str, limit: int = 5, min_score: float = 0.2) -> str:
+    """
+    Suggest cross-ecosystem equivalence candidates for a core entity.
+
+    Uses the local embedding index (identifier-aware names + descriptions)
+    to find the nearest entities in OTHER ecosystems, e.g. ProvesKit
+    "I2C Manager" -> F' Drv::LinuxI2cDriver. Review each suggestion and
+    record real matches with store_equivalence().
+
+    Args:
+        entity_id: ID of the core_entity to find counterparts for
+        limit: Max suggestions
+        min_score: Minimum cosine similarity (0.0 to 1.0)
+    """
+    try:
+        from embedding_index import get_embedding_index
+
+        index = get_embedding_index()
+        vector = index.vector_for(entity_id)
+        entity = index.entity(entity_id)
+        if vector is None or entity is None:
+            return f"Entity {entity_id} not found in the embedding index (not a current core_entity?)"
+
+        neighbors = index.search(
+            vector, k=limit, min_score=min_score,
+            exclude_ecosystem=entity['ecosystem'], exclude_ids=[entity_id]
+        )
+        if not neighbors:
+            return f"No cross-ecosystem candidates for {entity['name']} ({entity['ecosystem']})"
+
+        result = f"Equivalence candidates for {entity['name']} ({entity['ecosystem']}):\n"
+        for n in neighbors:
+            result += f"  - {n['name']} (key: {n['canonical_key']}, {n['entity_type']}, {n['ecosystem']}) score: {n['score']:.2f} ID: {n['id']}\n"
+        return result
+
+    except Exception as e:
+        return f"Error suggesting equivalences: {str(e)}"
+
+
 @tool
 def legacy_store_equivalence(
     ecosystem_a: str,
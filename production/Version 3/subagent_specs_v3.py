@@ -18,6 +18,7 @@ sys.path.insert(0, str(production_root))
 # Import extractor tools from v3 extractor in same folder
 from extractor_v3 import (
     fetch_webpage,
+    read_snapshot,
     extract_architecture_using_claude,
     query_verified_entities,
     query_staging_history,
@@ -27,7 +28,9 @@ from extractor_v3 import (
 # Import validator tools from v3 validator in same folder
 from validator_v3 import (
     get_pending_extractions,
+    check_decision_cache,
     check_for_duplicates,
+    check_for_duplicates_batch,
     query_validation_decisions,
     query_raw_snapshots,
     check_if_dependency_exists,
@@ -35,11 +38,13 @@ from validator_v3 import (
     search_similar_dependencies,
     validate_epistemic_structure,
     verify_evidence_lineage,
+    verify_evidence_lineage_batch,
 )
 
 # Import storage tools from v3 storage in same folder
 from storage_v3 import (
     store_extraction,
+    store_extractions_bulk,
     get_staging_statistics,
 )
 
@@ -64,6 +69,7 @@ FRAMES = Framework for Resilience Assessment in Modular Engineering Systems
 
 1. **Fetch the page** (1 tool call):
    - Use fetch_webpage tool
+   - For github.com/.../blob/... URLs from a bulk repo ingest, use read_snapshot instead (no network)
    - Returns snapshot_id and page content
 
 2. **Extract architecture** (0 tool calls):
@@ -354,6 +360,7 @@ Your final response should be structured text that includes:
 Work step-by-step through the workflow above.""",
         "tools": [
             fetch_webpage,
+            read_snapshot,  # Bulk-ingested repo files (already in raw_snapshots)
             # Lineage creation removed - storage handles it deterministically
             query_verified_entities,
             query_staging_history,
@@ -376,11 +383,17 @@ Validate extraction data BEFORE storage to prevent duplicates and ensure lineage
 
 ## CRITICAL VALIDATION CHECKS (MUST DO ALL)
 
+### 0. Decision Cache (FIRST)
+- Call check_decision_cache(candidate_type, candidate_key, evidence_text)
+- [CACHED ACCEPT] / [CACHED REJECT]: return that verdict immediately, no further checks
+- [NO CACHED DECISION]: continue with the checks below
+
 ### 1. Lineage Verification (MANDATORY)
 For each extraction, use verify_evidence_lineage(snapshot_id, evidence_text):
 - [REQ] Call verify_evidence_lineage() with snapshot_id and evidence_text
 - [REQ] Returns JSON with lineage_verified, lineage_confidence, checks_passed, checks_failed
 - [REQ] Pass results to storage agent for deterministic metadata computation
+- For several extractions from the same snapshot, call verify_evidence_lineage_batch(snapshot_id, [evidence_text, ...]) once instead - results come back per quote, in order
 
 **Lineage confidence scoring:**
 - 1.0 = Perfect (all checks pass)
@@ -390,7 +403,8 @@ For each extraction, use verify_evidence_lineage(snapshot_id, evidence_text):
 
 **Checks performed by verify_evidence_lineage:**
 1. Evidence not empty
-2. Evidence found in snapshot (exact or normalized match)
+2. Evidence found in snapshot (exact or normalized match; near-miss quotes
+   match fuzzily as evidence_found_fuzzy + evidence_not_verbatim, confidence 0.8)
 3. Evidence length reasonable (10-10000 bytes)
 4. Evidence not suspiciously repetitive
 
@@ -402,6 +416,7 @@ For each extraction, use verify_evidence_lineage(snapshot_id, evidence_text):
 
 ### 2. Duplicate Detection (PREVENTS LOOPS)
 - Use check_for_duplicates() to search core_entities
+- For several candidates, check_for_duplicates_batch([name, ...]) checks them all in one call
 - Use search_similar_dependencies() for similar entities
 - If duplicate found: REJECT with clear reason
 - This STOPS re-extraction of same data
@@ -477,9 +492,12 @@ Your validation STOPS THE LOOP by catching duplicates.""",
         "tools": [
             get_pending_extractions,
             # record_validation_decision removed - not needed in orchestration flow
+            check_decision_cache,
             check_for_duplicates,
+            check_for_duplicates_batch,
             validate_epistemic_structure,  # NEW: Validate epistemic defaults + overrides pattern
             verify_evidence_lineage,  # NEW: Lineage verification before storage
+            verify_evidence_lineage_batch,
             query_verified_entities,
             query_staging_history,
             query_validation_decisions,
@@ -505,7 +523,8 @@ Store extracted entities in staging_extractions for human review.
 
 ## Your Tools
 
-- store_extraction() - Stage extractions in staging_extractions table
+- store_extractions_bulk() - Stage ALL extractions from a page in one call (preferred)
+- store_extraction() - Stage a single extraction in staging_extractions table
 - get_staging_statistics() - Query database stats and verify storage
 
 ## Workflow (MAX 5 TOOL CALLS)
@@ -513,7 +532,9 @@ Store extracted entities in staging_extractions for human review.
 **RECURSION LIMIT: You have a maximum of 5 tool calls. Be efficient.**
 
 1. Receive extraction data from the main curator
-2. Store in staging_extractions using store_extraction() (1-3 tool calls):
+2. Store in staging_extractions using store_extractions_bulk() (1 tool call per page;
+   pass epistemic_defaults once and only per-candidate epistemic_overrides).
+   Each candidate dict uses store_extraction()'s fields:
    - candidate_type (component, port, command, etc.)
    - candidate_key (entity name)
    - raw_evidence (exact quote from source)
@@ -555,6 +576,7 @@ You do NOT:
 - Assign criticality (humans decide mission impact)
 - Filter extractions (capture everything)""",
         "tools": [
+            store_extractions_bulk,
             store_extraction,
             get_staging_statistics,
         ],
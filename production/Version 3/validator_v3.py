@@ -11,6 +11,7 @@ import sys
 import os
 import uuid
 from pathlib import Path
+from typing import List, Optional, Tuple
 
 # Add production/core to path for database utilities
 version3_folder = Path(__file__).parent  # production/Version 3/
@@ -23,6 +24,14 @@ from langchain_core.tools import tool
 from langgraph.prebuilt import create_react_agent
 from langsmith import traceable
 from graph_manager import GraphManager
+from html_text import NORMALIZER_VERSION, get_text_view, normalize_text
+from evidence_matcher import FuzzyIndex, match_quotes
+from entity_index import get_entity_index
+from embedding_index import get_embedding_index
+from decision_cache import evidence_checksum, get_decision_cache
+
+# Minimum cosine score for "semantically related" entities in duplicate checks
+SEMANTIC_MIN_SCORE = 0.2
 
 
 def get_db_connection():
@@ -50,12 +59,16 @@ def get_pending_extractions(limit: int = 10) -> str:
         conn = get_db_connection()
         with conn.cursor() as cur:
             cur.execute("""
-                SELECT extraction_id, candidate_type::text, candidate_key, 
-                       evidence, ecosystem::text, confidence_score,
-                       confidence_reason, created_at
-                FROM staging_extractions 
-                WHERE status = 'pending'::candidate_status
-                ORDER BY created_at ASC
+                SELECT s.extraction_id, s.candidate_type::text, s.candidate_key,
+                       CASE WHEN et.raw_text IS NULL THEN s.evidence
+                            ELSE jsonb_build_object('raw_text', et.raw_text) || COALESCE(s.evidence, '{}'::jsonb)
+                       END AS evidence,
+                       s.ecosystem::text, s.confidence_score,
+                       s.confidence_reason, s.created_at
+                FROM staging_extractions s
+                LEFT JOIN evidence_texts et ON et.evidence_checksum = s.evidence_checksum
+                WHERE s.status = 'pending'::candidate_status
+                ORDER BY s.created_at ASC
                 LIMIT %s
             """, (limit,))
             rows = cur.fetchall()
@@ -154,69 +167,159 @@ def record_validation_decision(
         return f"Error recording decision: {str(e)}"
 
 
+def _add_semantic_neighbors(matches: List[dict], limit: int = 3) -> List[dict]:
+    """
+    Add embedding-index neighbors that name matching missed to each result.
+
+    Catches related entities with different names (e.g. "I2C Manager" vs
+    Drv::LinuxI2cDriver). Best-effort: name matching still stands if the
+    embedding index is unavailable.
+    """
+    try:
+        index = get_embedding_index()
+        for match in matches:
+            seen = [e['id'] for e in match["exact"]] + [e['id'] for e in match["similar"]]
+            match["semantic"] = index.search(
+                index.embed(match["name"]), k=limit,
+                min_score=SEMANTIC_MIN_SCORE, exclude_ids=seen
+            )
+    except Exception:
+        for match in matches:
+            match.setdefault("semantic", [])
+    return matches
+
+
+def _format_duplicate_check(entity_name: str, entity_type: str, match: dict) -> str:
+    """Render one EntityIndex result in the check_for_duplicates report format."""
+    result = f"Duplicate check for '{entity_name}' ({entity_type}):\n\n"
+
+    if match["exact"]:
+        result += "[WARNING] EXACT MATCHES:\n"
+        for entity in match["exact"]:
+            result += f"  - {entity['name']} (key: {entity['canonical_key']}, {entity['entity_type']}, {entity['ecosystem']}) ID: {entity['id']}\n"
+    else:
+        result += "[OK] No exact matches\n"
+
+    if match["similar"]:
+        result += "\n📊 Similar entities:\n"
+        for entity in match["similar"]:
+            via = f", via alias '{entity['matched_text']}'" if entity['via'] == 'alias' else ""
+            result += f"  - {entity['name']} (key: {entity['canonical_key']}, {entity['entity_type']}, {entity['ecosystem']}) similarity: {entity['similarity']:.2f}{via}\n"
+
+    if match.get("semantic"):
+        result += "\n🔗 Semantically related (different name - check if same concept):\n"
+        for entity in match["semantic"]:
+            result += f"  - {entity['name']} (key: {entity['canonical_key']}, {entity['entity_type']}, {entity['ecosystem']}) score: {entity['score']:.2f}\n"
+
+    return result
+
+
+@tool
+def check_decision_cache(candidate_type: str, candidate_key: str, evidence_text: str) -> str:
+    """
+    Check whether this exact candidate was already accepted or rejected.
+
+    CALL THIS FIRST. Re-crawled pages reproduce the same candidate (same
+    type, key and evidence quote); if validation_decisions already holds a
+    verdict for it, reuse the verdict instead of validating again.
+
+    Cached verdicts expire after 30 days and are invalidated when the core
+    entity with the same key has changed since the decision.
+
+    Args:
+        candidate_type: Extraction type (component, port, ...)
+        candidate_key: Extraction key / entity name
+        evidence_text: The evidence quote (exactly as it will be stored)
+
+    Returns:
+        "[CACHED ACCEPT] ..." / "[CACHED REJECT] ..." - reuse the verdict, skip validation
+        "[NO CACHED DECISION] ..." - validate normally
+    """
+    try:
+        result = get_decision_cache().lookup(candidate_type, candidate_key, evidence_checksum(evidence_text))
+        status = result["status"]
+
+        if status == "hit":
+            label = "ACCEPT" if result["verdict"] == "accepted" else "REJECT"
+            who = "human" if result["is_human"] else result["decided_by"]
+            return (
+                f"[CACHED {label}] '{candidate_key}' ({candidate_type}) was already {result['verdict']}\n"
+                f"  Decision: {result['decision']} by {who} at {result['decided_at']}\n"
+                f"  Reason: {result['reason']}\n"
+                f"  Previous extraction ID: {result['extraction_id']}\n"
+                f"  Fingerprint: {result['fingerprint']}"
+            )
+
+        reasons = {
+            "miss": "never decided",
+            "undecided": f"last decision was '{result.get('decision')}'",
+            "expired": f"verdict from {result.get('decided_at')} is older than the cache TTL",
+            "invalidated": "the core entity changed after the last verdict",
+        }
+        return f"[NO CACHED DECISION] '{candidate_key}' ({candidate_type}): {reasons[status]} - validate normally"
+
+    except Exception as e:
+        return f"Error checking decision cache: {str(e)}"
+
+
 @tool
 def check_for_duplicates(entity_name: str, entity_type: str) -> str:
     """
     Check if an entity already exists in core_entities.
     
     Use this before approving to detect duplicates that should be merged.
+    Matches canonical keys and resolved aliases (trigram similarity, same
+    scale as pg_trgm), plus semantically related entities from the local
+    embedding index.
     """
     try:
-        conn = get_db_connection()
-        with conn.cursor() as cur:
-            # Exact match on canonical_key
-            cur.execute("""
-                SELECT id, canonical_key, name, entity_type::text, ecosystem::text
-                FROM core_entities 
-                WHERE LOWER(canonical_key) = LOWER(%s) AND is_current = TRUE
-            """, (entity_name,))
-            exact = cur.fetchall()
-            
-            # Similar names (trigram similarity if pg_trgm is installed)
-            try:
-                cur.execute("""
-                    SELECT id, canonical_key, name, entity_type::text, ecosystem::text,
-                           similarity(canonical_key, %s) as sim
-                    FROM core_entities 
-                    WHERE similarity(canonical_key, %s) > 0.3 AND is_current = TRUE
-                    ORDER BY sim DESC
-                    LIMIT 5
-                """, (entity_name, entity_name))
-                similar = cur.fetchall()
-            except Exception:
-                # pg_trgm not installed - fall back to LIKE
-                cur.execute("""
-                    SELECT id, canonical_key, name, entity_type::text, ecosystem::text
-                    FROM core_entities 
-                    WHERE LOWER(canonical_key) LIKE LOWER(%s) AND is_current = TRUE
-                    LIMIT 5
-                """, (f'%{entity_name}%',))
-                similar = [(r[0], r[1], r[2], r[3], r[4], 0.5) for r in cur.fetchall()]
-            
-        conn.close()
-        
-        result = f"Duplicate check for '{entity_name}' ({entity_type}):\n\n"
-        
-        if exact:
-            result += "[WARNING] EXACT MATCHES:\n"
-            for eid, key, name, etype, eco in exact:
-                result += f"  - {name} (key: {key}, {etype}, {eco}) ID: {eid}\n"
-        else:
-            result += "[OK] No exact matches\n"
-        
-        if similar:
-            result += "\n📊 Similar entities:\n"
-            for row in similar:
-                eid, key, name, etype, eco = row[:5]
-                sim = row[5] if len(row) > 5 else 0.5
-                result += f"  - {name} (key: {key}, {etype}, {eco}) similarity: {sim:.2f}\n"
-        
-        return result
+        match = _add_semantic_neighbors([get_entity_index().check(entity_name)])[0]
+        return _format_duplicate_check(entity_name, entity_type, match)
         
     except Exception as e:
         return f"Error checking duplicates: {str(e)}"
 
 
+@tool
+def check_for_duplicates_batch(entity_names: List[str]) -> str:
+    """
+    Check many candidate names against core_entities in one call.
+
+    Same matching as check_for_duplicates (exact canonical_key match,
+    trigram similarity over keys and resolved aliases, embedding neighbors),
+    done in memory. Use this when a page produced several candidates.
+
+    Args:
+        entity_names: Candidate entity names
+
+    Returns:
+        JSON string:
+        {
+            "duplicates_found": int (names with an exact match),
+            "results": [
+                {
+                    "name": str,
+                    "exact": [{id, canonical_key, name, entity_type, ecosystem}, ...],
+                    "similar": [{..., similarity, matched_text, via}, ...],
+                    "semantic": [{..., score}, ...]  (embedding neighbors not matched by name)
+                },
+                ...
+            ]
+        }
+    """
+    import json
+
+    try:
+        results = _add_semantic_neighbors(get_entity_index().check_many(entity_names))
+        return json.dumps({
+            "duplicates_found": sum(1 for r in results if r["exact"]),
+            "results": results
+        }, indent=2)
+
+    except Exception as e:
+        return f"Error checking duplicates: {str(e)}"
+
+
 @tool
 def check_if_dependency_exists(source: str, target: str, relationship_type: str) -> str:
     """LEGACY: Check if a dependency already exists in the knowledge graph (kg_nodes)."""
@@ -227,13 +330,10 @@ def check_if_dependency_exists(source: str, target: str, relationship_type: str)
         if not source_node:
             return f"[NEW] Component '{source}' doesn't exist yet. Safe to add."
 
-        # Check existing relationships
-        existing = gm.get_node_relationships(source_node['id'], direction='outgoing')
-
         # Check for exact match
-        for rel in existing:
-            if rel['target_name'] == target and rel['relationship_type'] == relationship_type:
-                return f"[DUPLICATE] Already exists: {source} --[{relationship_type}]--> {target}"
+        target_node = gm.get_node_by_name(target)
+        if target_node and gm.relationship_exists(source_node['id'], target_node['id'], relationship_type):
+            return f"[DUPLICATE] Already exists: {source} --[{relationship_type}]--> {target}"
 
         # Check for conflicts
         if relationship_type == 'conflicts_with':
@@ -279,11 +379,13 @@ def search_similar_dependencies(component_name: str) -> str:
         if not similar:
             return f"No similar components found for '{component_name}'"
 
+        # Get their dependencies
+        deps_by_node = gm.get_relationships_for_nodes([node['id'] for node in similar], direction='outgoing')
+
         result = f"Found {len(similar)} similar components:\n"
         for node in similar:
             result += f"  - {node['name']} ({node['node_type']})\n"
-            # Get their dependencies
-            deps = gm.get_node_relationships(node['id'], direction='outgoing')
+            deps = deps_by_node[str(node['id'])]
             if deps:
                 result += f"    Has {len(deps)} dependencies\n"
 
@@ -402,35 +504,40 @@ def query_staging_history(
         conn = get_db_connection()
 
         query = """
-            SELECT extraction_id, candidate_type::text, candidate_key,
-                   ecosystem::text, confidence_score, confidence_reason,
-                   status::text, evidence, created_at
-            FROM staging_extractions
+            SELECT s.extraction_id, s.candidate_type::text, s.candidate_key,
+                   s.ecosystem::text, s.confidence_score, s.confidence_reason,
+                   s.status::text,
+                   CASE WHEN et.raw_text IS NULL THEN s.evidence
+                        ELSE jsonb_build_object('raw_text', et.raw_text) || COALESCE(s.evidence, '{}'::jsonb)
+                   END AS evidence,
+                   s.created_at
+            FROM staging_extractions s
+            LEFT JOIN evidence_texts et ON et.evidence_checksum = s.evidence_checksum
             WHERE 1=1
         """
         params = []
 
         if status:
-            query += " AND status = %s::candidate_status"
+            query += " AND s.status = %s::candidate_status"
             params.append(status)
 
         if candidate_type:
-            query += " AND candidate_type = %s::candidate_type"
+            query += " AND s.candidate_type = %s::candidate_type"
             params.append(candidate_type)
 
         if ecosystem:
-            query += " AND ecosystem = %s::ecosystem_type"
+            query += " AND s.ecosystem = %s::ecosystem_type"
             params.append(ecosystem)
 
         if min_confidence is not None:
-            query += " AND confidence_score >= %s"
+            query += " AND s.confidence_score >= %s"
             params.append(min_confidence)
 
         if max_confidence is not None:
-            query += " AND confidence_score <= %s"
+            query += " AND s.confidence_score <= %s"
             params.append(max_confidence)
 
-        query += " ORDER BY created_at DESC LIMIT %s"
+        query += " ORDER BY s.created_at DESC LIMIT %s"
         params.append(limit)
 
         with conn.cursor() as cur:
@@ -665,6 +772,135 @@ def validate_epistemic_structure(epistemic_defaults: dict, epistemic_overrides:
     }, indent=2)
 
 
+def _load_text_view(conn, snapshot_id: str, snapshot_checksum: str):
+    """Load a snapshot's payload and return its html_text view (text + raw offset map)."""
+    with conn.cursor() as cur:
+        cur.execute("""
+            SELECT payload FROM raw_snapshots WHERE id = %s::uuid
+        """, (snapshot_id,))
+        payload_jsonb = cur.fetchone()[0]
+
+    if isinstance(payload_jsonb, dict):
+        payload_content = payload_jsonb.get('content', '')
+    else:
+        payload_content = str(payload_jsonb)
+
+    return get_text_view(payload_content, snapshot_checksum)
+
+
+def _load_snapshot_text(conn, snapshot_id: str) -> Optional[Tuple[str, str]]:
+    """
+    Get a snapshot's (content_hash, precomputed stripped text), or None if no such snapshot.
+
+    The payload is only loaded when the snapshot_text row is missing or was
+    written by an older normalizer; the text is then computed and stored.
+    """
+    with conn.cursor() as cur:
+        cur.execute("""
+            SELECT r.content_hash, t.text, t.normalizer_version
+            FROM raw_snapshots r
+            LEFT JOIN snapshot_text t ON t.content_hash = r.content_hash
+            WHERE r.id = %s::uuid
+        """, (snapshot_id,))
+        row = cur.fetchone()
+
+        if not row:
+            return None
+
+        snapshot_checksum, snapshot_text, normalizer_version = row
+
+        if snapshot_text is None or normalizer_version != NORMALIZER_VERSION:
+            # Snapshot predates snapshot_text (or normalizer changed):
+            # strip it the same way the extractor does and store the result
+            snapshot_text = _load_text_view(conn, snapshot_id, snapshot_checksum).text
+            cur.execute("""
+                INSERT INTO snapshot_text (content_hash, normalizer_version, text, text_size_bytes)
+                VALUES (%s, %s, %s, %s)
+                ON CONFLICT (content_hash) DO UPDATE SET
+                    normalizer_version = EXCLUDED.normalizer_version,
+                    text = EXCLUDED.text,
+                    text_size_bytes = EXCLUDED.text_size_bytes,
+                    created_at = NOW()
+            """, (snapshot_checksum, NORMALIZER_VERSION, snapshot_text,
+                  len(snapshot_text.encode('utf-8'))))
+            conn.commit()
+
+    return snapshot_checksum, snapshot_text
+
+
+def _fuzzy_match_details(conn, snapshot_id: str, snapshot_checksum: str, fuzzy_match, view=None) -> dict:
+    """Describe a fuzzy match, including its byte range in the raw payload."""
+    if view is None:
+        view = _load_text_view(conn, snapshot_id, snapshot_checksum)
+    raw_byte_range = view.raw_span(fuzzy_match.start, fuzzy_match.end)
+    return {
+        "edit_distance": fuzzy_match.distance,
+        "matched_text": view.text[fuzzy_match.start:fuzzy_match.end],
+        "raw_byte_range": list(raw_byte_range) if raw_byte_range else None,
+    }
+
+
+def _score_lineage(evidence_text: str, match: Optional[str]) -> dict:
+    """
+    Run the lineage checks for one quote and compute confidence.
+
+    Args:
+        evidence_text: The evidence quote
+        match: "exact", "normalized", "fuzzy", or None if not found in the snapshot
+
+    Returns:
+        Dict with lineage_verified, lineage_confidence, checks_passed, checks_failed
+    """
+    checks_passed = []
+    checks_failed = []
+
+    # Check 1: Evidence not empty
+    if evidence_text.strip():
+        checks_passed.append("evidence_not_empty")
+    else:
+        checks_failed.append("evidence_empty")
+
+    # Check 2: Evidence found in snapshot (exact or normalized match)
+    if match == "exact":
+        checks_passed.append("evidence_found_exact")
+    elif match == "normalized":
+        checks_passed.append("evidence_found_normalized")
+    elif match == "fuzzy":
+        # Near-miss quote (curly quotes, elided word, ...): found, but the
+        # quote is not verbatim so it costs confidence
+        checks_passed.append("evidence_found_fuzzy")
+        checks_failed.append("evidence_not_verbatim")
+    else:
+        checks_failed.append("evidence_not_found_in_snapshot")
+
+    # Check 3: Evidence length reasonable
+    evidence_length = len(evidence_text.encode('utf-8'))
+    if 10 <= evidence_length <= 10000:
+        checks_passed.append("evidence_length_reasonable")
+    else:
+        checks_failed.append("evidence_length_unreasonable")
+
+    # Check 4: Evidence not suspiciously repetitive
+    if len(set(evidence_text.split())) / max(len(evidence_text.split()), 1) > 0.3:
+        checks_passed.append("evidence_not_repetitive")
+    else:
+        checks_failed.append("evidence_too_repetitive")
+
+    # Calculate confidence
+    total_checks = len(checks_passed) + len(checks_failed)
+    lineage_confidence = len(checks_passed) / total_checks if total_checks > 0 else 0.0
+
+    # Verified if evidence found (exact, normalized or fuzzy) and confidence >= 0.5
+    lineage_verified = match is not None and (lineage_confidence >= 0.5)
+
+    return {
+        "lineage_verified": lineage_verified,
+        "lineage_confidence": round(lineage_confidence, 2),
+        "checks_passed": checks_passed,
+        "checks_failed": checks_failed,
+    }
+
+
 @tool
 def verify_evidence_lineage(snapshot_id: str, evidence_text: str) -> str:
     """
@@ -676,6 +912,12 @@ def verify_evidence_lineage(snapshot_id: str, evidence_text: str) -> str:
     The storage agent will use these results and compute deterministic metadata
     (checksums, byte offsets) separately.
 
+    Quotes are matched exactly, then after whitespace normalization, then
+    fuzzily (small edit distance, reported as evidence_found_fuzzy with the
+    matched span).
+
+    For several quotes from the same snapshot, use verify_evidence_lineage_batch.
+
     Args:
         snapshot_id: UUID of raw_snapshot to verify against
         evidence_text: The evidence quote to verify
@@ -688,126 +930,161 @@ def verify_evidence_lineage(snapshot_id: str, evidence_text: str) -> str:
             "checks_passed": list of check names,
             "checks_failed": list of check names,
             "snapshot_id": str,
+            "fuzzy_match": {edit_distance, matched_text, raw_byte_range} (fuzzy matches only),
             "issues": list of error messages (if any)
         }
     """
     import json
-    import re
 
     try:
         conn = get_db_connection()
-
-        # Query snapshot
-        with conn.cursor() as cur:
-            cur.execute("""
-                SELECT payload, content_hash
-                FROM raw_snapshots
-                WHERE id = %s::uuid
-            """, (snapshot_id,))
-            row = cur.fetchone()
-
-            if not row:
-                conn.close()
-                return json.dumps({
-                    "lineage_verified": False,
-                    "lineage_confidence": 0.0,
-                    "checks_passed": [],
-                    "checks_failed": ["snapshot_not_found"],
-                    "snapshot_id": snapshot_id,
-                    "issues": [f"Snapshot {snapshot_id} not found in database"]
-                }, indent=2)
-
-            payload_jsonb, snapshot_checksum = row
-
+        loaded = _load_snapshot_text(conn, snapshot_id)
+
+        if loaded is None:
+            conn.close()
+            return json.dumps({
+                "lineage_verified": False,
+                "lineage_confidence": 0.0,
+                "checks_passed": [],
+                "checks_failed": ["snapshot_not_found"],
+                "snapshot_id": snapshot_id,
+                "issues": [f"Snapshot {snapshot_id} not found in database"]
+            }, indent=2)
+
+        snapshot_checksum, snapshot_text = loaded
+
+        # Snapshot text is already stripped and whitespace-normalized, so the
+        # first two tiers are plain substring searches
+        fuzzy_details = None
+        if evidence_text in snapshot_text:
+            match = "exact"
+        elif normalize_text(evidence_text) in snapshot_text:
+            match = "normalized"
+        else:
+            fuzzy_match = FuzzyIndex(snapshot_text).find(evidence_text)
+            if fuzzy_match:
+                match = "fuzzy"
+                fuzzy_details = _fuzzy_match_details(conn, snapshot_id, snapshot_checksum, fuzzy_match)
+            else:
+                match = None
         conn.close()
 
-        # Extract content from JSONB payload
-        if isinstance(payload_jsonb, dict):
-            payload_content = payload_jsonb.get('content', '')
-        else:
-            payload_content = str(payload_jsonb)
-
-        # Strip HTML tags (same as extractor does) for fair comparison
-        # Evidence quotes are from stripped text, so snapshot must be stripped too
-        payload_stripped = re.sub(r'<script[^>]*>.*?</script>', '', payload_content, flags=re.DOTALL)
-        payload_stripped = re.sub(r'<style[^>]*>.*?</style>', '', payload_stripped, flags=re.DOTALL)
-        payload_stripped = re.sub(r'<[^>]+>', ' ', payload_stripped)
-        payload_stripped = re.sub(r'\s+', ' ', payload_stripped).strip()
-
-        # UTF-8 encoding for verification (use stripped content)
-        payload_bytes = payload_stripped.encode('utf-8')
-        evidence_bytes = evidence_text.encode('utf-8')
-
-        # Verification checks
-        checks_passed = []
-        checks_failed = []
-
-        # Check 1: Evidence not empty
-        if evidence_text.strip():
-            checks_passed.append("evidence_not_empty")
-        else:
-            checks_failed.append("evidence_empty")
+        result = _score_lineage(evidence_text, match)
+        result["snapshot_id"] = snapshot_id
+        if fuzzy_details:
+            result["fuzzy_match"] = fuzzy_details
+        return json.dumps(result, indent=2)
 
-        # Check 2: Evidence found in snapshot (exact match)
-        exact_match_offset = payload_bytes.find(evidence_bytes)
-        if exact_match_offset != -1:
-            checks_passed.append("evidence_found_exact")
-        else:
-            # Try normalized match (formatting-only normalization)
-            def normalize_text(text: str) -> str:
-                """STRICT formatting-only normalization."""
-                text = text.replace('\r\n', '\n').replace('\r', '\n')
-                text = re.sub(r'\s+', ' ', text)
-                text = text.strip()
-                return text
-
-            payload_normalized = normalize_text(payload_stripped)  # Use stripped content
-            evidence_normalized = normalize_text(evidence_text)
-
-            if evidence_normalized in payload_normalized:
-                checks_passed.append("evidence_found_normalized")
-            else:
-                checks_failed.append("evidence_not_found_in_snapshot")
+    except Exception as e:
+        return json.dumps({
+            "lineage_verified": False,
+            "lineage_confidence": 0.0,
+            "checks_passed": [],
+            "checks_failed": ["verification_error"],
+            "snapshot_id": snapshot_id,
+            "issues": [str(e)]
+        }, indent=2)
 
-        # Check 3: Evidence length reasonable
-        evidence_length = len(evidence_bytes)
-        if 10 <= evidence_length <= 10000:
-            checks_passed.append("evidence_length_reasonable")
-        else:
-            checks_failed.append("evidence_length_unreasonable")
 
-        # Check 4: Evidence not suspiciously repetitive
-        if len(set(evidence_text.split())) / max(len(evidence_text.split()), 1) > 0.3:
-            checks_passed.append("evidence_not_repetitive")
-        else:
-            checks_failed.append("evidence_too_repetitive")
+@tool
+def verify_evidence_lineage_batch(snapshot_id: str, evidence_texts: List[str]) -> str:
+    """
+    Verify many evidence quotes from the same snapshot in one call.
 
-        # Calculate confidence
-        total_checks = len(checks_passed) + len(checks_failed)
-        lineage_confidence = len(checks_passed) / total_checks if total_checks > 0 else 0.0
+    Loads the snapshot once and locates every quote (exact and normalized
+    variants) in a single Aho-Corasick pass, so the cost per snapshot does
+    not grow with the number of candidates. Quotes that miss go to the same
+    fuzzy tier as verify_evidence_lineage; checks and confidence are the same.
 
-        # Verified if evidence found (exact or normalized) and confidence >= 0.5
-        evidence_found = "evidence_found_exact" in checks_passed or "evidence_found_normalized" in checks_passed
-        lineage_verified = evidence_found and (lineage_confidence >= 0.5)
+    Args:
+        snapshot_id: UUID of raw_snapshot all quotes were extracted from
+        evidence_texts: Evidence quotes to verify
+
+    Returns:
+        JSON string:
+        {
+            "snapshot_id": str,
+            "verified_count": int,
+            "results": [
+                {
+                    "index": int (position in evidence_texts),
+                    "lineage_verified": bool,
+                    "lineage_confidence": float (0.0-1.0),
+                    "checks_passed": list of check names,
+                    "checks_failed": list of check names,
+                    "match_offset": byte offset in snapshot text, or null,
+                    "fuzzy_match": {...} (fuzzy matches only, see verify_evidence_lineage)
+                },
+                ...
+            ],
+            "issues": list of error messages (if any)
+        }
+    """
+    import json
 
+    def all_failed(check: str, issue: str) -> str:
         return json.dumps({
-            "lineage_verified": lineage_verified,
-            "lineage_confidence": round(lineage_confidence, 2),
-            "checks_passed": checks_passed,
-            "checks_failed": checks_failed,
-            "snapshot_id": snapshot_id
+            "snapshot_id": snapshot_id,
+            "verified_count": 0,
+            "results": [
+                {
+                    "index": i,
+                    "lineage_verified": False,
+                    "lineage_confidence": 0.0,
+                    "checks_passed": [],
+                    "checks_failed": [check],
+                    "match_offset": None
+                }
+                for i in range(len(evidence_texts))
+            ],
+            "issues": [issue]
         }, indent=2)
 
-    except Exception as e:
+    try:
+        conn = get_db_connection()
+        loaded = _load_snapshot_text(conn, snapshot_id)
+
+        if loaded is None:
+            conn.close()
+            return all_failed("snapshot_not_found", f"Snapshot {snapshot_id} not found in database")
+
+        snapshot_checksum, snapshot_text = loaded
+        matches = match_quotes(snapshot_text, evidence_texts)
+
+        # Fuzzy tier for misses; index and raw view are built at most once
+        fuzzy_index = None
+        view = None
+        results = []
+        for i, (evidence_text, found) in enumerate(zip(evidence_texts, matches)):
+            match = found["match"]
+            fuzzy_details = None
+            if match is None:
+                if fuzzy_index is None:
+                    fuzzy_index = FuzzyIndex(snapshot_text)
+                fuzzy_match = fuzzy_index.find(evidence_text)
+                if fuzzy_match:
+                    match = "fuzzy"
+                    if view is None:
+                        view = _load_text_view(conn, snapshot_id, snapshot_checksum)
+                    fuzzy_details = _fuzzy_match_details(conn, snapshot_id, snapshot_checksum, fuzzy_match, view)
+
+            result = {"index": i}
+            result.update(_score_lineage(evidence_text, match))
+            result["match_offset"] = found["offset"]
+            if fuzzy_details:
+                result["fuzzy_match"] = fuzzy_details
+            results.append(result)
+        conn.close()
+
         return json.dumps({
-            "lineage_verified": False,
-            "lineage_confidence": 0.0,
-            "checks_passed": [],
-            "checks_failed": ["verification_error"],
             "snapshot_id": snapshot_id,
-            "issues": [str(e)]
+            "verified_count": sum(1 for r in results if r["lineage_verified"]),
+            "results": results
         }, indent=2)
 
+    except Exception as e:
+        return all_failed("verification_error", str(e))
+
 
 @traceable(name="validator_subagent")
 def create_validator_agent(checkpointer=None):
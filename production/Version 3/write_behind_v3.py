@@ -0,0 +1,413 @@
+"""
+Write-Behind Storage Buffer (optional)
+
+With parallel extraction workers, storing every candidate synchronously makes
+Neon latency the bottleneck. When enabled (PROVES_WRITE_BEHIND=1),
+store_extractions_bulk() hands candidates to this buffer instead:
+
+1. submit() appends the candidates to a local JSONL journal (fsync'd) and
+   returns their pre-assigned extraction ids - no database round trip
+2. a background thread flushes queued candidates with stage_extractions_bulk()
+   once MAX_BATCH are queued or the oldest has waited MAX_DELAY seconds
+3. each flushed batch is recorded in the journal; on startup, journaled
+   candidates without a flush record are replayed
+
+Each process writes its own journal file in the journal directory and holds
+an exclusive lock on it. The journal is created under a temporary name,
+locked, and only then renamed into place, so no journal-*.jsonl is ever
+visible unlocked. At startup (replay_orphaned_journals()) every journal
+whose lock can be taken belongs to a process that died; its unflushed
+candidates move into the new process's journal and the orphan is deleted.
+
+Extraction ids are assigned at submit time and stage_extractions_bulk() skips
+ids that are already stored, so a batch that was written but not yet marked
+flushed when the process died is not duplicated on replay.
+
+A batch the database rejects (bad enum value, FK miss, ...) is split in
+halves until the offending candidates are isolated; those are recorded as
+skipped with the database error and the rest are stored.
+
+Journal records (one JSON object per line):
+    {"op": "stage", "candidate": {...}}               - queued candidate
+    {"op": "flushed", "ids": [...]}                   - written to Neon
+    {"op": "skipped", "ids": [...], "reasons": [...]} - rejected by storage
+"""
+import atexit
+import json
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import psycopg
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+version3_folder = Path(__file__).parent  # production/Version 3/
+project_root = version3_folder.parent.parent  # PROVES_LIBRARY/
+
+from storage_v3 import get_db_connection, stage_extractions_bulk
+
+# Flush when this many candidates are queued ...
+MAX_BATCH = 50
+# ... or when the oldest queued candidate has waited this many seconds
+MAX_DELAY = 2.0
+# Seconds to wait before retrying after a failed flush
+RETRY_DELAY = 10.0
+
+# One journal-<pid>-<id>.jsonl per process (override: PROVES_WRITE_BEHIND_DIR)
+DEFAULT_JOURNAL_DIR = project_root / '.cache' / 'write_behind'
+
+
+def write_behind_enabled() -> bool:
+    """True if PROVES_WRITE_BEHIND is set to a truthy value."""
+    return os.environ.get('PROVES_WRITE_BEHIND', '').lower() in ('1', 'true', 'yes', 'on')
+
+
+def _try_lock(f) -> bool:
+    """Take an exclusive non-blocking lock on an open journal (False if held elsewhere)."""
+    try:
+        if fcntl:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            # Byte-range lock; every process locks byte 0
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+
+def _read_pending(path: Path) -> Dict[str, Dict[str, Any]]:
+    """Journaled candidates without a flushed/skipped record, by extraction id."""
+    pending: Dict[str, Dict[str, Any]] = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # Torn final line from a crash mid-append
+                continue
+            if record.get('op') == 'stage':
+                candidate = record['candidate']
+                pending[candidate['extraction_id']] = candidate
+            elif record.get('op') in ('flushed', 'skipped'):
+                for extraction_id in record.get('ids', []):
+                    pending.pop(extraction_id, None)
+    return pending
+
+
+class WriteBehindBuffer:
+    """Journaled in-process queue of staged candidates with a background flusher"""
+
+    def __init__(
+        self,
+        journal_dir: Path = DEFAULT_JOURNAL_DIR,
+        max_batch: int = MAX_BATCH,
+        max_delay: float = MAX_DELAY,
+    ):
+        self.journal_dir = Path(journal_dir)
+        self.journal_path = self.journal_dir / f"journal-{os.getpid()}-{uuid.uuid4().hex[:8]}.jsonl"
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+
+        self._cond = threading.Condition()
+        # Serializes flushes (the flusher thread vs. explicit flush() calls)
+        self._flush_lock = threading.Lock()
+        self._queue: List[Dict[str, Any]] = []
+        self._oldest: Optional[float] = None
+        self._retry_at = 0.0
+        self._closed = False
+        self.stats = {"submitted": 0, "flushed": 0, "skipped": 0, "failed_flushes": 0, "replayed": 0}
+
+        self.journal_dir.mkdir(parents=True, exist_ok=True)
+        self._journal = self._create_journal()
+        self._replay()
+
+        self._thread = threading.Thread(target=self._run, name="write-behind-flusher", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    # ------------------------------------------------------------------
+    # Journal
+    # ------------------------------------------------------------------
+
+    def _create_journal(self):
+        """Open this process's journal with the lock already held."""
+        if fcntl is None:
+            # Windows cannot rename an open file. A replay racing this lock
+            # cannot delete the journal either (it is open here), and ids it
+            # re-queues are skipped by stage_extractions_bulk() as stored.
+            f = open(self.journal_path, 'a', encoding='utf-8')
+        else:
+            # Hidden temp name (not matched by _replay()) until it is locked
+            tmp_path = self.journal_dir / f".{self.journal_path.name}.tmp"
+            f = open(tmp_path, 'a', encoding='utf-8')
+        if not _try_lock(f):
+            f.close()
+            raise RuntimeError(f"could not lock write-behind journal {self.journal_path}")
+        if fcntl is not None:
+            os.rename(tmp_path, self.journal_path)
+        return f
+
+    def _replay(self) -> None:
+        """Take over the unflushed candidates of every orphaned journal in the directory."""
+        # Temp journals of processes that died before renaming them (always empty)
+        for path in self.journal_dir.glob('.journal-*.tmp'):
+            try:
+                with open(path, 'a', encoding='utf-8') as f:
+                    if _try_lock(f):
+                        path.unlink()
+            except OSError:
+                pass
+
+        for path in sorted(self.journal_dir.glob('journal-*.jsonl')):
+            if path == self.journal_path:
+                continue
+            try:
+                f = open(path, 'a+', encoding='utf-8')
+            except OSError:
+                continue
+            try:
+                if not _try_lock(f):
+                    # Owned by a live process
+                    continue
+                pending = _read_pending(path)
+                if pending:
+                    # Our journal first, so a crash here leaves them journaled twice, never zero times
+                    self._append([{"op": "stage", "candidate": c} for c in pending.values()])
+                    if not self._queue:
+                        self._oldest = time.monotonic()
+                    self._queue.extend(pending.values())
+                    self.stats["replayed"] += len(pending)
+                    print(f"[WRITE-BEHIND] Replaying {len(pending)} unflushed candidate(s) from {path.name}")
+            finally:
+                f.close()
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    def _append(self, records: List[Dict[str, Any]]) -> None:
+        """Append records to the journal and fsync (caller holds the lock)."""
+        for record in records:
+            self._journal.write(json.dumps(record, default=str) + "\n")
+        self._journal.flush()
+        os.fsync(self._journal.fileno())
+
+    def _compact(self) -> None:
+        """Truncate the journal once everything in it is flushed (caller holds the lock)."""
+        if not self._queue:
+            self._journal.truncate(0)
+            self._journal.seek(0)
+
+    # ------------------------------------------------------------------
+    # Producer side (worker threads)
+    # ------------------------------------------------------------------
+
+    def submit(
+        self,
+        candidates: List[Dict[str, Any]],
+        source_url: str = None,
+        source_snapshot_id: str = None,
+        epistemic_defaults: dict = None,
+    ) -> List[str]:
+        """
+        Queue candidates for storage; never touches the database
+
+        Call-level arguments are folded into each candidate so the journal
+        is self-contained.
+
+        Returns:
+            Extraction ids the candidates will be stored under
+        """
+        prepared = []
+        for candidate in candidates:
+            candidate = dict(candidate)
+            candidate.setdefault('extraction_id', str(uuid.uuid4()))
+            if source_snapshot_id and not candidate.get('source_snapshot_id'):
+                candidate['source_snapshot_id'] = source_snapshot_id
+            if source_url and not (candidate.get('source_metadata') or {}).get('source_url'):
+                candidate['source_metadata'] = {**(candidate.get('source_metadata') or {}), "source_url": source_url}
+            if epistemic_defaults and not candidate.get('epistemic_defaults'):
+                candidate['epistemic_defaults'] = epistemic_defaults
+            prepared.append(candidate)
+
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("write-behind buffer is closed")
+            self._append([{"op": "stage", "candidate": c} for c in prepared])
+            if not self._queue:
+                self._oldest = time.monotonic()
+            self._queue.extend(prepared)
+            self.stats["submitted"] += len(prepared)
+            self._cond.notify()
+
+        return [c['extraction_id'] for c in prepared]
+
+    # ------------------------------------------------------------------
+    # Flusher side
+    # ------------------------------------------------------------------
+
+    def _due(self) -> bool:
+        """True if the queue should be flushed now (caller holds the lock)."""
+        if not self._queue or time.monotonic() < self._retry_at:
+            return False
+        return (
+            self._closed
+            or len(self._queue) >= self.max_batch
+            or time.monotonic() - self._oldest >= self.max_delay
+        )
+
+    def _run(self) -> None:
+        """Background loop: wait for a size/time threshold, then flush."""
+        while True:
+            with self._cond:
+                while not self._due():
+                    if self._closed and not self._queue:
+                        return
+                    self._cond.wait(timeout=min(self.max_delay, 1.0))
+            self.flush()
+            with self._cond:
+                if self._closed and self._retry_at:
+                    # Neon unreachable at shutdown - leave the rest journaled for replay
+                    return
+
+    def flush(self) -> int:
+        """
+        Write queued candidates to Neon (in batches of max_batch)
+
+        If Neon is unreachable the candidates stay queued (and journaled) and
+        are retried after RETRY_DELAY; candidates the database rejects are
+        recorded as skipped (see _stage()).
+
+        Returns:
+            Number of candidates stored
+        """
+        with self._flush_lock:
+            return self._flush_batches()
+
+    def _flush_batches(self) -> int:
+        """flush() body (caller holds _flush_lock)."""
+        stored = 0
+        while True:
+            with self._cond:
+                batch = self._queue[:self.max_batch]
+            if not batch:
+                return stored
+
+            try:
+                conn = get_db_connection()
+                try:
+                    staged, skipped = self._stage(conn, batch)
+                finally:
+                    conn.close()
+            except Exception as e:
+                with self._cond:
+                    self.stats["failed_flushes"] += 1
+                    self._retry_at = time.monotonic() + RETRY_DELAY
+                print(f"[WRITE-BEHIND] Flush of {len(batch)} candidate(s) failed, retrying in {RETRY_DELAY:.0f}s: {e}")
+                return stored
+
+            with self._cond:
+                records = []
+                if staged:
+                    records.append({"op": "flushed", "ids": [eid for eid, _, _ in staged]})
+                if skipped:
+                    records.append({
+                        "op": "skipped",
+                        "ids": [c['extraction_id'] for c, _ in skipped],
+                        "reasons": [reason for _, reason in skipped],
+                    })
+                self._append(records)
+                del self._queue[:len(batch)]
+                self._oldest = time.monotonic() if self._queue else None
+                self._retry_at = 0.0
+                self.stats["flushed"] += len(staged)
+                self.stats["skipped"] += len(skipped)
+                self._compact()
+
+            for _, reason in skipped:
+                print(f"[WRITE-BEHIND] Skipped {reason}")
+            stored += len(staged)
+
+    def _stage(self, conn, batch: List[Dict[str, Any]]) -> Tuple[list, list]:
+        """
+        stage_extractions_bulk(), isolating candidates the database rejects
+
+        Connection-level errors propagate (the batch is retried later); a
+        rejected batch is bisected and each failing candidate is returned as
+        skipped with the database error.
+        """
+        try:
+            return stage_extractions_bulk(conn, batch)
+        except psycopg.OperationalError:
+            raise
+        except Exception as e:
+            # Bad data (enum value, FK miss, unserializable payload, ...)
+            conn.rollback()
+            if len(batch) == 1:
+                label = batch[0].get('candidate_key') or batch[0]['extraction_id']
+                return [], [(batch[0], f"{label}: rejected by database: {str(e).strip()}")]
+            middle = len(batch) // 2
+            staged, skipped = self._stage(conn, batch[:middle])
+            more_staged, more_skipped = self._stage(conn, batch[middle:])
+            return staged + more_staged, skipped + more_skipped
+
+    def pending(self) -> int:
+        """Candidates queued but not yet written."""
+        with self._cond:
+            return len(self._queue)
+
+    def close(self, timeout: float = 30.0) -> None:
+        """Flush what's queued and stop the flusher (unflushed candidates stay journaled)."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._retry_at = 0.0
+            self._cond.notify_all()
+        self._thread.join(timeout)
+        with self._cond:
+            self._journal.close()
+            if not self._queue:
+                # Everything flushed; nothing for a later run to replay
+                try:
+                    self.journal_path.unlink()
+                except OSError:
+                    pass
+
+
+# Process-wide buffer instance
+_buffer: Optional[WriteBehindBuffer] = None
+_buffer_lock = threading.Lock()
+
+
+def get_write_behind_buffer() -> WriteBehindBuffer:
+    """Get or create the process-wide buffer (replays orphaned journals on creation)."""
+    global _buffer
+    with _buffer_lock:
+        if _buffer is None:
+            journal_dir = os.environ.get('PROVES_WRITE_BEHIND_DIR')
+            _buffer = WriteBehindBuffer(Path(journal_dir) if journal_dir else DEFAULT_JOURNAL_DIR)
+        return _buffer
+
+
+def replay_orphaned_journals() -> int:
+    """
+    Start the buffer at process startup so crashed runs' candidates are flushed
+
+    Call from worker entry points; a no-op unless write-behind is enabled.
+
+    Returns:
+        Number of candidates replayed
+    """
+    if not write_behind_enabled():
+        return 0
+    return get_write_behind_buffer().stats["replayed"]
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Cascade Engine for PROVES Library
+Bounded BFS over one cascade_domain of the knowledge graph
+
+find_cascade_path used a recursive CTE that carried a path array per row,
+so the result grew with the number of paths (exponential in depth on a
+dense coupling graph) and had no cap. This engine runs a frontier BFS over
+the graph cache's per-domain CSR adjacency instead:
+
+- each node is visited once (at its minimum hop depth), so work is bounded
+  by the edges in the domain, not the paths through them
+- depth, per-node fan-out and total node caps, with truncation reported
+- optional early termination at the first is_critical edge
+- results are memoized per graph version
+
+The result is a compact cascade tree: every reached node once, with its
+depth and the edge it was reached through (parent links give a shortest
+path back to the start), plus every critical edge seen.
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from graph_cache import GraphCache, get_graph_cache
+
+MAX_DEPTH = 5
+# Out-edges expanded per node (critical first, then strongest)
+MAX_FANOUT = 50
+# Nodes reached before the search stops
+MAX_NODES = 5000
+
+# Cached cascade trees (per graph version)
+MEMO_SIZE = 256
+
+
+class CascadeEngine:
+    """Bounded, memoized cascade search over the graph cache"""
+
+    def __init__(self, cache: Optional[GraphCache] = None):
+        self.cache = cache or get_graph_cache()
+        self._memo: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _expand_order(self, out: np.ndarray, max_fanout: int) -> np.ndarray:
+        """Out-edges of one node, capped to max_fanout (critical, then strongest first)."""
+        if len(out) <= max_fanout:
+            return out
+        cache = self.cache
+        strength = np.nan_to_num(cache.strength[out], nan=0.0)
+        order = np.lexsort((-strength, ~cache.is_critical[out]))
+        return out[order[:max_fanout]]
+
+    def cascade(
+        self,
+        start_node_id: Any,
+        cascade_domain: str,
+        max_depth: int = MAX_DEPTH,
+        max_fanout: int = MAX_FANOUT,
+        max_nodes: int = MAX_NODES,
+        stop_at_critical: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Cascade tree from a starting node within one domain
+
+        Args:
+            start_node_id: Starting node UUID
+            cascade_domain: Domain to trace (power, data, thermal, timing)
+            max_depth: Maximum hops from the start
+            max_fanout: Out-edges expanded per node
+            max_nodes: Nodes reached before stopping
+            stop_at_critical: Stop as soon as an is_critical edge is reached
+
+        Returns:
+            {
+              "root": {"node_id", "name"} or None if the node is unknown,
+              "cascade_domain", "max_depth",
+              "nodes": [{"node_id", "name", "node_type", "depth", "parent_node_id",
+                         "via": relationship dict}],   # BFS order, start excluded
+              "critical_edges": [relationship dict + "depth"],
+              "truncated": {"depth": bool, "fanout": int, "nodes": bool},
+              "stopped_at_critical": bool
+            }
+        """
+        cache = self.cache
+        cache.ensure_fresh()
+        key = (cache.version, str(start_node_id), cascade_domain, max_depth, max_fanout, max_nodes, stop_at_critical)
+        with self._lock:
+            if key in self._memo:
+                self._memo.move_to_end(key)
+                return self._memo[key]
+
+        tree = self._search(start_node_id, cascade_domain, max_depth, max_fanout, max_nodes, stop_at_critical)
+
+        with self._lock:
+            self._memo[key] = tree
+            while len(self._memo) > MEMO_SIZE:
+                self._memo.popitem(last=False)
+        return tree
+
+    def _search(
+        self,
+        start_node_id: Any,
+        cascade_domain: str,
+        max_depth: int,
+        max_fanout: int,
+        max_nodes: int,
+        stop_at_critical: bool
+    ) -> Dict[str, Any]:
+        cache = self.cache
+        tree = {
+            "root": None,
+            "cascade_domain": cascade_domain,
+            "max_depth": max_depth,
+            "nodes": [],
+            "critical_edges": [],
+            "truncated": {"depth": False, "fanout": 0, "nodes": False},
+            "stopped_at_critical": False,
+        }
+
+        start = cache.node_index(start_node_id)
+        if start is None:
+            return tree
+        tree["root"] = {"node_id": cache.node_id(start), "name": cache.node_name(start)}
+
+        indptr, edges = cache.adjacency('outgoing', cascade_domain)
+        depth = {start: 0}
+        parent_edge: Dict[int, int] = {}
+        order: List[int] = []
+        critical: List[tuple] = []
+
+        frontier = [start]
+        done = False
+        for d in range(1, max_depth + 1):
+            next_frontier = []
+            for u in frontier:
+                out = edges[indptr[u]:indptr[u + 1]]
+                if len(out) > max_fanout:
+                    tree["truncated"]["fanout"] += 1
+                out = self._expand_order(out, max_fanout)
+
+                for e in out.tolist():
+                    v = int(cache.dst[e])
+                    if cache.is_critical[e]:
+                        critical.append((e, d))
+                    if v in depth:
+                        continue
+                    depth[v] = d
+                    parent_edge[v] = e
+                    order.append(v)
+                    next_frontier.append(v)
+
+                    if stop_at_critical and cache.is_critical[e]:
+                        tree["stopped_at_critical"] = True
+                        done = True
+                    elif len(order) >= max_nodes:
+                        tree["truncated"]["nodes"] = True
+                        done = True
+                    if done:
+                        break
+                if done:
+                    break
+            frontier = next_frontier
+            if done or not frontier:
+                break
+        else:
+            # Depth cap reached: were there unexplored edges past it?
+            tree["truncated"]["depth"] = any(indptr[u + 1] > indptr[u] for u in frontier)
+
+        for v in order:
+            e = parent_edge[v]
+            tree["nodes"].append({
+                "node_id": cache.node_id(v),
+                "name": cache.node_name(v),
+                "node_type": cache.node_type(v),
+                "depth": depth[v],
+                "parent_node_id": cache.node_id(int(cache.src[e])),
+                "via": self._edge_summary(e),
+            })
+        tree["critical_edges"] = [{**self._edge_summary(e), "depth": d} for e, d in critical]
+        return tree
+
+    def _edge_summary(self, e: int) -> Dict[str, Any]:
+        """Relationship fields needed to read a cascade (no timestamps/description)."""
+        edge = self.cache.edge(e)
+        return {
+            "id": edge["id"],
+            "source_node_id": edge["source_node_id"],
+            "target_node_id": edge["target_node_id"],
+            "source_name": edge["source_name"],
+            "target_name": edge["target_name"],
+            "relationship_type": edge["relationship_type"],
+            "strength": edge["strength"],
+            "is_critical": edge["is_critical"],
+        }
+
+
+def path_to(tree: Dict[str, Any], node_id: Any) -> List[Dict[str, Any]]:
+    """
+    Shortest cascade path from the tree root to node_id
+
+    Returns:
+        Relationship dicts from the root outwards ([] if not reached)
+    """
+    by_id = {n["node_id"]: n for n in tree["nodes"]}
+    path = []
+    current = by_id.get(str(node_id))
+    while current is not None:
+        path.append(current["via"])
+        current = by_id.get(current["parent_node_id"])
+    return list(reversed(path))
+
+
+# Process-wide engine instance
+_engine: Optional[CascadeEngine] = None
+
+
+def get_cascade_engine() -> CascadeEngine:
+    """Get or create the process-wide cascade engine."""
+    global _engine
+    if _engine is None:
+        _engine = CascadeEngine()
+    return _engine
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Coupling Loop Detection for PROVES Library
+Feedback loops (A -> B -> ... -> A) per cascade_domain
+
+Feedback loops such as power manager -> watchdog -> reset controller ->
+power manager are the most dangerous couplings. Per domain:
+
+1. Tarjan SCC over the cached graph, O(V + E); only nodes in a
+   non-trivial component (or with a self-loop) can be on a loop
+2. Johnson's elementary-cycle search inside each such component, capped
+   at max_cycles per domain and max_length hops per loop
+
+Loops are written to kg_coupling_loops (keyed by domain + node sequence,
+so a loop keeps its first_detected_at across scans; loops that disappear
+are marked inactive) and the per-domain summary to kg_loop_scans, where the
+MCP server and the progress report read them.
+"""
+import hashlib
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from db_connector import get_db
+from graph_cache import GraphCache, get_graph_cache
+from reachability import strongly_connected_components
+
+# Elementary cycles recorded per domain before the search stops
+MAX_CYCLES = 1000
+# Longest loop (in relationships) searched for
+MAX_CYCLE_LENGTH = 12
+
+
+def simple_cycles(
+    adjacency: Dict[int, List[int]],
+    max_cycles: int = MAX_CYCLES,
+    max_length: int = MAX_CYCLE_LENGTH
+) -> Tuple[List[List[int]], bool]:
+    """
+    Elementary cycles of a directed graph (Johnson), iterative
+
+    A path cut short by max_length is treated like one that closed a
+    cycle, so its nodes are unblocked and no shorter cycle is missed.
+
+    Args:
+        adjacency: node -> successors (one strongly connected component)
+
+    Returns:
+        (cycles as node lists starting at their smallest node, truncated)
+    """
+    cycles: List[List[int]] = []
+    for start in sorted(adjacency):
+        successors = {v: [w for w in adjacency[v] if w >= start] for v in adjacency if v >= start}
+        blocked: Set[int] = {start}
+        blocked_by: Dict[int, Set[int]] = defaultdict(set)
+        path = [start]
+        closed = [False]
+        stack = [iter(successors[start])]
+
+        while stack:
+            v = path[-1]
+            for w in stack[-1]:
+                if w == start:
+                    cycles.append(list(path))
+                    closed[-1] = True
+                    if len(cycles) >= max_cycles:
+                        return cycles, True
+                elif w not in blocked:
+                    if len(path) >= max_length:
+                        closed[-1] = True
+                        continue
+                    path.append(w)
+                    closed.append(False)
+                    stack.append(iter(successors[w]))
+                    blocked.add(w)
+                    break
+            else:
+                stack.pop()
+                path.pop()
+                was_closed = closed.pop()
+                if was_closed:
+                    if closed:
+                        closed[-1] = True
+                    # Unblock v and everything waiting on it
+                    pending = [v]
+                    while pending:
+                        u = pending.pop()
+                        if u in blocked:
+                            blocked.discard(u)
+                            pending.extend(blocked_by.pop(u, ()))
+                else:
+                    for w in successors[v]:
+                        blocked_by[w].add(v)
+    return cycles, False
+
+
+class CouplingLoopDetector:
+    """Finds coupling loops in the graph cache and records them"""
+
+    def __init__(self, cache: Optional[GraphCache] = None):
+        self.db = get_db()
+        self.cache = cache or get_graph_cache()
+
+    def find_loops(
+        self,
+        cascade_domain: str,
+        max_cycles: int = MAX_CYCLES,
+        max_length: int = MAX_CYCLE_LENGTH
+    ) -> Dict[str, Any]:
+        """
+        Loops in one domain
+
+        Returns:
+            {"cascade_domain", "components": [[node_id, ...]], "loops": [loop dict],
+             "truncated": bool}
+        """
+        cache = self.cache
+        cache.ensure_fresh()
+        indptr, edges = cache.adjacency('outgoing', cascade_domain)
+        comp, _ = strongly_connected_components(cache.num_nodes, indptr, cache.dst[edges])
+
+        src = cache.src[edges].astype(np.int64)
+        dst = cache.dst[edges].astype(np.int64)
+        inside = (comp[src] == comp[dst]) & (comp[src] >= 0)
+
+        # Best edge per hop: critical first, then strongest
+        best: Dict[Tuple[int, int], int] = {}
+        members: Dict[int, Dict[int, List[int]]] = defaultdict(dict)
+        for e, u, v in zip(edges[inside].tolist(), src[inside].tolist(), dst[inside].tolist()):
+            current = best.get((u, v))
+            if current is None:
+                members[int(comp[u])].setdefault(u, []).append(v)
+                members[int(comp[u])].setdefault(v, [])
+                best[(u, v)] = e
+            elif self._edge_rank(e) > self._edge_rank(current):
+                best[(u, v)] = e
+
+        result = {"cascade_domain": cascade_domain, "components": [], "loops": [], "truncated": False}
+        remaining = max_cycles
+        for component, adjacency in sorted(members.items(), key=lambda item: -len(item[1])):
+            result["components"].append([cache.node_id(v) for v in sorted(adjacency)])
+            if remaining <= 0:
+                result["truncated"] = True
+                continue
+            cycles, truncated = simple_cycles(adjacency, remaining, max_length)
+            result["truncated"] |= truncated
+            remaining -= len(cycles)
+            for cycle in cycles:
+                hops = [best[(cycle[k], cycle[(k + 1) % len(cycle)])] for k in range(len(cycle))]
+                result["loops"].append(self._loop(cascade_domain, cycle, hops, len(adjacency)))
+        return result
+
+    def _edge_rank(self, e: int) -> Tuple[bool, float]:
+        strength = float(self.cache.strength[e])
+        return bool(self.cache.is_critical[e]), (0.0 if np.isnan(strength) else strength)
+
+    def _loop(self, cascade_domain: str, cycle: List[int], hops: List[int], component_size: int) -> Dict[str, Any]:
+        cache = self.cache
+        node_ids = [cache.node_id(v) for v in cycle]
+        # Rotate so the loop starts at its smallest UUID (stable across scans)
+        first = node_ids.index(min(node_ids))
+        node_ids = node_ids[first:] + node_ids[:first]
+        cycle = cycle[first:] + cycle[:first]
+        hops = hops[first:] + hops[:first]
+
+        strengths = [float(cache.strength[e]) for e in hops if not np.isnan(cache.strength[e])]
+        return {
+            "loop_key": hashlib.sha1(f"{cascade_domain}:{'>'.join(node_ids)}".encode()).hexdigest(),
+            "cascade_domain": cascade_domain,
+            "component_size": component_size,
+            "loop_length": len(cycle),
+            "node_ids": node_ids,
+            "node_names": [cache.node_name(v) for v in cycle],
+            "relationship_ids": [cache.edge(e)['id'] for e in hops],
+            "has_critical_edge": any(bool(cache.is_critical[e]) for e in hops),
+            "min_strength": round(min(strengths), 4) if strengths else None,
+        }
+
+    def scan(
+        self,
+        domains: Optional[Sequence[str]] = None,
+        max_cycles: int = MAX_CYCLES,
+        max_length: int = MAX_CYCLE_LENGTH
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Detect loops and update kg_coupling_loops / kg_loop_scans
+
+        Args:
+            domains: Domains to scan (default: every domain in the graph)
+
+        Returns:
+            Domain -> {"components", "nodes_in_loops", "loops", "truncated"}
+        """
+        self.cache.ensure_fresh()
+        summary = {}
+        for cascade_domain in domains or sorted(self.cache.cascade_domains):
+            found = self.find_loops(cascade_domain, max_cycles, max_length)
+            self._store(found)
+            summary[cascade_domain] = {
+                "components": len(found["components"]),
+                "nodes_in_loops": sum(len(c) for c in found["components"]),
+                "loops": len(found["loops"]),
+                "truncated": found["truncated"],
+            }
+        return summary
+
+    def _store(self, found: Dict[str, Any]) -> None:
+        """Upsert the domain's loops, retire the ones no longer present, record the scan."""
+        cascade_domain = found["cascade_domain"]
+        with self.db.get_cursor() as cur:
+            cur.executemany("""
+                INSERT INTO kg_coupling_loops (
+                    loop_key, cascade_domain, component_size, loop_length,
+                    node_ids, node_names, relationship_ids,
+                    has_critical_edge, min_strength
+                ) VALUES (%s, %s, %s, %s, %s::uuid[], %s, %s::uuid[], %s, %s)
+                ON CONFLICT (loop_key) DO UPDATE SET
+                    component_size = EXCLUDED.component_size,
+                    node_names = EXCLUDED.node_names,
+                    relationship_ids = EXCLUDED.relationship_ids,
+                    has_critical_edge = EXCLUDED.has_critical_edge,
+                    min_strength = EXCLUDED.min_strength,
+                    last_seen_at = NOW(),
+                    is_active = TRUE
+            """, [
+                (
+                    loop["loop_key"], cascade_domain, loop["component_size"], loop["loop_length"],
+                    loop["node_ids"], loop["node_names"], loop["relationship_ids"],
+                    loop["has_critical_edge"], loop["min_strength"],
+                )
+                for loop in found["loops"]
+            ])
+            # A truncated scan may have missed loops that still exist
+            if not found["truncated"]:
+                cur.execute("""
+                    UPDATE kg_coupling_loops
+                    SET is_active = FALSE
+                    WHERE cascade_domain = %s AND is_active AND NOT (loop_key = ANY(%s))
+                """, (cascade_domain, [loop["loop_key"] for loop in found["loops"]]))
+            cur.execute("""
+                INSERT INTO kg_loop_scans (
+                    cascade_domain, components, nodes_in_loops, loops_found, truncated, scanned_at
+                ) VALUES (%s, %s, %s, %s, %s, NOW())
+                ON CONFLICT (cascade_domain) DO UPDATE SET
+                    components = EXCLUDED.components,
+                    nodes_in_loops = EXCLUDED.nodes_in_loops,
+                    loops_found = EXCLUDED.loops_found,
+                    truncated = EXCLUDED.truncated,
+                    scanned_at = NOW()
+            """, (
+                cascade_domain,
+                len(found["components"]),
+                sum(len(c) for c in found["components"]),
+                len(found["loops"]),
+                found["truncated"],
+            ))
+
+
+# Process-wide detector instance
+_detector: Optional[CouplingLoopDetector] = None
+
+
+def get_coupling_loop_detector() -> CouplingLoopDetector:
+    """Get or create the process-wide coupling loop detector."""
+    global _detector
+    if _detector is None:
+        _detector = CouplingLoopDetector()
+    return _detector
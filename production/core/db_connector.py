@@ -4,7 +4,8 @@ Database connection manager for PROVES Library
 Provides connection pooling and query utilities
 """
 import os
-from typing import Optional, Any, Dict, List
+import itertools
+from typing import Optional, Any, Dict, Iterator, List
 from contextlib import contextmanager
 import psycopg
 from psycopg.rows import dict_row
@@ -14,6 +15,12 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
+# Rows per round trip for server-side cursors (fetch_iter)
+DEFAULT_ITERSIZE = 2000
+
+# Server-side cursor names must be unique per connection
+_cursor_ids = itertools.count()
+
 
 class DatabaseConnector:
     """Manages database connections and provides query utilities"""
@@ -107,6 +114,37 @@ class DatabaseConnector:
             cur.execute(query, params)
             return cur.fetchall()
 
+    def fetch_iter(
+        self,
+        query: str,
+        params: Optional[tuple] = None,
+        itersize: int = DEFAULT_ITERSIZE,
+        dict_cursor: bool = True
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream rows through a server-side cursor
+
+        Rows arrive itersize at a time, so memory stays flat however many
+        the query returns. The pooled connection (and its transaction) is
+        held until the iterator is exhausted or closed.
+
+        Args:
+            query: SQL query
+            params: Query parameters
+            itersize: Rows fetched per round trip
+            dict_cursor: If True, yields rows as dicts
+
+        Usage:
+            for row in db.fetch_iter("SELECT * FROM staging_extractions"):
+                ...
+        """
+        with self.get_connection() as conn:
+            row_factory = dict_row if dict_cursor else None
+            with conn.cursor(name=f"fetch_iter_{next(_cursor_ids)}", row_factory=row_factory) as cur:
+                cur.itersize = itersize
+                cur.execute(query, params)
+                yield from cur
+
     def insert_many(self, table: str, columns: List[str], values: List[tuple]) -> None:
         """
         Bulk insert rows
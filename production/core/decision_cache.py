@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Validation Decision Cache for PROVES Library
+Short-circuit candidates that were already accepted or rejected
+
+Re-crawled pages keep producing the same candidate (same type, key and
+evidence). validation_decisions already holds a verdict for it, so the
+validator should not reason about it again. Candidates are identified by a
+fingerprint:
+
+    sha256(candidate_type | normalized candidate_key | evidence_checksum)
+
+The cache maps fingerprints to the latest decisive verdict (human verdicts
+win over agent verdicts) and is refreshed incrementally from the decision
+watermark. A cached verdict is ignored when it is older than the TTL, or
+when the core entity with the same key changed after the decision. For an
+accepted verdict the first entity change within PROMOTION_WINDOW is the
+promotion the verdict itself caused; only changes after that invalidate it.
+Entity changes are tracked only for keys some cached verdict refers to.
+"""
+import hashlib
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Set
+
+from db_connector import get_db
+
+# Verdicts older than this are re-validated
+DECISION_TTL = timedelta(days=30)
+
+# An accepted verdict's promotion to core_entities lands within this window
+PROMOTION_WINDOW = timedelta(hours=1)
+
+# Only these decisions short-circuit validation (defer / needs_more_evidence
+# / flag_for_review mean "look again")
+DECISIVE = {
+    'accept': 'accepted',
+    'merge': 'accepted',
+    'reject': 'rejected',
+}
+
+# Seconds between incremental refreshes; re-read overlap behind the watermark
+REFRESH_INTERVAL = 30.0
+REFRESH_OVERLAP = timedelta(minutes=5)
+
+_NON_WORD = re.compile(r'[\W_]+')
+
+
+def normalize_key(candidate_key: str) -> str:
+    """Case/separator-insensitive key ("I2C_Driver" == "i2c driver")."""
+    return _NON_WORD.sub(' ', (candidate_key or '').lower()).strip()
+
+
+def evidence_checksum(evidence_text: str) -> str:
+    """Evidence checksum in the staging_extractions.evidence_checksum format."""
+    return f"sha256:{hashlib.sha256(evidence_text.encode('utf-8')).hexdigest()}"
+
+
+def fingerprint(candidate_type: str, candidate_key: str, checksum: Optional[str]) -> str:
+    """Candidate fingerprint: sha256(type | normalized key | evidence checksum)."""
+    raw = f"{(candidate_type or '').lower()}|{normalize_key(candidate_key)}|{checksum or ''}"
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+class DecisionCache:
+    """Process-local fingerprint -> verdict map over validation_decisions"""
+
+    def __init__(self, ttl: timedelta = DECISION_TTL, refresh_interval: float = REFRESH_INTERVAL):
+        self.db = get_db()
+        self.ttl = ttl
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        """Drop all cached verdicts and watermarks."""
+        # fingerprint -> verdict dict
+        self._verdicts: Dict[str, Dict[str, Any]] = {}
+        # normalized key -> fingerprints of the verdicts about it
+        self._by_key: Dict[str, Set[str]] = {}
+        # normalized canonical_key -> latest core_entities.updated_at (only
+        # for keys in _by_key)
+        self._entity_changed: Dict[str, datetime] = {}
+        self._decision_watermark: Optional[datetime] = None
+        self._entity_watermark: Optional[datetime] = None
+        self._last_refresh = 0.0
+
+    @staticmethod
+    def _outranks(new: Dict[str, Any], old: Dict[str, Any]) -> bool:
+        """Human verdicts win over agent verdicts; otherwise the later one wins."""
+        if new['is_human'] != old['is_human']:
+            return new['is_human']
+        return new['decided_at'] >= old['decided_at']
+
+    def refresh(self, full: bool = False) -> int:
+        """
+        Pull decisions and core entity changes since the last watermarks
+
+        Returns:
+            Number of rows applied
+        """
+        with self._lock:
+            if full:
+                self._reset()
+
+            applied = 0
+            since = self._decision_watermark - REFRESH_OVERLAP if self._decision_watermark else None
+            decisions = self.db.fetch_iter("""
+                SELECT d.decision_id::text AS decision_id, d.extraction_id::text AS extraction_id,
+                       d.decision::text AS decision, d.decision_reason, d.decided_by,
+                       d.decider_type::text AS decider_type, d.created_at,
+                       s.candidate_type::text AS candidate_type, s.candidate_key, s.evidence_checksum
+                FROM validation_decisions d
+                JOIN staging_extractions s ON s.extraction_id = d.extraction_id
+                WHERE %s::timestamptz IS NULL OR d.created_at > %s::timestamptz
+                ORDER BY d.created_at
+            """, (since, since))
+
+            for row in decisions:
+                applied += 1
+                if row['created_at'] and (self._decision_watermark is None or row['created_at'] > self._decision_watermark):
+                    self._decision_watermark = row['created_at']
+
+                fp = fingerprint(row['candidate_type'], row['candidate_key'], row['evidence_checksum'])
+                verdict = {
+                    "fingerprint": fp,
+                    "verdict": DECISIVE.get(row['decision']),
+                    "decision": row['decision'],
+                    "reason": row['decision_reason'],
+                    "decided_by": row['decided_by'],
+                    "is_human": (row['decider_type'] or '').startswith('human'),
+                    "decided_at": row['created_at'],
+                    "decision_id": row['decision_id'],
+                    "extraction_id": row['extraction_id'],
+                    "key": normalize_key(row['candidate_key']),
+                    # Entity change caused by this verdict's promotion (accepts)
+                    "promoted_at": None,
+                }
+                current = self._verdicts.get(fp)
+                if current is not None and current['decision_id'] == verdict['decision_id']:
+                    # Re-read inside the overlap window
+                    continue
+                if current is None or self._outranks(verdict, current):
+                    self._verdicts[fp] = verdict
+                    self._by_key.setdefault(verdict['key'], set()).add(fp)
+                    if verdict['key'] in self._entity_changed:
+                        self._note_promotion(verdict, self._entity_changed[verdict['key']])
+
+            entity_since = self._entity_watermark - REFRESH_OVERLAP if self._entity_watermark else None
+            entities = self.db.fetch_iter("""
+                SELECT canonical_key, updated_at
+                FROM core_entities
+                WHERE %s::timestamptz IS NULL OR updated_at > %s::timestamptz
+            """, (entity_since, entity_since))
+
+            for row in entities:
+                applied += 1
+                changed = row['updated_at']
+                if not changed:
+                    continue
+                if self._entity_watermark is None or changed > self._entity_watermark:
+                    self._entity_watermark = changed
+                key = normalize_key(row['canonical_key'])
+                if key in self._by_key and (key not in self._entity_changed or changed > self._entity_changed[key]):
+                    self._entity_changed[key] = changed
+                    for fp in self._by_key[key]:
+                        self._note_promotion(self._verdicts[fp], changed)
+
+            self._last_refresh = time.monotonic()
+            return applied
+
+    def ensure_fresh(self) -> None:
+        """Refresh if the last refresh is older than refresh_interval."""
+        if time.monotonic() - self._last_refresh >= self.refresh_interval:
+            self.refresh()
+
+    def lookup(self, candidate_type: str, candidate_key: str, checksum: Optional[str]) -> Dict[str, Any]:
+        """
+        Look up the cached verdict for a candidate
+
+        Args:
+            candidate_type: Extraction type (component, port, ...)
+            candidate_key: Extraction key
+            checksum: Evidence checksum ("sha256:..."), see evidence_checksum()
+
+        Returns:
+            {"status": "hit" | "miss" | "expired" | "invalidated" | "undecided",
+             "fingerprint": str, ...verdict fields on hit/expired/invalidated/undecided}
+        """
+        self.ensure_fresh()
+        fp = fingerprint(candidate_type, candidate_key, checksum)
+
+        with self._lock:
+            verdict = self._verdicts.get(fp)
+            if verdict is None:
+                return {"status": "miss", "fingerprint": fp}
+
+            result = dict(verdict)
+            decided_at = verdict['decided_at']
+            now = datetime.now(decided_at.tzinfo or timezone.utc) if decided_at else None
+
+            if verdict['verdict'] is None:
+                result["status"] = "undecided"
+            elif decided_at is None or now - decided_at > self.ttl:
+                result["status"] = "expired"
+            elif self._entity_changed_since(verdict):
+                # The core entity this verdict was about changed since
+                result["status"] = "invalidated"
+            else:
+                result["status"] = "hit"
+            return result
+
+    @staticmethod
+    def _note_promotion(verdict: Dict[str, Any], changed: datetime) -> None:
+        """The first entity change shortly after an accept is the promotion it caused."""
+        decided_at = verdict['decided_at']
+        if (
+            verdict['verdict'] == 'accepted' and verdict['promoted_at'] is None
+            and decided_at and decided_at < changed <= decided_at + PROMOTION_WINDOW
+        ):
+            verdict['promoted_at'] = changed
+
+    def _entity_changed_since(self, verdict: Dict[str, Any]) -> bool:
+        """True if the verdict's core entity changed after the verdict (and its own promotion)."""
+        changed = self._entity_changed.get(verdict['key'])
+        if changed is None or changed <= verdict['decided_at']:
+            return False
+        return verdict['promoted_at'] is None or changed > verdict['promoted_at']
+
+
+# Process-wide cache instance
+_cache: Optional[DecisionCache] = None
+
+
+def get_decision_cache() -> DecisionCache:
+    """Get or create the process-wide decision cache (loaded on first use)."""
+    global _cache
+    if _cache is None:
+        _cache = DecisionCache()
+    return _cache
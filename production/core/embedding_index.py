@@ -0,0 +1,437 @@
+#!/usr/bin/env python3
+"""
+Local Embedding Index for PROVES Library
+CPU-only semantic neighbors for core_entities and pending candidates
+
+Name similarity can't relate "I2C Manager" (ProvesKit) to
+Drv::LinuxI2cDriver (F'). This index embeds entities with a hashing
+vectorizer - identifier-aware word tokens (camelCase, namespaces and common
+F' abbreviations expanded) plus character n-grams, TF-IDF weighted and
+L2-normalized - so related names and descriptions land close together
+without a model download or GPU.
+
+Vectors live in a float32 matrix (exact top-k is one matrix-vector product,
+milliseconds at library scale) and are persisted to a local .npz file so a
+new process does not re-embed everything. Refreshed incrementally from the
+core_entities.updated_at watermark like entity_index.
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from db_connector import get_db
+
+EMBEDDING_DIM = 2048
+
+# Feature weights
+NAME_WEIGHT = 2.0       # key / name tokens count double vs description text
+CHAR_NGRAM_WEIGHT = 0.5
+CHAR_NGRAM_SIZES = (3, 4)
+
+# Attribute text per entity is capped (descriptions can be long)
+MAX_ATTRIBUTE_CHARS = 2000
+
+# Seconds between incremental refreshes; re-read overlap behind the watermark
+REFRESH_INTERVAL = 60.0
+REFRESH_OVERLAP = timedelta(minutes=5)
+
+# Rebuild IDF from scratch once this fraction of rows was added incrementally
+REBUILD_FRACTION = 0.2
+
+DEFAULT_INDEX_PATH = Path(os.environ.get(
+    'PROVES_EMBEDDING_INDEX',
+    Path(__file__).parent.parent.parent / '.cache' / 'entity_embeddings.npz'
+))
+
+# Identifier abbreviations common in F' / flight software naming
+ABBREVIATIONS = {
+    'drv': 'driver', 'mgr': 'manager', 'svc': 'service', 'tlm': 'telemetry',
+    'cmd': 'command', 'comp': 'component', 'chan': 'channel', 'fw': 'firmware',
+    'hw': 'hardware', 'sw': 'software', 'cfg': 'config', 'buf': 'buffer',
+    'seq': 'sequence', 'sched': 'scheduler', 'evt': 'event', 'prm': 'parameter',
+    'pwr': 'power', 'comm': 'communication', 'comms': 'communication',
+    'rx': 'receive', 'tx': 'transmit',
+}
+
+_ACRONYM_BOUNDARY = re.compile(r'([A-Z]+)([A-Z][a-z])')
+_CAMEL_BOUNDARY = re.compile(r'([a-z0-9])([A-Z])')
+_TOKEN = re.compile(r'[^\W_]+')
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Identifier-aware tokens
+
+    "Drv::LinuxI2cDriver" -> ["driver", "linux", "i2c", "driver"],
+    "I2CManager" -> ["i2c", "manager"].
+    """
+    text = _ACRONYM_BOUNDARY.sub(r'\1 \2', text)
+    text = _CAMEL_BOUNDARY.sub(r'\1 \2', text)
+    # Re-join digit runs split off a preceding letter run ("I2 C" -> "I2C")
+    tokens = []
+    for token in _TOKEN.findall(text.lower()):
+        if tokens and len(token) == 1 and tokens[-1][-1:].isdigit():
+            tokens[-1] += token
+        else:
+            tokens.append(ABBREVIATIONS.get(token, token))
+    return tokens
+
+
+def _bucket(feature: str) -> Tuple[int, float]:
+    """Hash a feature to (column, sign)."""
+    h = int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'little')
+    return h % EMBEDDING_DIM, (1.0 if (h >> 63) & 1 else -1.0)
+
+
+def features(name_text: str, body_text: str = "") -> Dict[str, float]:
+    """
+    Weighted term features for an entity
+
+    Args:
+        name_text: Key / name (weighted NAME_WEIGHT)
+        body_text: Type, description and attribute text
+
+    Returns:
+        {feature: term weight}
+    """
+    weights: Dict[str, float] = {}
+    for text, weight in ((name_text, NAME_WEIGHT), (body_text, 1.0)):
+        for token in tokenize(text):
+            key = f"w:{token}"
+            weights[key] = weights.get(key, 0.0) + weight
+            padded = f"<{token}>"
+            for n in CHAR_NGRAM_SIZES:
+                for i in range(len(padded) - n + 1):
+                    key = f"c:{padded[i:i + n]}"
+                    weights[key] = weights.get(key, 0.0) + weight * CHAR_NGRAM_WEIGHT
+    return weights
+
+
+def attribute_text(attributes: Any) -> str:
+    """Flatten string values of an attributes/payload JSON for embedding."""
+    if isinstance(attributes, str):
+        try:
+            attributes = json.loads(attributes)
+        except ValueError:
+            return attributes[:MAX_ATTRIBUTE_CHARS]
+    parts: List[str] = []
+
+    def walk(value: Any) -> None:
+        if isinstance(value, str):
+            parts.append(value)
+        elif isinstance(value, dict):
+            for v in value.values():
+                walk(v)
+        elif isinstance(value, list):
+            for v in value:
+                walk(v)
+
+    walk(attributes)
+    return " ".join(parts)[:MAX_ATTRIBUTE_CHARS]
+
+
+class EmbeddingIndex:
+    """Hashing-vectorizer embeddings of current core_entities with exact top-k search"""
+
+    def __init__(self, path: Optional[Path] = DEFAULT_INDEX_PATH, refresh_interval: float = REFRESH_INTERVAL):
+        self.db = get_db()
+        self.path = Path(path) if path else None
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._reset()
+        if self.path and self.path.exists():
+            try:
+                self._load()
+            except Exception:
+                self._reset()
+
+    def _reset(self) -> None:
+        """Drop all vectors and watermarks."""
+        self._ids: List[str] = []
+        self._row: Dict[str, int] = {}
+        self._meta: List[Optional[Dict[str, Any]]] = []
+        self._matrix = np.zeros((0, EMBEDDING_DIM), dtype=np.float32)
+        self._idf = np.ones(EMBEDDING_DIM, dtype=np.float32)
+        self._doc_count = 0
+        self._added_since_build = 0
+        self._watermark: Optional[datetime] = None
+        self._last_refresh = 0.0
+
+    # ============================================
+    # VECTORS
+    # ============================================
+
+    def _raw_vector(self, name_text: str, body_text: str) -> np.ndarray:
+        """Hashed term-frequency vector (before IDF)."""
+        vec = np.zeros(EMBEDDING_DIM, dtype=np.float32)
+        for feature, weight in features(name_text, body_text).items():
+            column, sign = _bucket(feature)
+            vec[column] += sign * (1.0 + np.log(weight))
+        return vec
+
+    def _finish(self, raw: np.ndarray) -> np.ndarray:
+        """Apply IDF and L2-normalize."""
+        vec = raw * self._idf
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm else vec
+
+    def embed(self, name: str, description: str = "", attributes: Any = None) -> np.ndarray:
+        """
+        Embed a name (plus optional description / attributes) with current IDF
+
+        Use for pending candidates that are not in core_entities yet.
+        """
+        # IDF must be loaded before the query vector is weighted with it
+        self.ensure_fresh()
+        body = " ".join(filter(None, [description, attribute_text(attributes) if attributes else ""]))
+        return self._finish(self._raw_vector(name, body))
+
+    @staticmethod
+    def _entity_texts(row: Dict[str, Any]) -> Tuple[str, str]:
+        name_text = " ".join(filter(None, [row.get('canonical_key'), row.get('name')]))
+        body_text = " ".join(filter(None, [row.get('entity_type'), attribute_text(row.get('attributes') or {})]))
+        return name_text, body_text
+
+    # ============================================
+    # INDEX MAINTENANCE
+    # ============================================
+
+    def _rebuild(self, rows: Sequence[Dict[str, Any]]) -> None:
+        """Full build: IDF from all rows, then every vector."""
+        self._reset()
+        raws = []
+        df = np.zeros(EMBEDDING_DIM, dtype=np.float64)
+        for row in rows:
+            raw = self._raw_vector(*self._entity_texts(row))
+            df += raw != 0
+            raws.append(raw)
+        self._doc_count = len(rows)
+        self._idf = (np.log((1 + self._doc_count) / (1 + df)) + 1.0).astype(np.float32)
+
+        vectors = [self._finish(raw) for raw in raws]
+        self._matrix = np.vstack(vectors).astype(np.float32) if vectors else self._matrix
+        for row in rows:
+            self._row[row['id']] = len(self._ids)
+            self._ids.append(row['id'])
+            self._meta.append(self._entity_meta(row))
+
+    @staticmethod
+    def _entity_meta(row: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "id": row['id'],
+            "canonical_key": row['canonical_key'],
+            "name": row['name'],
+            "entity_type": row['entity_type'],
+            "ecosystem": row['ecosystem'],
+        }
+
+    def _upsert(self, row: Dict[str, Any]) -> None:
+        """Incremental add/replace with the current IDF."""
+        vector = self._finish(self._raw_vector(*self._entity_texts(row)))
+        index = self._row.get(row['id'])
+        if index is None:
+            self._row[row['id']] = len(self._ids)
+            self._ids.append(row['id'])
+            self._meta.append(self._entity_meta(row))
+            self._matrix = np.vstack([self._matrix, vector[None, :]])
+            self._added_since_build += 1
+        else:
+            self._matrix[index] = vector
+            self._meta[index] = self._entity_meta(row)
+
+    def _drop(self, entity_id: str) -> None:
+        """Tombstone a row (zero vector, no metadata) until the next rebuild."""
+        index = self._row.get(entity_id)
+        if index is not None:
+            self._matrix[index] = 0.0
+            self._meta[index] = None
+
+    def refresh(self, full: bool = False) -> int:
+        """
+        Pull core_entities changed since the last watermark (or everything)
+
+        A full rebuild also happens on first load and once REBUILD_FRACTION of
+        the rows were added incrementally (so IDF reflects the corpus).
+
+        Returns:
+            Number of rows applied
+        """
+        with self._lock:
+            rebuild = full or self._watermark is None or (
+                self._added_since_build > REBUILD_FRACTION * max(self._doc_count, 1)
+            )
+            since = None if rebuild else self._watermark - REFRESH_OVERLAP
+
+            rows = self.db.fetch_all("""
+                SELECT id::text AS id, canonical_key, name, entity_type::text AS entity_type,
+                       ecosystem::text AS ecosystem, attributes, is_current, updated_at
+                FROM core_entities
+                WHERE (%s::timestamptz IS NULL AND is_current = TRUE) OR updated_at > %s::timestamptz
+                ORDER BY updated_at
+            """, (since, since))
+
+            if rebuild:
+                self._rebuild([r for r in rows if r['is_current'] and r['canonical_key']])
+            else:
+                for row in rows:
+                    if row['is_current'] and row['canonical_key']:
+                        self._upsert(row)
+                    else:
+                        self._drop(row['id'])
+
+            for row in rows:
+                if row['updated_at'] and (self._watermark is None or row['updated_at'] > self._watermark):
+                    self._watermark = row['updated_at']
+            self._last_refresh = time.monotonic()
+
+            if rows and self.path:
+                self._save()
+            return len(rows)
+
+    def ensure_fresh(self) -> None:
+        """Refresh if the last refresh is older than refresh_interval."""
+        if time.monotonic() - self._last_refresh >= self.refresh_interval:
+            self.refresh()
+
+    # ============================================
+    # PERSISTENCE
+    # ============================================
+
+    def _save(self) -> None:
+        """Write vectors + metadata to self.path atomically."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp.npz')
+        np.savez(
+            tmp_path,
+            matrix=self._matrix,
+            idf=self._idf,
+            ids=np.array(self._ids, dtype=str),
+            meta=np.array(json.dumps(self._meta)),
+            state=np.array(json.dumps({
+                "dim": EMBEDDING_DIM,
+                "doc_count": self._doc_count,
+                "added_since_build": self._added_since_build,
+                "watermark": self._watermark.isoformat() if self._watermark else None,
+            })),
+        )
+        os.replace(tmp_path, self.path)
+
+    def _load(self) -> None:
+        """Load a saved index (ignored if it was built with another dimension)."""
+        with np.load(self.path) as data:
+            state = json.loads(str(data['state']))
+            if state["dim"] != EMBEDDING_DIM:
+                return
+            self._matrix = data['matrix'].astype(np.float32)
+            self._idf = data['idf'].astype(np.float32)
+            self._ids = [str(i) for i in data['ids']]
+            self._meta = json.loads(str(data['meta']))
+        self._row = {entity_id: i for i, entity_id in enumerate(self._ids)}
+        self._doc_count = state["doc_count"]
+        self._added_since_build = state["added_since_build"]
+        self._watermark = datetime.fromisoformat(state["watermark"]) if state["watermark"] else None
+
+    # ============================================
+    # SEARCH
+    # ============================================
+
+    def search(
+        self,
+        vector: np.ndarray,
+        k: int = 5,
+        min_score: float = 0.0,
+        ecosystem: Optional[str] = None,
+        exclude_ecosystem: Optional[str] = None,
+        exclude_ids: Sequence[str] = ()
+    ) -> List[Dict[str, Any]]:
+        """
+        Exact top-k cosine neighbors of a vector
+
+        Args:
+            vector: Query vector from embed() or vector_for()
+            k: Number of neighbors
+            min_score: Minimum cosine similarity
+            ecosystem: Only entities in this ecosystem
+            exclude_ecosystem: Skip entities in this ecosystem (cross-ecosystem search)
+            exclude_ids: Entity ids to skip (e.g. the query entity)
+
+        Returns:
+            [{**entity, "score": float}, ...] best first
+        """
+        self.ensure_fresh()
+        with self._lock:
+            if not self._ids:
+                return []
+            scores = self._matrix @ vector.astype(np.float32)
+
+            results = []
+            # Over-fetch so filtering still leaves k results in the common case
+            fetch = min(len(scores), max(k * 4, k + len(exclude_ids) + 8))
+            while True:
+                top = np.argpartition(-scores, fetch - 1)[:fetch] if fetch < len(scores) else np.arange(len(scores))
+                results = []
+                for i in top[np.argsort(-scores[top])]:
+                    meta = self._meta[i]
+                    score = float(scores[i])
+                    if meta is None or score < min_score or meta['id'] in exclude_ids:
+                        continue
+                    if ecosystem and meta['ecosystem'] != ecosystem:
+                        continue
+                    if exclude_ecosystem and meta['ecosystem'] == exclude_ecosystem:
+                        continue
+                    results.append({**meta, "score": round(score, 4)})
+                    if len(results) == k:
+                        return results
+                if fetch >= len(scores):
+                    return results
+                fetch = min(len(scores), fetch * 4)
+
+    def vector_for(self, entity_id: str) -> Optional[np.ndarray]:
+        """Stored vector of an indexed entity (None if not indexed)."""
+        self.ensure_fresh()
+        with self._lock:
+            index = self._row.get(entity_id)
+            if index is None or self._meta[index] is None:
+                return None
+            return self._matrix[index].copy()
+
+    def vectors_for(self, entity_ids: Sequence[str]) -> np.ndarray:
+        """
+        Stored vectors of many entities as one (len(entity_ids), EMBEDDING_DIM) matrix
+
+        Entities not in the index get a zero row (cosine 0 with everything).
+        """
+        self.ensure_fresh()
+        with self._lock:
+            rows = [self._row.get(entity_id, -1) for entity_id in entity_ids]
+            out = np.zeros((len(rows), EMBEDDING_DIM), dtype=np.float32)
+            present = np.array([i for i, r in enumerate(rows) if r >= 0], dtype=np.intp)
+            if len(present):
+                out[present] = self._matrix[np.array([rows[i] for i in present], dtype=np.intp)]
+            return out
+
+    def entity(self, entity_id: str) -> Optional[Dict[str, Any]]:
+        """Indexed metadata of an entity (None if not indexed)."""
+        with self._lock:
+            index = self._row.get(entity_id)
+            return self._meta[index] if index is not None else None
+
+
+# Process-wide index instance
+_index: Optional[EmbeddingIndex] = None
+
+
+def get_embedding_index() -> EmbeddingIndex:
+    """Get or create the process-wide embedding index (loaded on first use)."""
+    global _index
+    if _index is None:
+        _index = EmbeddingIndex()
+    return _index
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Entity Name Index for PROVES Library
+Process-local index of current core_entities keys and entity_alias texts
+
+Duplicate checking used to run two queries per candidate (exact LOWER()
+match + pg_trgm similarity scan). This index keeps a lowercase hash map and
+a trigram inverted index in memory, refreshed incrementally from an
+updated_at watermark, so a batch of candidate names is checked in one pass.
+
+Similarity is computed the way pg_trgm does it (lowercase, split on
+non-alphanumerics, pad each word with two leading and one trailing space,
+Jaccard over the trigram sets), so scores match similarity() in SQL.
+"""
+import re
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Set, Tuple
+
+from db_connector import get_db
+
+# Same default cut-off as pg_trgm.similarity_threshold
+DEFAULT_THRESHOLD = 0.3
+
+# Seconds between incremental refreshes
+REFRESH_INTERVAL = 30.0
+
+# Re-read rows this far behind the watermark: NOW() is the transaction start
+# time, so a long transaction can commit rows older than the last watermark
+REFRESH_OVERLAP = timedelta(minutes=5)
+
+_WORD = re.compile(r'[^\W_]+')
+
+
+def trigrams(text: str) -> FrozenSet[str]:
+    """pg_trgm trigram set of text (show_trgm() without the array wrapper)."""
+    grams = set()
+    for word in _WORD.findall(text.lower()):
+        padded = f'  {word} '
+        for i in range(len(padded) - 2):
+            grams.add(padded[i:i + 3])
+    return frozenset(grams)
+
+
+def similarity(a: str, b: str) -> float:
+    """pg_trgm similarity(a, b)."""
+    ta, tb = trigrams(a), trigrams(b)
+    if not ta or not tb:
+        return 0.0
+    shared = len(ta & tb)
+    return shared / (len(ta) + len(tb) - shared)
+
+
+class EntityIndex:
+    """
+    In-memory name index over current core_entities and resolved aliases
+
+    Documents are entity canonical keys and alias texts; both point at the
+    entity they name. Call check_many() to look up a batch of names.
+    """
+
+    def __init__(self, refresh_interval: float = REFRESH_INTERVAL):
+        self.db = get_db()
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        """Drop all indexed rows and watermarks."""
+        # entity id -> {"id", "canonical_key", "name", "entity_type", "ecosystem"}
+        self._entities: Dict[str, Dict[str, Any]] = {}
+        # document id -> (text, entity canonical_key, via) ; via = 'key' | 'alias'
+        self._docs: Dict[Tuple[str, str], Tuple[str, str, str]] = {}
+        self._doc_grams: Dict[Tuple[str, str], FrozenSet[str]] = {}
+        # lowercase canonical_key -> entity ids (exact-match map)
+        self._by_key: Dict[str, Set[str]] = {}
+        # trigram -> document ids (inverted index)
+        self._postings: Dict[str, Set[Tuple[str, str]]] = {}
+
+        self._entity_watermark: Optional[datetime] = None
+        self._alias_watermark: Optional[datetime] = None
+        self._last_refresh = 0.0
+
+    # ============================================
+    # INDEX MAINTENANCE
+    # ============================================
+
+    def _add_doc(self, doc_id: Tuple[str, str], text: str, canonical_key: str, via: str) -> None:
+        self._remove_doc(doc_id)
+        grams = trigrams(text)
+        self._docs[doc_id] = (text, canonical_key, via)
+        self._doc_grams[doc_id] = grams
+        for gram in grams:
+            self._postings.setdefault(gram, set()).add(doc_id)
+
+    def _remove_doc(self, doc_id: Tuple[str, str]) -> None:
+        if doc_id not in self._docs:
+            return
+        for gram in self._doc_grams.pop(doc_id):
+            posting = self._postings.get(gram)
+            if posting is not None:
+                posting.discard(doc_id)
+                if not posting:
+                    del self._postings[gram]
+        del self._docs[doc_id]
+
+    def _remove_entity(self, entity_id: str) -> None:
+        entity = self._entities.pop(entity_id, None)
+        if entity is None:
+            return
+        key = entity['canonical_key'].lower()
+        ids = self._by_key.get(key)
+        if ids is not None:
+            ids.discard(entity_id)
+            if not ids:
+                del self._by_key[key]
+        self._remove_doc(('entity', entity_id))
+
+    def refresh(self, full: bool = False) -> int:
+        """
+        Pull rows changed since the last watermark (or everything)
+
+        Args:
+            full: Rebuild from scratch instead of an incremental refresh
+
+        Returns:
+            Number of entity and alias rows applied
+        """
+        with self._lock:
+            if full:
+                self._reset()
+
+            entity_since = self._entity_watermark - REFRESH_OVERLAP if self._entity_watermark else None
+            entities = self.db.fetch_iter("""
+                SELECT id::text AS id, canonical_key, name, entity_type::text AS entity_type,
+                       ecosystem::text AS ecosystem, is_current, updated_at
+                FROM core_entities
+                WHERE (%s::timestamptz IS NULL AND is_current = TRUE) OR updated_at > %s::timestamptz
+                ORDER BY updated_at
+            """, (entity_since, entity_since))
+
+            applied = 0
+            for row in entities:
+                applied += 1
+                entity_id = row['id']
+                self._remove_entity(entity_id)
+                if row['is_current'] and row['canonical_key']:
+                    self._entities[entity_id] = {
+                        "id": entity_id,
+                        "canonical_key": row['canonical_key'],
+                        "name": row['name'],
+                        "entity_type": row['entity_type'],
+                        "ecosystem": row['ecosystem'],
+                    }
+                    self._by_key.setdefault(row['canonical_key'].lower(), set()).add(entity_id)
+                    self._add_doc(('entity', entity_id), row['canonical_key'], row['canonical_key'], 'key')
+                if row['updated_at'] and (self._entity_watermark is None or row['updated_at'] > self._entity_watermark):
+                    self._entity_watermark = row['updated_at']
+
+            alias_since = self._alias_watermark - REFRESH_OVERLAP if self._alias_watermark else None
+            aliases = self.db.fetch_iter("""
+                SELECT alias_id::text AS alias_id, alias_text, canonical_key, resolution_status,
+                       GREATEST(created_at, COALESCE(resolved_at, created_at)) AS changed_at
+                FROM entity_alias
+                WHERE canonical_key IS NOT NULL
+                  AND (%s::timestamptz IS NULL
+                       OR GREATEST(created_at, COALESCE(resolved_at, created_at)) > %s::timestamptz)
+                ORDER BY changed_at
+            """, (alias_since, alias_since))
+
+            for row in aliases:
+                applied += 1
+                doc_id = ('alias', row['alias_id'])
+                if row['resolution_status'] == 'rejected':
+                    self._remove_doc(doc_id)
+                else:
+                    self._add_doc(doc_id, row['alias_text'], row['canonical_key'], 'alias')
+                if row['changed_at'] and (self._alias_watermark is None or row['changed_at'] > self._alias_watermark):
+                    self._alias_watermark = row['changed_at']
+
+            self._last_refresh = time.monotonic()
+            return applied
+
+    def ensure_fresh(self) -> None:
+        """Refresh if the last refresh is older than refresh_interval."""
+        if time.monotonic() - self._last_refresh >= self.refresh_interval:
+            self.refresh()
+
+    # ============================================
+    # LOOKUP
+    # ============================================
+
+    def _entities_for_key(self, canonical_key: str) -> List[Dict[str, Any]]:
+        return [self._entities[eid] for eid in self._by_key.get(canonical_key.lower(), ())]
+
+    def check(self, name: str, limit: int = 5, threshold: float = DEFAULT_THRESHOLD) -> Dict[str, Any]:
+        """Duplicate check for one name (see check_many)."""
+        return self.check_many([name], limit=limit, threshold=threshold)[0]
+
+    def check_many(
+        self,
+        names: Sequence[str],
+        limit: int = 5,
+        threshold: float = DEFAULT_THRESHOLD
+    ) -> List[Dict[str, Any]]:
+        """
+        Duplicate check for a batch of names in one in-memory pass
+
+        Args:
+            names: Candidate entity names
+            limit: Max similar entities per name
+            threshold: Minimum trigram similarity (pg_trgm scale)
+
+        Returns:
+            One dict per name, in order:
+            {
+                "name": str,
+                "exact": [entity, ...]  (case-insensitive canonical_key match),
+                "similar": [{**entity, "similarity": float, "matched_text": str, "via": "key"|"alias"}, ...]
+            }
+        """
+        self.ensure_fresh()
+
+        with self._lock:
+            results = []
+            for name in names:
+                exact = self._entities_for_key(name)
+
+                query = trigrams(name)
+                shared: Counter = Counter()
+                for gram in query:
+                    for doc_id in self._postings.get(gram, ()):
+                        shared[doc_id] += 1
+
+                # Best-scoring document per entity
+                best: Dict[str, Dict[str, Any]] = {}
+                for doc_id, count in shared.items():
+                    sim = count / (len(query) + len(self._doc_grams[doc_id]) - count)
+                    if sim <= threshold:
+                        continue
+                    text, canonical_key, via = self._docs[doc_id]
+                    for entity in self._entities_for_key(canonical_key):
+                        current = best.get(entity['id'])
+                        if current is None or sim > current['similarity']:
+                            best[entity['id']] = {
+                                **entity,
+                                "similarity": round(sim, 4),
+                                "matched_text": text,
+                                "via": via,
+                            }
+
+                similar = sorted(best.values(), key=lambda e: e['similarity'], reverse=True)[:limit]
+                results.append({"name": name, "exact": exact, "similar": similar})
+
+            return results
+
+    def stats(self) -> Dict[str, int]:
+        """Index sizes (for diagnostics)."""
+        return {
+            "entities": len(self._entities),
+            "documents": len(self._docs),
+            "trigrams": len(self._postings),
+        }
+
+
+# Process-wide index instance
+_index: Optional[EntityIndex] = None
+
+
+def get_entity_index() -> EntityIndex:
+    """Get or create the process-wide entity index (loaded on first use)."""
+    global _index
+    if _index is None:
+        _index = EntityIndex()
+    return _index
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Evidence Matcher for PROVES Library
+Locate many evidence quotes in one snapshot text in a single pass
+
+A page typically yields 10-40 candidates. Instead of one substring search
+per quote, all quotes (exact and normalized variants) are compiled into an
+Aho-Corasick automaton and the snapshot text is scanned once, so the cost
+per snapshot does not grow with the number of quotes.
+
+Quotes that miss both (a curly quote, an elided word, a line break) go to
+a bounded fuzzy tier: an n-gram seed index over the text proposes a few
+candidate diagonals, and a banded alignment around each finds the best
+span within the edit budget.
+"""
+from collections import Counter, deque
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+from html_text import normalize_text
+
+
+class AhoCorasick:
+    """Aho-Corasick automaton over a fixed set of string patterns"""
+
+    __slots__ = ('patterns', '_goto', '_fail', '_out')
+
+    def __init__(self, patterns: Sequence[str]):
+        """
+        Build the automaton
+
+        Args:
+            patterns: Non-empty patterns; duplicates are allowed and each
+                pattern index is reported separately
+        """
+        self.patterns = list(patterns)
+        goto: List[Dict[str, int]] = [{}]
+        out: List[List[int]] = [[]]
+
+        # Trie
+        for index, pattern in enumerate(self.patterns):
+            state = 0
+            for ch in pattern:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    out.append([])
+                state = nxt
+            out[state].append(index)
+
+        # Failure links (BFS), merging outputs along the failure chain
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                out[nxt].extend(out[fail[nxt]])
+
+        self._goto = goto
+        self._fail = fail
+        self._out = [tuple(o) for o in out]
+
+    def find_first(self, text: str) -> Dict[int, int]:
+        """
+        Scan text once and return the first start offset of each pattern
+
+        Stops early once every pattern has been seen.
+
+        Returns:
+            {pattern_index: character offset} for patterns found in text
+        """
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        patterns = self.patterns
+        remaining = len(patterns)
+        found: Dict[int, int] = {}
+        state = 0
+
+        for pos, ch in enumerate(text):
+            nxt = goto[state].get(ch)
+            while nxt is None and state:
+                state = fail[state]
+                nxt = goto[state].get(ch)
+            state = nxt or 0
+
+            if out[state]:
+                for index in out[state]:
+                    if index not in found:
+                        found[index] = pos - len(patterns[index]) + 1
+                        remaining -= 1
+                if not remaining:
+                    break
+
+        return found
+
+
+def match_quotes(text: str, quotes: Sequence[str]) -> List[Dict[str, Optional[int]]]:
+    """
+    Find each quote in snapshot text, exactly or after normalization
+
+    Args:
+        text: Snapshot text (stripped and normalized, see html_text)
+        quotes: Evidence quotes
+
+    Returns:
+        One dict per quote, in order:
+        {"match": "exact" | "normalized" | None,
+         "offset": UTF-8 byte offset of the match in text, or None}
+    """
+    patterns: List[str] = []
+    pattern_index: Dict[str, int] = {}
+    variants = []
+
+    for quote in quotes:
+        exact = quote
+        normalized = normalize_text(quote)
+        ids = []
+        for variant in (exact, normalized):
+            if variant not in pattern_index:
+                pattern_index[variant] = len(patterns)
+                patterns.append(variant)
+            ids.append(pattern_index[variant])
+        variants.append(ids)
+
+    # Empty patterns match at offset 0 (same as `'' in text`)
+    searchable = [p for p in patterns if p]
+    automaton = AhoCorasick(searchable)
+    hits = automaton.find_first(text)
+    offsets = {p: 0 for p in patterns if not p}
+    offsets.update({searchable[i]: offset for i, offset in hits.items()})
+
+    is_ascii = text.isascii()
+    results = []
+    for exact_id, normalized_id in variants:
+        for kind, variant_id in (("exact", exact_id), ("normalized", normalized_id)):
+            offset = offsets.get(patterns[variant_id])
+            if offset is not None:
+                if not is_ascii:
+                    offset = len(text[:offset].encode('utf-8'))
+                results.append({"match": kind, "offset": offset})
+                break
+        else:
+            results.append({"match": None, "offset": None})
+
+    return results
+
+
+# Fuzzy matching parameters
+FUZZY_NGRAM = 8            # seed length (characters)
+FUZZY_STRIDE = 4           # text is indexed at every FUZZY_STRIDE-th position
+FUZZY_MAX_ERROR_RATE = 0.1  # edit budget as a fraction of quote length
+FUZZY_MAX_QUOTE = 2000     # longer quotes are not fuzzy matched
+FUZZY_CANDIDATES = 3       # diagonals aligned per quote
+FUZZY_MAX_SEED_HITS = 64   # seeds occurring more often than this are ignored
+
+# Typographic variants folded before alignment (one char -> one char, so
+# offsets are unchanged)
+_FOLD = str.maketrans({
+    '\u2018': "'", '\u2019': "'", '\u201a': "'", '\u201b': "'",
+    '\u201c': '"', '\u201d': '"', '\u201e': '"', '\u201f': '"',
+    '\u2013': '-', '\u2014': '-', '\u2212': '-',
+    '\u00a0': ' ', '\u2026': '.',
+})
+
+
+class FuzzyMatch(NamedTuple):
+    """Best approximate occurrence of a quote in the text"""
+    start: int      # character offset in text
+    end: int        # character offset in text (exclusive)
+    distance: int   # edit distance between quote and text[start:end]
+
+
+class FuzzyIndex:
+    """
+    N-gram seed index over one snapshot text
+
+    Build once per snapshot; every find() is then bounded by
+    O(FUZZY_CANDIDATES * m * (2k + 1)) alignment cells for a quote of length
+    m <= FUZZY_MAX_QUOTE with edit budget k, independent of text length.
+    """
+
+    __slots__ = ('text', '_folded', '_grams')
+
+    def __init__(self, text: str):
+        self.text = text
+        self._folded = text.translate(_FOLD)
+        grams: Dict[str, List[int]] = {}
+        folded = self._folded
+        for pos in range(0, len(folded) - FUZZY_NGRAM + 1, FUZZY_STRIDE):
+            grams.setdefault(folded[pos:pos + FUZZY_NGRAM], []).append(pos)
+        self._grams = grams
+
+    def find(self, quote: str, max_error_rate: float = FUZZY_MAX_ERROR_RATE) -> Optional[FuzzyMatch]:
+        """
+        Find the best span of the text within the edit budget of quote
+
+        Args:
+            quote: Evidence quote (normalized with normalize_text first)
+            max_error_rate: Allowed edits as a fraction of quote length
+
+        Returns:
+            FuzzyMatch, or None if no span is within the budget
+        """
+        quote = normalize_text(quote).translate(_FOLD)
+        m = len(quote)
+        if m < FUZZY_NGRAM or m > FUZZY_MAX_QUOTE:
+            return None
+        budget = int(m * max_error_rate)
+
+        # Seed: every quote position against the strided text index. A region
+        # of at least FUZZY_NGRAM + FUZZY_STRIDE - 1 unedited characters always
+        # contains an indexed text position.
+        votes: Counter = Counter()
+        grams = self._grams
+        for j in range(m - FUZZY_NGRAM + 1):
+            hits = grams.get(quote[j:j + FUZZY_NGRAM])
+            if hits and len(hits) <= FUZZY_MAX_SEED_HITS:
+                for pos in hits:
+                    # Bucket nearby diagonals together (edits shift them)
+                    votes[(pos - j) // (budget + 1)] += 1
+        if not votes:
+            return None
+
+        best = None
+        for bucket, _ in votes.most_common(FUZZY_CANDIDATES):
+            diagonal = bucket * (budget + 1)
+            found = self._align(quote, diagonal, budget)
+            if found and (best is None or found.distance < best.distance):
+                best = found
+                if best.distance == 0:
+                    break
+
+        return best
+
+    def _align(self, quote: str, diagonal: int, budget: int) -> Optional[FuzzyMatch]:
+        """
+        Banded semi-global alignment of quote against text near diagonal
+
+        The whole quote must align; the text span is free. Rows are quote
+        positions, the band covers text columns diagonal - width .. + width
+        around each row, with width = 2 * budget to absorb bucket rounding.
+        """
+        text = self._folded
+        n = len(text)
+        m = len(quote)
+        width = 2 * budget
+        span = 2 * width + 1
+        base = diagonal - width  # text column of band offset 0 in row 0
+        inf = m + span + 1
+
+        # Row 0: free start anywhere in the band
+        prev = [0 if 0 <= base + o <= n else inf for o in range(span)]
+        prev_start = [base + o for o in range(span)]
+
+        for i in range(1, m + 1):
+            qc = quote[i - 1]
+            row = [inf] * span
+            row_start = [0] * span
+            for o in range(span):
+                col = base + i + o  # text column (characters consumed)
+                if col < 0 or col > n:
+                    continue
+                # Diagonal: quote[i-1] against text[col-1]
+                best = prev[o] + (0 if col >= 1 and text[col - 1] == qc else 1)
+                start = prev_start[o]
+                # Up: quote char not in text
+                if o + 1 < span and prev[o + 1] + 1 < best:
+                    best = prev[o + 1] + 1
+                    start = prev_start[o + 1]
+                # Left: extra text char
+                if o and row[o - 1] + 1 < best:
+                    best = row[o - 1] + 1
+                    start = row_start[o - 1]
+                row[o] = best
+                row_start[o] = start
+            prev, prev_start = row, row_start
+            if min(prev) > budget:
+                return None
+
+        result = None
+        for o in range(span):
+            distance = prev[o]
+            if distance <= budget:
+                end = base + m + o
+                start = prev_start[o]
+                if result is None or (distance, end - start) < (result.distance, result.end - result.start):
+                    result = FuzzyMatch(start, end, distance)
+        return result
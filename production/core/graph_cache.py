@@ -0,0 +1,450 @@
+#!/usr/bin/env python3
+"""
+Graph Cache for PROVES Library
+In-memory CSR adjacency over kg_nodes / kg_relationships
+
+Every GraphManager traversal used to join kg_relationships to kg_nodes in
+Postgres, once per hop. This cache holds the graph as compact NumPy arrays:
+
+- nodes: int32 positions mapped to/from UUIDs
+- edges: int32 source/target, int16 relationship_type code, int8
+  cascade_domain code (-1 = none), float32 strength (NaN = none), bool
+  is_critical
+- CSR adjacency (indptr + edge positions) per direction, built lazily and
+  optionally restricted to one cascade_domain
+
+It is refreshed incrementally from the updated_at watermarks (migration
+018). Deletions are detected from the n_tup_del counters in
+pg_stat_user_tables (a catalog read, no table scan), with exact row counts
+compared only every COUNT_CHECK_INTERVAL as a backstop (TRUNCATE, stats
+resets); either forces a full reload. Re-read rows that did not change
+leave version alone, so derived indexes survive the overlap window.
+GraphManager writes through (add_node / add_edge) so its own changes are
+visible immediately.
+"""
+import itertools
+import threading
+import time
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from db_connector import get_db
+
+# Seconds between incremental refreshes; re-read overlap behind the watermark
+REFRESH_INTERVAL = 30.0
+REFRESH_OVERLAP = timedelta(minutes=5)
+# Relationship rows applied per array append during a refresh
+EDGE_BATCH_SIZE = 50000
+# Seconds between exact COUNT(*) checks of both tables
+COUNT_CHECK_INTERVAL = 3600.0
+
+NO_DOMAIN = -1
+
+
+def _since_clause(since) -> str:
+    """Watermark filter on plain updated_at, so idx_kg_*_updated_at (migration 018) serves it."""
+    return "WHERE updated_at > %s::timestamptz" if since else ""
+
+
+class GraphCache:
+    """Process-local CSR view of the knowledge graph"""
+
+    def __init__(self, refresh_interval: float = REFRESH_INTERVAL):
+        self.db = get_db()
+        self.refresh_interval = refresh_interval
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self) -> None:
+        """Drop all cached nodes, edges and watermarks."""
+        # Nodes
+        self._node_ids: List[str] = []
+        self._node_index: Dict[str, int] = {}
+        self._node_names: List[str] = []
+        self._node_types: List[str] = []
+
+        # Edges (arrays indexed by edge position)
+        self._edge_ids: List[str] = []
+        self._edge_index: Dict[str, int] = {}
+        self._edge_meta: List[Dict[str, Any]] = []
+        self.src = np.empty(0, dtype=np.int32)
+        self.dst = np.empty(0, dtype=np.int32)
+        self.rel_type = np.empty(0, dtype=np.int16)
+        self.domain = np.empty(0, dtype=np.int8)
+        self.strength = np.empty(0, dtype=np.float32)
+        self.is_critical = np.empty(0, dtype=np.bool_)
+
+        # Code tables for relationship_type / cascade_domain
+        self.relationship_types: List[str] = []
+        self._type_codes: Dict[str, int] = {}
+        self.cascade_domains: List[str] = []
+        self._domain_codes: Dict[str, int] = {}
+
+        # (direction, domain code or None) -> (indptr, edge positions)
+        self._csr: Dict[Tuple[str, Optional[int]], Tuple[np.ndarray, np.ndarray]] = {}
+
+        self._node_watermark = None
+        self._edge_watermark = None
+        self._last_refresh = 0.0
+        # Deletion counter seen at the last refresh; time of the last count check
+        self._deleted_rows = None
+        self._counts_checked = 0.0
+        # Bumped on every edge change (and reset); derived structures key memos on it
+        self.version = getattr(self, 'version', 0) + 1
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def _code(self, table: List[str], codes: Dict[str, int], value: str) -> int:
+        if value not in codes:
+            codes[value] = len(table)
+            table.append(value)
+        return codes[value]
+
+    def _upsert_node(self, row: Dict[str, Any]) -> int:
+        node_id = str(row['id'])
+        i = self._node_index.get(node_id)
+        if i is None:
+            i = len(self._node_ids)
+            self._node_index[node_id] = i
+            self._node_ids.append(node_id)
+            self._node_names.append(row['name'])
+            self._node_types.append(row['node_type'])
+        else:
+            self._node_names[i] = row['name']
+            self._node_types[i] = row['node_type']
+        return i
+
+    def _same_edge(self, e: int, values: tuple) -> bool:
+        """Edge position e already holds values."""
+        s, t, rel_type, domain, strength, is_critical = values
+        current = self.strength[e]
+        return (
+            self.src[e] == s and self.dst[e] == t and self.rel_type[e] == rel_type
+            and self.domain[e] == domain and self.is_critical[e] == is_critical
+            and (current == np.float32(strength) or (np.isnan(current) and np.isnan(strength)))
+        )
+
+    def _upsert_edges(self, rows: List[Dict[str, Any]]) -> None:
+        """Apply edge rows (insert or update in place); drop stale CSR only if something changed."""
+        new = []
+        changed = False
+        for row in rows:
+            s = self._node_index.get(str(row['source_node_id']))
+            t = self._node_index.get(str(row['target_node_id']))
+            if s is None or t is None:
+                continue
+            values = (
+                s, t,
+                self._code(self.relationship_types, self._type_codes, row['relationship_type']),
+                self._code(self.cascade_domains, self._domain_codes, row['cascade_domain'])
+                if row.get('cascade_domain') else NO_DOMAIN,
+                np.nan if row.get('strength') is None else float(row['strength']),
+                bool(row.get('is_critical')),
+            )
+            meta = {
+                "description": row.get('description'),
+                "evidence_entry_id": row.get('evidence_entry_id'),
+                "created_at": row.get('created_at'),
+                "updated_at": row.get('updated_at'),
+            }
+            e = self._edge_index.get(str(row['id']))
+            if e is None:
+                new.append((str(row['id']), values, meta))
+            elif not self._same_edge(e, values) or self._edge_meta[e] != meta:
+                changed = True
+                (self.src[e], self.dst[e], self.rel_type[e], self.domain[e],
+                 self.strength[e], self.is_critical[e]) = values
+                self._edge_meta[e] = meta
+
+        if new:
+            start = len(self._edge_ids)
+            for offset, (edge_id, _, meta) in enumerate(new):
+                self._edge_index[edge_id] = start + offset
+                self._edge_ids.append(edge_id)
+                self._edge_meta.append(meta)
+            columns = list(zip(*(values for _, values, _ in new)))
+            self.src = np.concatenate([self.src, np.array(columns[0], dtype=np.int32)])
+            self.dst = np.concatenate([self.dst, np.array(columns[1], dtype=np.int32)])
+            self.rel_type = np.concatenate([self.rel_type, np.array(columns[2], dtype=np.int16)])
+            self.domain = np.concatenate([self.domain, np.array(columns[3], dtype=np.int8)])
+            self.strength = np.concatenate([self.strength, np.array(columns[4], dtype=np.float32)])
+            self.is_critical = np.concatenate([self.is_critical, np.array(columns[5], dtype=np.bool_)])
+
+        if new or changed:
+            self._csr.clear()
+            self.version += 1
+
+    def _deletion_count(self) -> Optional[int]:
+        """Cumulative rows deleted from kg_nodes / kg_relationships (statistics views, no scan)."""
+        row = self.db.fetch_one("""
+            SELECT COALESCE(SUM(n_tup_del), 0) AS deleted
+            FROM pg_stat_user_tables
+            WHERE relname IN ('kg_nodes', 'kg_relationships')
+        """)
+        return int(row['deleted']) if row else None
+
+    def refresh(self, full: bool = False) -> int:
+        """
+        Pull node and relationship changes since the last watermarks
+
+        Falls back to a full reload when the deletion counter moved, or when
+        the periodic row count check shows something the watermarks missed.
+
+        Returns:
+            Number of rows applied
+        """
+        with self._lock:
+            # Read before loading: a delete committed during the load shows
+            # up as a changed counter on the next refresh. Statistics are
+            # flushed lazily, so a delete may be picked up one refresh late.
+            deleted = self._deletion_count()
+            if full or (self._last_refresh and deleted != self._deleted_rows):
+                full = True
+                self._reset()
+
+            applied = 0
+            since = self._node_watermark - REFRESH_OVERLAP if self._node_watermark else None
+            nodes = self.db.fetch_iter("""
+                SELECT id::text AS id, name, node_type,
+                       COALESCE(updated_at, created_at) AS changed_at
+                FROM kg_nodes
+            """ + _since_clause(since), (since,) if since else None)
+            for row in nodes:
+                applied += 1
+                self._upsert_node(row)
+                if row['changed_at'] and (self._node_watermark is None or row['changed_at'] > self._node_watermark):
+                    self._node_watermark = row['changed_at']
+
+            since = self._edge_watermark - REFRESH_OVERLAP if self._edge_watermark else None
+            edges = self.db.fetch_iter("""
+                SELECT id::text AS id, source_node_id::text AS source_node_id,
+                       target_node_id::text AS target_node_id, relationship_type,
+                       strength, description, cascade_domain, is_critical,
+                       evidence_entry_id::text AS evidence_entry_id, created_at,
+                       COALESCE(updated_at, created_at) AS updated_at
+                FROM kg_relationships
+            """ + _since_clause(since), (since,) if since else None)
+            # Apply in batches so a full load never holds every row as a dict
+            while True:
+                batch = list(itertools.islice(edges, EDGE_BATCH_SIZE))
+                if not batch:
+                    break
+                applied += len(batch)
+                self._upsert_edges(batch)
+                for row in batch:
+                    if row['updated_at'] and (self._edge_watermark is None or row['updated_at'] > self._edge_watermark):
+                        self._edge_watermark = row['updated_at']
+
+            now = time.monotonic()
+            if full or not self._last_refresh:
+                self._counts_checked = now
+            elif now - self._counts_checked >= COUNT_CHECK_INTERVAL:
+                self._counts_checked = now
+                counts = self.db.fetch_one("""
+                    SELECT (SELECT COUNT(*) FROM kg_nodes) AS nodes,
+                           (SELECT COUNT(*) FROM kg_relationships) AS edges
+                """)
+                if counts and (counts['nodes'] != len(self._node_ids) or counts['edges'] != len(self._edge_ids)):
+                    return self.refresh(full=True)
+
+            self._deleted_rows = deleted
+            self._last_refresh = now
+            return applied
+
+    def ensure_fresh(self) -> None:
+        """Refresh if the last refresh is older than refresh_interval."""
+        if time.monotonic() - self._last_refresh >= self.refresh_interval:
+            self.refresh()
+
+    def invalidate(self) -> None:
+        """Force a full reload on the next access (e.g. after deleting nodes)."""
+        with self._lock:
+            self._reset()
+
+    # ------------------------------------------------------------------
+    # Write-through (GraphManager)
+    # ------------------------------------------------------------------
+
+    def add_node(self, node_id: Any, name: str, node_type: str) -> None:
+        """Record a node this process just created."""
+        with self._lock:
+            if self._last_refresh:
+                self._upsert_node({"id": node_id, "name": name, "node_type": node_type})
+
+    def add_edge(self, row: Dict[str, Any]) -> Optional[int]:
+        """
+        Record a relationship this process just created
+
+        Args:
+            row: kg_relationships columns (id, source_node_id, target_node_id, ...)
+
+        Returns:
+            Edge position, or None if the cache isn't loaded / endpoints unknown
+        """
+        with self._lock:
+            if not self._last_refresh:
+                return None
+            self._upsert_edges([row])
+            return self._edge_index.get(str(row['id']))
+
+    def add_edges(self, rows: List[Dict[str, Any]]) -> None:
+        """Record a batch of relationships this process just created (one CSR rebuild)."""
+        with self._lock:
+            if self._last_refresh:
+                self._upsert_edges(rows)
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self._node_ids)
+
+    @property
+    def num_edges(self) -> int:
+        return len(self._edge_ids)
+
+    def node_index(self, node_id: Any) -> Optional[int]:
+        """Position of a node UUID, or None."""
+        return self._node_index.get(str(node_id))
+
+    def node_id(self, i: int) -> str:
+        return self._node_ids[i]
+
+    def node_name(self, i: int) -> str:
+        return self._node_names[i]
+
+    def node_type(self, i: int) -> str:
+        return self._node_types[i]
+
+    def domain_code(self, cascade_domain: Optional[str]) -> Optional[int]:
+        """Code of a cascade_domain (None if unknown)."""
+        return self._domain_codes.get(cascade_domain) if cascade_domain else None
+
+    def type_code(self, relationship_type: Optional[str]) -> Optional[int]:
+        """Code of a relationship_type (None if unknown)."""
+        return self._type_codes.get(relationship_type) if relationship_type else None
+
+    def adjacency(
+        self,
+        direction: str = 'outgoing',
+        cascade_domain: Optional[str] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        CSR adjacency
+
+        Args:
+            direction: 'outgoing' (rows = source) or 'incoming' (rows = target)
+            cascade_domain: Restrict to one domain (None = all edges)
+
+        Returns:
+            (indptr, edges): edge positions of node i are edges[indptr[i]:indptr[i+1]],
+            in load order
+        """
+        with self._lock:
+            n = len(self._node_ids)
+            code = self.domain_code(cascade_domain)
+            if cascade_domain and code is None:
+                # Domain with no edges yet
+                return np.zeros(n + 1, dtype=np.int32), np.empty(0, dtype=np.int32)
+
+            key = (direction, code)
+            if key not in self._csr:
+                if code is not None:
+                    edges = np.flatnonzero(self.domain == code).astype(np.int32)
+                else:
+                    edges = np.arange(len(self._edge_ids), dtype=np.int32)
+                rows = (self.src if direction == 'outgoing' else self.dst)[edges]
+                order = np.argsort(rows, kind='stable')
+                indptr = np.zeros(n + 1, dtype=np.int32)
+                np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+                self._csr[key] = (indptr, edges[order])
+            return self._csr[key]
+
+    def edge(self, e: int) -> Dict[str, Any]:
+        """Edge as a kg_relationships row plus source_name / target_name."""
+        s, t = int(self.src[e]), int(self.dst[e])
+        d = int(self.domain[e])
+        strength = float(self.strength[e])
+        return {
+            "id": self._edge_ids[e],
+            "source_node_id": self._node_ids[s],
+            "target_node_id": self._node_ids[t],
+            "relationship_type": self.relationship_types[int(self.rel_type[e])],
+            "strength": None if np.isnan(strength) else strength,
+            "cascade_domain": self.cascade_domains[d] if d != NO_DOMAIN else None,
+            "is_critical": bool(self.is_critical[e]),
+            **self._edge_meta[e],
+            "source_name": self._node_names[s],
+            "target_name": self._node_names[t],
+        }
+
+    def node_relationships(
+        self,
+        node_id: Any,
+        direction: str = 'both',
+        relationship_type: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Relationships of a node, newest first (GraphManager.get_node_relationships)."""
+        types = [relationship_type] if relationship_type else None
+        return self.relationships_for_nodes([node_id], direction, types)[str(node_id)]
+
+    def relationships_for_nodes(
+        self,
+        node_ids: List[Any],
+        direction: str = 'both',
+        relationship_types: Optional[List[str]] = None
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Relationships of each node, newest first (GraphManager.get_relationships_for_nodes)."""
+        self.ensure_fresh()
+        result: Dict[str, List[Dict[str, Any]]] = {}
+        with self._lock:
+            codes = None
+            if relationship_types:
+                codes = [c for c in (self.type_code(t) for t in relationship_types) if c is not None]
+            for node_id in node_ids:
+                result[str(node_id)] = []
+                i = self.node_index(node_id)
+                if i is None or codes == []:
+                    continue
+                found = []
+                for d in (('outgoing', 'incoming') if direction == 'both' else (direction,)):
+                    indptr, edges = self.adjacency(d)
+                    found.append(edges[indptr[i]:indptr[i + 1]])
+                found = np.concatenate(found)
+                if codes is not None:
+                    found = found[np.isin(self.rel_type[found], codes)]
+                # Self-loops appear in both directions
+                result[str(node_id)] = [self.edge(e) for e in dict.fromkeys(found.tolist())]
+        for rows in result.values():
+            rows.sort(key=lambda r: r['created_at'].timestamp() if r['created_at'] else 0.0, reverse=True)
+        return result
+
+    def has_edge(self, source_node_id: Any, target_node_id: Any, relationship_type: str) -> bool:
+        """True if a source -> target edge of this type is cached (GraphManager.relationship_exists)."""
+        self.ensure_fresh()
+        with self._lock:
+            s = self.node_index(source_node_id)
+            t = self.node_index(target_node_id)
+            code = self.type_code(relationship_type)
+            if s is None or t is None or code is None:
+                return False
+            indptr, edges = self.adjacency('outgoing')
+            out = edges[indptr[s]:indptr[s + 1]]
+            return bool(np.any((self.dst[out] == t) & (self.rel_type[out] == code)))
+
+# Process-wide cache instance
+_cache: Optional[GraphCache] = None
+
+
+def get_graph_cache() -> GraphCache:
+    """Get or create the process-wide graph cache (loaded on first use)."""
+    global _cache
+    if _cache is None:
+        _cache = GraphCache()
+    return _cache
@@ -3,17 +3,28 @@
 Knowledge Graph Manager for PROVES Library
 CRUD operations for nodes and relationships (ERV)
 """
-from typing import Optional, Dict, Any, List
+from datetime import datetime
+from typing import Optional, Dict, Any, Iterator, List, Tuple
 from uuid import UUID
 import json
-from db_connector import get_db
+from db_connector import DEFAULT_ITERSIZE, get_db
+from graph_cache import get_graph_cache
+from cascade_engine import get_cascade_engine, MAX_DEPTH, MAX_FANOUT, MAX_NODES
+from reachability import get_reachability_index
+from graph_metrics import ALL_DOMAINS, get_graph_metrics
 
 
 class GraphManager:
     """Manages knowledge graph nodes and relationships"""
 
-    def __init__(self):
+    def __init__(self, use_cache: bool = True):
+        """
+        Args:
+            use_cache: Serve traversals from the in-memory graph cache
+                       (graph_cache.py) instead of querying per call
+        """
         self.db = get_db()
+        self.cache = get_graph_cache() if use_cache else None
 
     # ============================================
     # NODES
@@ -51,6 +62,8 @@ class GraphManager:
         )
         if result is None:
             raise ValueError("Failed to create node: Database returned no ID")
+        if self.cache:
+            self.cache.add_node(result['id'], name, node_type)
         return result['id']
 
     def get_node(self, node_id: UUID) -> Optional[Dict[str, Any]]:
@@ -71,21 +84,67 @@ class GraphManager:
         self,
         node_type: Optional[str] = None,
         name_pattern: Optional[str] = None,
-        limit: int = 100
+        limit: int = 100,
+        after: Optional[Tuple[datetime, UUID]] = None
     ) -> List[Dict[str, Any]]:
         """
-        Search nodes with filters
+        Search nodes with filters, newest first
+
+        Pages with a keyset cursor rather than OFFSET: pass the
+        (created_at, id) of the last row of one page as `after` to get the
+        next (see node_cursor()).
 
         Args:
             node_type: Filter by type
             name_pattern: Filter by name (case-insensitive LIKE)
             limit: Max results
+            after: Keyset cursor; only nodes ordered after it are returned
 
         Returns:
             List of nodes
         """
+        where_clause, params = self._node_filters(node_type, name_pattern)
+        if after:
+            where_clause += " AND (created_at, id) < (%s, %s::uuid)"
+            params.extend([after[0], str(after[1])])
+        query = f"""
+            SELECT * FROM kg_nodes
+            WHERE {where_clause}
+            ORDER BY created_at DESC, id DESC
+            LIMIT %s
+        """
+        params.append(limit)
+
+        return self.db.fetch_all(query, tuple(params))
+
+    def iter_nodes(
+        self,
+        node_type: Optional[str] = None,
+        name_pattern: Optional[str] = None,
+        itersize: int = DEFAULT_ITERSIZE
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream every matching node, newest first (server-side cursor)
+
+        For reports and exports that walk the whole table; memory stays at
+        itersize rows.
+        """
+        where_clause, params = self._node_filters(node_type, name_pattern)
+        query = f"""
+            SELECT * FROM kg_nodes
+            WHERE {where_clause}
+            ORDER BY created_at DESC, id DESC
+        """
+        return self.db.fetch_iter(query, tuple(params), itersize=itersize)
+
+    @staticmethod
+    def node_cursor(node: Dict[str, Any]) -> Tuple[datetime, UUID]:
+        """Keyset cursor for search_nodes(after=...) from the last node of a page."""
+        return node['created_at'], node['id']
+
+    def _node_filters(self, node_type: Optional[str], name_pattern: Optional[str]) -> Tuple[str, List[Any]]:
         conditions = []
-        params = []
+        params: List[Any] = []
 
         if node_type:
             conditions.append("node_type = %s")
@@ -95,16 +154,7 @@ class GraphManager:
             conditions.append("name ILIKE %s")
             params.append(f"%{name_pattern}%")
 
-        where_clause = " AND ".join(conditions) if conditions else "TRUE"
-        query = f"""
-            SELECT * FROM kg_nodes
-            WHERE {where_clause}
-            ORDER BY created_at DESC
-            LIMIT %s
-        """
-        params.append(limit)
-
-        return self.db.fetch_all(query, tuple(params))
+        return (" AND ".join(conditions) if conditions else "TRUE"), params
 
     def update_node(self, node_id: UUID, updates: Dict[str, Any]) -> bool:
         """
@@ -131,14 +181,83 @@ class GraphManager:
         query = f"UPDATE kg_nodes SET {set_clause} WHERE id = %s"
 
         self.db.execute(query, (*updates.values(), str(node_id)))
+        if self.cache and 'name' in updates:
+            node = self.get_node(node_id)
+            if node:
+                self.cache.add_node(node['id'], node['name'], node['node_type'])
         return True
 
     def delete_node(self, node_id: UUID) -> bool:
         """Delete node (cascades to relationships)"""
         query = "DELETE FROM kg_nodes WHERE id = %s"
         self.db.execute(query, (str(node_id),))
+        if self.cache:
+            self.cache.invalidate()
         return True
 
+    def create_nodes_bulk(self, nodes: List[Dict[str, Any]]) -> Dict[Tuple[str, str], UUID]:
+        """
+        Create many nodes in one round trip
+
+        Rows are streamed with COPY into a temp table and merged into
+        kg_nodes; a (name, node_type) pair that already exists is reused
+        instead of duplicated.
+
+        Args:
+            nodes: Dicts with name, node_type and optional description,
+                   properties, embedding (same meaning as create_node)
+
+        Returns:
+            (name, node_type) -> UUID for every input node (created or existing)
+        """
+        if not nodes:
+            return {}
+
+        with self.db.get_cursor() as cur:
+            cur.execute("""
+                CREATE TEMP TABLE kg_nodes_import (LIKE kg_nodes INCLUDING DEFAULTS)
+                ON COMMIT DROP
+            """)
+            with cur.copy(
+                "COPY kg_nodes_import (name, node_type, description, properties, embedding) FROM STDIN"
+            ) as copy:
+                for node in nodes:
+                    embedding = node.get('embedding')
+                    copy.write_row((
+                        node['name'],
+                        node['node_type'],
+                        node.get('description'),
+                        json.dumps(node.get('properties') or {}),
+                        '[' + ','.join(str(float(x)) for x in embedding) + ']' if embedding is not None else None,
+                    ))
+            cur.execute("""
+                WITH inserted AS (
+                    INSERT INTO kg_nodes (name, node_type, description, properties, embedding)
+                    SELECT DISTINCT ON (i.name, i.node_type)
+                        i.name, i.node_type, i.description, i.properties, i.embedding
+                    FROM kg_nodes_import i
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM kg_nodes n
+                        WHERE n.name = i.name AND n.node_type = i.node_type
+                    )
+                    ORDER BY i.name, i.node_type
+                    RETURNING id, name, node_type
+                )
+                SELECT id, name, node_type, TRUE AS created FROM inserted
+                UNION ALL
+                SELECT DISTINCT ON (n.name, n.node_type) n.id, n.name, n.node_type, FALSE
+                FROM kg_nodes n
+                JOIN kg_nodes_import i ON i.name = n.name AND i.node_type = n.node_type
+                ORDER BY created, name
+            """)
+            rows = cur.fetchall()
+
+        if self.cache:
+            for row in rows:
+                if row['created']:
+                    self.cache.add_node(row['id'], row['name'], row['node_type'])
+        return {(row['name'], row['node_type']): row['id'] for row in rows}
+
     # ============================================
     # RELATIONSHIPS (ERV)
     # ============================================
@@ -176,7 +295,7 @@ class GraphManager:
                 strength, description, cascade_domain, is_critical, evidence_entry_id
             )
             VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-            RETURNING id
+            RETURNING *
         """
         result = self.db.fetch_one(
             query,
@@ -188,8 +307,112 @@ class GraphManager:
         )
         if result is None:
             raise ValueError("Failed to create relationship: Database returned no ID")
+        if self.cache:
+            position = self.cache.add_edge(result)
+            if position is not None:
+                get_reachability_index().add_edge(position)
         return result['id']
 
+    def create_relationships_bulk(
+        self,
+        relationships: List[Dict[str, Any]],
+        node_ids: Optional[Dict[Tuple[str, str], UUID]] = None
+    ) -> List[UUID]:
+        """
+        Create many relationships in one round trip
+
+        Rows are streamed with COPY into a temp table and merged into
+        kg_relationships; a (source, target, relationship_type) edge that
+        already exists is skipped.
+
+        Args:
+            relationships: Dicts with relationship_type, source_node_id /
+                           target_node_id (or source_name / target_name, plus
+                           source_type / target_type, when node_ids is given)
+                           and optional strength, description, cascade_domain,
+                           is_critical, evidence_entry_id (same meaning as
+                           create_relationship)
+            node_ids: (name, node_type) -> UUID map used to resolve endpoints
+                      (e.g. the result of create_nodes_bulk); the type may be
+                      omitted only when the name is unique in the map
+
+        Returns:
+            UUIDs of the relationships created
+        """
+        if not relationships:
+            return []
+
+        by_name: Dict[str, List[UUID]] = {}
+        for (name, _), node_id in (node_ids or {}).items():
+            by_name.setdefault(name, []).append(node_id)
+
+        def endpoint(rel: Dict[str, Any], side: str) -> str:
+            if rel.get(f'{side}_node_id'):
+                return str(rel[f'{side}_node_id'])
+            name = rel.get(f'{side}_name')
+            node_type = rel.get(f'{side}_type')
+            if node_type is not None:
+                if (name, node_type) not in (node_ids or {}):
+                    raise ValueError(f"Unresolved {side} node for relationship: {name} ({node_type})")
+                return str(node_ids[(name, node_type)])
+            matches = by_name.get(name, [])
+            if len(matches) != 1:
+                problem = "Ambiguous" if matches else "Unresolved"
+                raise ValueError(f"{problem} {side} node for relationship: {name or rel}"
+                                 + (f" (give {side}_type)" if matches else ""))
+            return str(matches[0])
+
+        rows = [
+            (
+                endpoint(rel, 'source'),
+                endpoint(rel, 'target'),
+                rel['relationship_type'],
+                rel.get('strength'),
+                rel.get('description'),
+                rel.get('cascade_domain'),
+                bool(rel.get('is_critical', False)),
+                str(rel['evidence_entry_id']) if rel.get('evidence_entry_id') else None,
+            )
+            for rel in relationships
+        ]
+
+        with self.db.get_cursor() as cur:
+            cur.execute("""
+                CREATE TEMP TABLE kg_relationships_import (LIKE kg_relationships INCLUDING DEFAULTS)
+                ON COMMIT DROP
+            """)
+            with cur.copy("""
+                COPY kg_relationships_import (
+                    source_node_id, target_node_id, relationship_type,
+                    strength, description, cascade_domain, is_critical, evidence_entry_id
+                ) FROM STDIN
+            """) as copy:
+                for row in rows:
+                    copy.write_row(row)
+            cur.execute("""
+                INSERT INTO kg_relationships (
+                    source_node_id, target_node_id, relationship_type,
+                    strength, description, cascade_domain, is_critical, evidence_entry_id
+                )
+                SELECT DISTINCT ON (i.source_node_id, i.target_node_id, i.relationship_type)
+                    i.source_node_id, i.target_node_id, i.relationship_type,
+                    i.strength, i.description, i.cascade_domain, i.is_critical, i.evidence_entry_id
+                FROM kg_relationships_import i
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM kg_relationships r
+                    WHERE r.source_node_id = i.source_node_id
+                      AND r.target_node_id = i.target_node_id
+                      AND r.relationship_type = i.relationship_type
+                )
+                ORDER BY i.source_node_id, i.target_node_id, i.relationship_type
+                RETURNING *
+            """)
+            created = cur.fetchall()
+
+        if self.cache:
+            self.cache.add_edges(created)
+        return [row['id'] for row in created]
+
     def get_relationship(self, rel_id: UUID) -> Optional[Dict[str, Any]]:
         """Get relationship by ID"""
         query = "SELECT * FROM kg_relationships WHERE id = %s"
@@ -212,6 +435,9 @@ class GraphManager:
         Returns:
             List of relationships
         """
+        if self.cache:
+            return self.cache.node_relationships(node_id, direction, relationship_type)
+
         conditions = []
         params = [str(node_id)]
 
@@ -241,71 +467,176 @@ class GraphManager:
 
         return self.db.fetch_all(query, tuple(params))
 
+    def get_relationships_for_nodes(
+        self,
+        node_ids: List[UUID],
+        direction: str = 'both',
+        relationship_types: Optional[List[str]] = None
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Get the relationships of many nodes at once
+
+        One graph cache lookup (or one query) instead of a
+        get_node_relationships() call per node.
+
+        Args:
+            node_ids: Node UUIDs
+            direction: 'outgoing', 'incoming', or 'both'
+            relationship_types: Optional filter by type(s)
+
+        Returns:
+            Node UUID (as str) -> list of relationships, newest first; every
+            requested node has an entry
+        """
+        if self.cache:
+            return self.cache.relationships_for_nodes(node_ids, direction, relationship_types)
+
+        result: Dict[str, List[Dict[str, Any]]] = {str(node_id): [] for node_id in node_ids}
+        if not result:
+            return result
+
+        ids = list(result)
+        conditions = []
+        params: List[Any] = []
+
+        if direction == 'outgoing':
+            conditions.append("r.source_node_id = ANY(%s::uuid[])")
+            params.append(ids)
+        elif direction == 'incoming':
+            conditions.append("r.target_node_id = ANY(%s::uuid[])")
+            params.append(ids)
+        else:  # both
+            conditions.append("(r.source_node_id = ANY(%s::uuid[]) OR r.target_node_id = ANY(%s::uuid[]))")
+            params.extend([ids, ids])
+
+        if relationship_types:
+            conditions.append("r.relationship_type = ANY(%s)")
+            params.append(list(relationship_types))
+
+        where_clause = " AND ".join(conditions)
+        query = f"""
+            SELECT r.*,
+                   sn.name as source_name,
+                   tn.name as target_name
+            FROM kg_relationships r
+            JOIN kg_nodes sn ON r.source_node_id = sn.id
+            JOIN kg_nodes tn ON r.target_node_id = tn.id
+            WHERE {where_clause}
+            ORDER BY r.created_at DESC
+        """
+
+        for rel in self.db.fetch_all(query, tuple(params)):
+            source, target = str(rel['source_node_id']), str(rel['target_node_id'])
+            if direction != 'incoming' and source in result:
+                result[source].append(rel)
+            if direction != 'outgoing' and target in result and target != source:
+                result[target].append(rel)
+        return result
+
+    def relationship_exists(
+        self,
+        source_node_id: UUID,
+        target_node_id: UUID,
+        relationship_type: str
+    ) -> bool:
+        """
+        Check for a source -> target relationship of the given type
+
+        Args:
+            source_node_id: Source node UUID
+            target_node_id: Target node UUID
+            relationship_type: Relationship type
+
+        Returns:
+            True if the relationship exists
+        """
+        if self.cache:
+            return self.cache.has_edge(source_node_id, target_node_id, relationship_type)
+
+        query = """
+            SELECT EXISTS (
+                SELECT 1 FROM kg_relationships
+                WHERE source_node_id = %s
+                  AND relationship_type = %s
+                  AND target_node_id = %s
+            ) AS found
+        """
+        result = self.db.fetch_one(query, (str(source_node_id), relationship_type, str(target_node_id)))
+        return bool(result and result['found'])
+
     def find_cascade_path(
         self,
         start_node_id: UUID,
         cascade_domain: str,
-        max_depth: int = 5
-    ) -> List[Dict[str, Any]]:
+        max_depth: int = MAX_DEPTH,
+        max_fanout: int = MAX_FANOUT,
+        max_nodes: int = MAX_NODES,
+        stop_at_critical: bool = False
+    ) -> Dict[str, Any]:
         """
-        Find cascade paths from a starting node
+        Find the cascade reachable from a starting node
+
+        Bounded BFS over the in-memory graph (cascade_engine.py): each node
+        appears once, at its minimum depth, with the edge it was reached
+        through. Use cascade_engine.path_to() for the path to a given node.
 
         Args:
             start_node_id: Starting node UUID
             cascade_domain: Domain to trace (power, data, thermal, timing)
             max_depth: Maximum path depth
+            max_fanout: Out-edges expanded per node (critical/strongest first)
+            max_nodes: Nodes reached before the search stops
+            stop_at_critical: Stop at the first is_critical edge
 
         Returns:
-            List of paths (each path is a list of relationships)
+            Cascade tree (root, nodes, critical_edges, truncated, stopped_at_critical)
         """
-        # Recursive CTE to find paths
-        query = """
-            WITH RECURSIVE cascade_paths AS (
-                -- Base case: direct relationships
-                SELECT
-                    r.id,
-                    r.source_node_id,
-                    r.target_node_id,
-                    r.relationship_type,
-                    r.cascade_domain,
-                    r.is_critical,
-                    sn.name as source_name,
-                    tn.name as target_name,
-                    1 as depth,
-                    ARRAY[r.id] as path
-                FROM kg_relationships r
-                JOIN kg_nodes sn ON r.source_node_id = sn.id
-                JOIN kg_nodes tn ON r.target_node_id = tn.id
-                WHERE r.source_node_id = %s
-                  AND r.cascade_domain = %s
-
-                UNION
-
-                -- Recursive case: follow the chain
-                SELECT
-                    r.id,
-                    r.source_node_id,
-                    r.target_node_id,
-                    r.relationship_type,
-                    r.cascade_domain,
-                    r.is_critical,
-                    sn.name as source_name,
-                    tn.name as target_name,
-                    cp.depth + 1,
-                    cp.path || r.id
-                FROM kg_relationships r
-                JOIN kg_nodes sn ON r.source_node_id = sn.id
-                JOIN kg_nodes tn ON r.target_node_id = tn.id
-                JOIN cascade_paths cp ON r.source_node_id = cp.target_node_id
-                WHERE r.cascade_domain = %s
-                  AND cp.depth < %s
-                  AND NOT r.id = ANY(cp.path)  -- Prevent cycles
-            )
-            SELECT * FROM cascade_paths
-            ORDER BY depth, is_critical DESC
+        return get_cascade_engine().cascade(
+            start_node_id,
+            cascade_domain,
+            max_depth=max_depth,
+            max_fanout=max_fanout,
+            max_nodes=max_nodes,
+            stop_at_critical=stop_at_critical
+        )
+
+    def cascade_reaches(
+        self,
+        source_node_id: UUID,
+        target_node_id: UUID,
+        cascade_domain: str
+    ) -> Dict[str, Any]:
         """
+        Whether a failure of source can cascade to target (reachability.py)
 
-        return self.db.fetch_all(query, (str(start_node_id), cascade_domain, cascade_domain, max_depth))
+        Args:
+            source_node_id: Node that fails
+            target_node_id: Node that may be affected
+            cascade_domain: Domain to trace (power, data, thermal, timing)
+
+        Returns:
+            {"reachable": bool, "hops": fewest relationships, or None}
+        """
+        return get_reachability_index().query(source_node_id, target_node_id, cascade_domain)
+
+    def get_coupling_hubs(
+        self,
+        cascade_domain: str = ALL_DOMAINS,
+        metric: str = 'pagerank',
+        limit: int = 20
+    ) -> List[Dict[str, Any]]:
+        """
+        Top nodes by cached centrality (graph_metrics.py, kg_node_metrics)
+
+        Args:
+            cascade_domain: Domain, or 'all' for every dependency edge
+            metric: pagerank, betweenness, in_degree or out_degree
+            limit: Max results
+
+        Returns:
+            kg_node_metrics rows with name and node_type
+        """
+        return get_graph_metrics().top_nodes(cascade_domain, metric, limit)
 
     # ============================================
     # UTILITY FUNCTIONS
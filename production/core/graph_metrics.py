@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+Graph Metrics for PROVES Library
+Centrality / criticality per cascade_domain, cached in kg_node_metrics
+
+Which components are coupling hubs? Over the dependency edges
+(depends_on / requires by default) of each cascade_domain, plus all
+domains together ('all'), this computes per node:
+
+- in / out degree
+- PageRank (power iteration; the sparse mat-vec is one np.bincount per step)
+- betweenness (Brandes, level-synchronous BFS vectorized per level; from a
+  sample of sources on large graphs, scaled to the full count)
+- articulation points of the undirected view (iterative Tarjan)
+
+Results are written to kg_node_metrics with a per-domain fingerprint (edge
+count + latest updated_at) in kg_metrics_state. refresh_metrics() only
+recomputes domains whose fingerprint changed, warm-starting PageRank from
+the stored scores.
+"""
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from db_connector import get_db
+from graph_cache import GraphCache, get_graph_cache
+
+DEPENDENCY_TYPES = ('depends_on', 'requires')
+
+# Metrics for every edge regardless of domain are stored under this key
+ALL_DOMAINS = 'all'
+
+PAGERANK_DAMPING = 0.85
+PAGERANK_TOL = 1e-8
+PAGERANK_MAX_ITER = 100
+
+# Exact betweenness up to this many nodes, sampled sources beyond
+EXACT_BETWEENNESS_NODES = 2000
+BETWEENNESS_SAMPLES = 256
+
+
+# ============================================
+# Metrics (pure NumPy over edge arrays)
+# ============================================
+
+def pagerank(
+    n: int,
+    src: np.ndarray,
+    dst: np.ndarray,
+    damping: float = PAGERANK_DAMPING,
+    initial: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """PageRank by power iteration (dangling mass spread uniformly)."""
+    if n == 0:
+        return np.zeros(0)
+    out_degree = np.bincount(src, minlength=n).astype(np.float64)
+    dangling = out_degree == 0
+    inv_out = np.divide(1.0, out_degree, out=np.zeros(n), where=~dangling)
+
+    rank = np.full(n, 1.0 / n) if initial is None else initial / initial.sum()
+    for _ in range(PAGERANK_MAX_ITER):
+        spread = np.bincount(dst, weights=rank[src] * inv_out[src], minlength=n)
+        new = (1 - damping) / n + damping * (spread + rank[dangling].sum() / n)
+        if np.abs(new - rank).sum() < PAGERANK_TOL:
+            return new
+        rank = new
+    return rank
+
+
+def _gather(indptr: np.ndarray, indices: np.ndarray, nodes: np.ndarray):
+    """(owner, neighbor) arrays for all CSR neighbors of nodes."""
+    counts = indptr[nodes + 1] - indptr[nodes]
+    total = int(counts.sum())
+    owners = np.repeat(nodes, counts)
+    offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    return owners, indices[np.repeat(indptr[nodes], counts) + offsets]
+
+
+def betweenness(
+    n: int,
+    src: np.ndarray,
+    dst: np.ndarray,
+    samples: Optional[int] = None,
+    seed: int = 0
+) -> np.ndarray:
+    """
+    Directed betweenness centrality (Brandes), unnormalized
+
+    Args:
+        samples: Number of BFS sources (None = all nodes); sampled results
+                 are scaled by (nodes with out-edges) / samples, the
+                 population the sources are drawn from
+    """
+    scores = np.zeros(n)
+    if n == 0 or not len(src):
+        return scores
+    order = np.argsort(src, kind='stable')
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+    indices = dst[order].astype(np.int64)
+
+    sources = np.flatnonzero(np.diff(indptr))
+    scale = 1.0
+    if samples is not None and samples < len(sources):
+        scale = len(sources) / samples
+        sources = np.random.default_rng(seed).choice(sources, size=samples, replace=False)
+
+    for s in sources.tolist():
+        dist = np.full(n, -1, dtype=np.int64)
+        sigma = np.zeros(n)
+        dist[s] = 0
+        sigma[s] = 1.0
+        frontier = np.array([s], dtype=np.int64)
+        levels = []  # (parents, children) of shortest-path edges per level
+        d = 0
+        while len(frontier):
+            parents, children = _gather(indptr, indices, frontier)
+            fresh = dist[children] < 0
+            dist[np.unique(children[fresh])] = d + 1
+            on_path = dist[children] == d + 1
+            parents, children = parents[on_path], children[on_path]
+            sigma += np.bincount(children, weights=sigma[parents], minlength=n)
+            levels.append((parents, children))
+            frontier = np.unique(children)
+            d += 1
+
+        delta = np.zeros(n)
+        for parents, children in reversed(levels):
+            delta += np.bincount(
+                parents,
+                weights=sigma[parents] / sigma[children] * (1.0 + delta[children]),
+                minlength=n
+            )
+        delta[s] = 0.0
+        scores += delta
+    return scores * scale
+
+
+def articulation_points(n: int, src: np.ndarray, dst: np.ndarray) -> np.ndarray:
+    """Boolean mask of cut vertices of the undirected graph."""
+    result = np.zeros(n, dtype=bool)
+    if not len(src):
+        return result
+    a = np.concatenate([src, dst])
+    b = np.concatenate([dst, src])
+    order = np.argsort(a, kind='stable')
+    ptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(a, minlength=n), out=ptr[1:])
+    ptr = ptr.tolist()
+    nbrs = b[order].tolist()
+
+    disc = [-1] * n
+    low = [0] * n
+    timer = 0
+    for root in np.unique(a).tolist():
+        if disc[root] != -1:
+            continue
+        disc[root] = low[root] = timer
+        timer += 1
+        root_children = 0
+        # (node, parent, next neighbor position)
+        stack = [[root, -1, ptr[root]]]
+        while stack:
+            frame = stack[-1]
+            v, parent, i = frame
+            if i < ptr[v + 1]:
+                frame[2] += 1
+                w = nbrs[i]
+                if w == parent or w == v:
+                    continue
+                if disc[w] == -1:
+                    disc[w] = low[w] = timer
+                    timer += 1
+                    if v == root:
+                        root_children += 1
+                    stack.append([w, v, ptr[w]])
+                else:
+                    low[v] = min(low[v], disc[w])
+                continue
+            stack.pop()
+            if stack:
+                u = stack[-1][0]
+                low[u] = min(low[u], low[v])
+                if u != root and low[v] >= disc[u]:
+                    result[u] = True
+        if root_children > 1:
+            result[root] = True
+    return result
+
+
+# ============================================
+# Cached per-domain metrics
+# ============================================
+
+class GraphMetrics:
+    """Computes node metrics from the graph cache and caches them in kg_node_metrics"""
+
+    def __init__(self, cache: Optional[GraphCache] = None, relationship_types: Sequence[str] = DEPENDENCY_TYPES):
+        self.db = get_db()
+        self.cache = cache or get_graph_cache()
+        self.relationship_types = tuple(relationship_types)
+
+    def _edge_mask(self, cascade_domain: str) -> np.ndarray:
+        cache = self.cache
+        codes = [cache.type_code(t) for t in self.relationship_types]
+        mask = np.isin(cache.rel_type, [c for c in codes if c is not None])
+        if cascade_domain != ALL_DOMAINS:
+            code = cache.domain_code(cascade_domain)
+            mask &= cache.domain == (code if code is not None else -2)
+        return mask
+
+    def compute(
+        self,
+        cascade_domain: str = ALL_DOMAINS,
+        previous_pagerank: Optional[Dict[str, float]] = None,
+        betweenness_samples: int = BETWEENNESS_SAMPLES
+    ) -> List[Dict[str, Any]]:
+        """
+        Metrics for every node with a dependency edge in the domain
+
+        Returns:
+            Rows with node_id, in_degree, out_degree, pagerank, betweenness,
+            is_articulation_point
+        """
+        cache = self.cache
+        cache.ensure_fresh()
+        mask = self._edge_mask(cascade_domain)
+        src = cache.src[mask].astype(np.int64)
+        dst = cache.dst[mask].astype(np.int64)
+        if not len(src):
+            return []
+
+        # Compact to the nodes that touch these edges
+        nodes, inverse = np.unique(np.concatenate([src, dst]), return_inverse=True)
+        n = len(nodes)
+        src, dst = inverse[:len(src)], inverse[len(src):]
+
+        initial = None
+        if previous_pagerank:
+            initial = np.array([previous_pagerank.get(cache.node_id(i), 1.0 / n) for i in nodes.tolist()])
+
+        rank = pagerank(n, src, dst, initial=initial)
+        between = betweenness(n, src, dst, samples=None if n <= EXACT_BETWEENNESS_NODES else betweenness_samples)
+        cut = articulation_points(n, src, dst)
+        in_degree = np.bincount(dst, minlength=n)
+        out_degree = np.bincount(src, minlength=n)
+
+        return [
+            {
+                "node_id": cache.node_id(node),
+                "in_degree": int(in_degree[k]),
+                "out_degree": int(out_degree[k]),
+                "pagerank": float(rank[k]),
+                "betweenness": float(between[k]),
+                "is_articulation_point": bool(cut[k]),
+            }
+            for k, node in enumerate(nodes.tolist())
+        ]
+
+    def _fingerprints(self) -> Dict[str, Dict[str, Any]]:
+        """Current (edge_count, latest updated_at) of dependency edges per domain."""
+        rows = self.db.fetch_all("""
+            SELECT cascade_domain::text AS cascade_domain,
+                   COUNT(*) AS edge_count, MAX(updated_at) AS edges_updated_at
+            FROM kg_relationships
+            WHERE relationship_type::text = ANY(%s) AND cascade_domain IS NOT NULL
+            GROUP BY cascade_domain
+            UNION ALL
+            SELECT %s, COUNT(*), MAX(updated_at)
+            FROM kg_relationships
+            WHERE relationship_type::text = ANY(%s)
+        """, (list(self.relationship_types), ALL_DOMAINS, list(self.relationship_types)))
+        return {row['cascade_domain']: row for row in rows}
+
+    def _store(self, cascade_domain: str, rows: List[Dict[str, Any]], fingerprint: Dict[str, Any]) -> None:
+        """Replace the domain's cached metrics and fingerprint in one transaction."""
+        with self.db.get_cursor() as cur:
+            cur.execute("DELETE FROM kg_node_metrics WHERE cascade_domain = %s", (cascade_domain,))
+            with cur.copy("""
+                COPY kg_node_metrics (
+                    node_id, cascade_domain, in_degree, out_degree,
+                    pagerank, betweenness, is_articulation_point
+                ) FROM STDIN
+            """) as copy:
+                for row in rows:
+                    copy.write_row((
+                        row['node_id'], cascade_domain, row['in_degree'], row['out_degree'],
+                        row['pagerank'], row['betweenness'], row['is_articulation_point'],
+                    ))
+            cur.execute("""
+                INSERT INTO kg_metrics_state (cascade_domain, edge_count, edges_updated_at, computed_at)
+                VALUES (%s, %s, %s, NOW())
+                ON CONFLICT (cascade_domain) DO UPDATE SET
+                    edge_count = EXCLUDED.edge_count,
+                    edges_updated_at = EXCLUDED.edges_updated_at,
+                    computed_at = NOW()
+            """, (cascade_domain, fingerprint['edge_count'], fingerprint['edges_updated_at']))
+
+    def refresh_metrics(self, force: bool = False, domains: Optional[Sequence[str]] = None) -> Dict[str, int]:
+        """
+        Recompute domains whose dependency edges changed since their last run
+
+        Args:
+            force: Recompute every domain
+            domains: Restrict to these domains ('all' = every edge)
+
+        Returns:
+            Domain -> rows written, for the domains recomputed
+        """
+        fingerprints = self._fingerprints()
+        stored = {
+            row['cascade_domain']: row
+            for row in self.db.fetch_all("SELECT * FROM kg_metrics_state")
+        }
+
+        stale = []
+        for cascade_domain in sorted(set(fingerprints) | set(stored)):
+            if domains and cascade_domain not in domains:
+                continue
+            current = fingerprints.get(cascade_domain, {"edge_count": 0, "edges_updated_at": None})
+            previous = stored.get(cascade_domain)
+            if force or not previous or (
+                previous['edge_count'] != current['edge_count']
+                or previous['edges_updated_at'] != current['edges_updated_at']
+            ):
+                stale.append((cascade_domain, current, previous))
+
+        written = {}
+        if stale:
+            # The cache must include every edge the fingerprints saw
+            self.cache.refresh()
+        for cascade_domain, current, previous in stale:
+
+            previous_pagerank = None
+            if previous:
+                previous_pagerank = {
+                    str(row['node_id']): row['pagerank']
+                    for row in self.db.fetch_all(
+                        "SELECT node_id, pagerank FROM kg_node_metrics WHERE cascade_domain = %s",
+                        (cascade_domain,)
+                    )
+                }
+            rows = self.compute(cascade_domain, previous_pagerank)
+            self._store(cascade_domain, rows, current)
+            written[cascade_domain] = len(rows)
+        return written
+
+    def top_nodes(
+        self,
+        cascade_domain: str = ALL_DOMAINS,
+        metric: str = 'pagerank',
+        limit: int = 20
+    ) -> List[Dict[str, Any]]:
+        """Cached nodes ranked by a metric, with names."""
+        if metric not in ('pagerank', 'betweenness', 'in_degree', 'out_degree'):
+            raise ValueError(f"Unknown metric: {metric}")
+        return self.db.fetch_all(f"""
+            SELECT m.*, n.name, n.node_type
+            FROM kg_node_metrics m
+            JOIN kg_nodes n ON n.id = m.node_id
+            WHERE m.cascade_domain = %s
+            ORDER BY m.{metric} DESC
+            LIMIT %s
+        """, (cascade_domain, limit))
+
+
+# Process-wide metrics instance
+_metrics: Optional[GraphMetrics] = None
+
+
+def get_graph_metrics() -> GraphMetrics:
+    """Get or create the process-wide graph metrics helper."""
+    global _metrics
+    if _metrics is None:
+        _metrics = GraphMetrics()
+    return _metrics
@@ -0,0 +1,443 @@
+#!/usr/bin/env python3
+"""
+GraphSAGE for PROVES Library
+CPU minibatch GraphSAGE (mean aggregator) for coupling link prediction
+
+Pure NumPy so it runs anywhere the graph cache runs:
+
+- NeighborSampler: uniform neighbor sampling (with replacement) over a CSR
+  adjacency, one vectorized draw per layer for the whole minibatch
+- GraphSAGE: L mean-aggregator layers, h' = relu(h W_self + mean(h_nbr) W_neigh + b),
+  trained with a dot-product logistic link loss and Adam; backprop is
+  written out by hand
+- train_link_prediction(): held-out edge split, negative sampling, AUC
+
+Sampling is fixed-fanout, so a minibatch costs B * prod(fanouts) feature rows
+regardless of graph size or degree skew.
+"""
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+DEFAULT_FANOUTS = (10, 5)
+DEFAULT_HIDDEN = 64
+DEFAULT_DIM = 32
+
+
+# ============================================
+# Graph / features
+# ============================================
+
+def build_csr(num_nodes: int, src: np.ndarray, dst: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """CSR (indptr, indices) with rows = src."""
+    order = np.argsort(src, kind='stable')
+    indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=num_nodes), out=indptr[1:])
+    return indptr, dst[order].astype(np.int64)
+
+
+def undirected_pairs(src: np.ndarray, dst: np.ndarray) -> np.ndarray:
+    """Unique (a, b) pairs with a < b (self-loops dropped)."""
+    pairs = np.stack([np.minimum(src, dst), np.maximum(src, dst)], axis=1).astype(np.int64)
+    pairs = pairs[pairs[:, 0] != pairs[:, 1]]
+    return np.unique(pairs, axis=0)
+
+
+def degree_features(num_nodes: int, pairs: np.ndarray, pair_counts: np.ndarray) -> np.ndarray:
+    """log1p of the relationship counts [total, per domain...] summed over each node's pairs."""
+    degree = np.zeros((num_nodes, pair_counts.shape[1]), dtype=np.float64)
+    np.add.at(degree, pairs[:, 0], pair_counts)
+    np.add.at(degree, pairs[:, 1], pair_counts)
+    return np.log1p(degree).astype(np.float32)
+
+
+def graph_from_cache(
+    cache,
+    vocab: Optional[Dict[str, List[str]]] = None
+) -> Tuple[np.ndarray, np.ndarray, Dict[str, List[str]], np.ndarray]:
+    """
+    Node features and coupling pairs from the graph cache
+
+    Features: node_type one-hot, then log1p total degree and log1p degree
+    per cascade_domain (the last pair_counts.shape[1] columns, recomputed
+    from the training pairs by train_link_prediction()). Pass the vocab
+    stored with a trained model so the feature layout matches it.
+
+    Returns:
+        (features [N, F] float32, undirected pairs [E, 2], vocab,
+         pair_counts [E, 1 + domains]: relationships per pair, total and per domain)
+    """
+    cache.ensure_fresh()
+    n = cache.num_nodes
+    node_types = [cache.node_type(i) for i in range(n)]
+    if vocab is None:
+        vocab = {
+            "node_types": sorted(set(node_types)),
+            "cascade_domains": sorted(cache.cascade_domains),
+        }
+
+    type_index = {t: i for i, t in enumerate(vocab["node_types"])}
+    domains = vocab["cascade_domains"]
+    features = np.zeros((n, len(type_index) + 1 + len(domains)), dtype=np.float32)
+    for i, t in enumerate(node_types):
+        if t in type_index:
+            features[i, type_index[t]] = 1.0
+
+    src, dst = cache.src.astype(np.int64), cache.dst.astype(np.int64)
+    keep = src != dst
+    pairs, inverse = np.unique(
+        np.stack([np.minimum(src, dst), np.maximum(src, dst)], axis=1)[keep],
+        axis=0, return_inverse=True
+    )
+    inverse = inverse.reshape(-1)
+    pair_counts = np.zeros((len(pairs), 1 + len(domains)), dtype=np.float32)
+    np.add.at(pair_counts[:, 0], inverse, 1.0)
+    edge_domains = cache.domain[keep]
+    for k, domain in enumerate(domains):
+        code = cache.domain_code(domain)
+        if code is not None:
+            np.add.at(pair_counts[:, 1 + k], inverse[edge_domains == code], 1.0)
+
+    features[:, len(type_index):] = degree_features(n, pairs, pair_counts)
+    return features, pairs.astype(np.int64), vocab, pair_counts
+
+
+# ============================================
+# Sampling
+# ============================================
+
+class NeighborSampler:
+    """Uniform fixed-fanout neighbor sampler over a CSR adjacency"""
+
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, seed: Optional[int] = None):
+        self.indptr = indptr
+        self.indices = indices
+        self.degree = np.diff(indptr)
+        self.rng = np.random.default_rng(seed)
+
+    def sample(self, nodes: np.ndarray, fanout: int) -> np.ndarray:
+        """
+        fanout neighbors per node, drawn with replacement
+
+        Isolated nodes get themselves, so the mean aggregator falls back to
+        the node's own features.
+
+        Returns:
+            [len(nodes), fanout] node ids
+        """
+        degree = self.degree[nodes]
+        offsets = (self.rng.random((len(nodes), fanout)) * degree[:, None]).astype(np.int64)
+        positions = self.indptr[nodes][:, None] + offsets
+        if not len(self.indices):
+            return np.repeat(nodes[:, None], fanout, axis=1)
+        sampled = self.indices[np.minimum(positions, len(self.indices) - 1)]
+        return np.where(degree[:, None] > 0, sampled, nodes[:, None])
+
+    def sample_layers(self, seeds: np.ndarray, fanouts: Sequence[int]) -> List[np.ndarray]:
+        """Node sets per hop: [seeds, their fanouts[0] samples, ...] (flattened)."""
+        layers = [seeds]
+        for fanout in fanouts:
+            layers.append(self.sample(layers[-1], fanout).reshape(-1))
+        return layers
+
+
+# ============================================
+# Model
+# ============================================
+
+class GraphSAGE:
+    """Mean-aggregator GraphSAGE with manual backprop and Adam"""
+
+    def __init__(
+        self,
+        in_dim: int,
+        hidden_dim: int = DEFAULT_HIDDEN,
+        out_dim: int = DEFAULT_DIM,
+        fanouts: Sequence[int] = DEFAULT_FANOUTS,
+        seed: Optional[int] = None
+    ):
+        self.fanouts = tuple(int(f) for f in fanouts)
+        dims = [in_dim] + [hidden_dim] * (len(self.fanouts) - 1) + [out_dim]
+        rng = np.random.default_rng(seed)
+        self.params: Dict[str, np.ndarray] = {}
+        for l in range(len(self.fanouts)):
+            scale = np.sqrt(2.0 / (2 * dims[l]))
+            self.params[f"W_self{l}"] = (rng.standard_normal((dims[l], dims[l + 1])) * scale).astype(np.float32)
+            self.params[f"W_neigh{l}"] = (rng.standard_normal((dims[l], dims[l + 1])) * scale).astype(np.float32)
+            self.params[f"b{l}"] = np.zeros(dims[l + 1], dtype=np.float32)
+        self._adam: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._step = 0
+
+    @property
+    def num_layers(self) -> int:
+        return len(self.fanouts)
+
+    def forward(self, features: np.ndarray, layers: List[np.ndarray]) -> Tuple[np.ndarray, list]:
+        """
+        Embeddings of layers[0] from sampled hop sets
+
+        Returns:
+            (embeddings [len(seeds), out_dim], cache for backward())
+        """
+        h = [features[nodes] for nodes in layers]
+        saved = []
+        for l in range(self.num_layers):
+            W_self, W_neigh, b = self.params[f"W_self{l}"], self.params[f"W_neigh{l}"], self.params[f"b{l}"]
+            last = l == self.num_layers - 1
+            next_h = []
+            step = []
+            for d in range(self.num_layers - l):
+                fanout = self.fanouts[d]
+                mean = h[d + 1].reshape(len(h[d]), fanout, -1).mean(axis=1)
+                z = h[d] @ W_self + mean @ W_neigh + b
+                next_h.append(z if last else np.maximum(z, 0))
+                step.append((h[d], mean, z))
+            saved.append(step)
+            h = next_h
+        return h[0], saved
+
+    def backward(self, grad_out: np.ndarray, saved: list) -> Dict[str, np.ndarray]:
+        """Parameter gradients given dLoss/dEmbeddings."""
+        grads = {name: np.zeros_like(value) for name, value in self.params.items()}
+        grad_h = [grad_out]
+        for l in reversed(range(self.num_layers)):
+            W_self, W_neigh = self.params[f"W_self{l}"], self.params[f"W_neigh{l}"]
+            last = l == self.num_layers - 1
+            prev = [None] * (len(saved[l]) + 1)
+            for d, (h_self, mean, z) in enumerate(saved[l]):
+                dz = grad_h[d] if last else grad_h[d] * (z > 0)
+                grads[f"W_self{l}"] += h_self.T @ dz
+                grads[f"W_neigh{l}"] += mean.T @ dz
+                grads[f"b{l}"] += dz.sum(axis=0)
+                if l == 0:
+                    continue
+                d_self = dz @ W_self.T
+                d_mean = dz @ W_neigh.T
+                fanout = self.fanouts[d]
+                d_nbr = np.repeat(d_mean / fanout, fanout, axis=0)
+                prev[d] = d_self if prev[d] is None else prev[d] + d_self
+                prev[d + 1] = d_nbr if prev[d + 1] is None else prev[d + 1] + d_nbr
+            grad_h = prev
+        return grads
+
+    def apply_gradients(
+        self,
+        grads: Dict[str, np.ndarray],
+        lr: float = 0.01,
+        weight_decay: float = 1e-5,
+        betas: Tuple[float, float] = (0.9, 0.999),
+        eps: float = 1e-8
+    ) -> None:
+        """One Adam step."""
+        self._step += 1
+        b1, b2 = betas
+        for name, grad in grads.items():
+            if weight_decay and not name.startswith('b'):
+                grad = grad + weight_decay * self.params[name]
+            m, v = self._adam.get(name, (np.zeros_like(grad), np.zeros_like(grad)))
+            m = b1 * m + (1 - b1) * grad
+            v = b2 * v + (1 - b2) * grad * grad
+            self._adam[name] = (m, v)
+            m_hat = m / (1 - b1 ** self._step)
+            v_hat = v / (1 - b2 ** self._step)
+            self.params[name] -= (lr * m_hat / (np.sqrt(v_hat) + eps)).astype(np.float32)
+
+    def embed(
+        self,
+        features: np.ndarray,
+        sampler: NeighborSampler,
+        nodes: Optional[np.ndarray] = None,
+        batch_size: int = 2048
+    ) -> np.ndarray:
+        """Embeddings for nodes (default: all), in minibatches."""
+        if nodes is None:
+            nodes = np.arange(len(features))
+        out = []
+        for start in range(0, len(nodes), batch_size):
+            batch = nodes[start:start + batch_size]
+            embeddings, _ = self.forward(features, sampler.sample_layers(batch, self.fanouts))
+            out.append(embeddings)
+        return np.concatenate(out) if out else np.zeros((0, self.params[f"b{self.num_layers - 1}"].shape[0]), dtype=np.float32)
+
+    def save(self, path, metadata: Optional[Dict[str, Any]] = None) -> None:
+        """Weights, fanouts and metadata (e.g. the feature vocab) to an .npz file."""
+        import json
+        np.savez(
+            path,
+            fanouts=np.array(self.fanouts),
+            metadata=np.array(json.dumps(metadata or {})),
+            **self.params
+        )
+
+    @classmethod
+    def load(cls, path) -> Tuple['GraphSAGE', Dict[str, Any]]:
+        """Model and metadata saved by save()."""
+        import json
+        data = np.load(path)
+        fanouts = tuple(int(f) for f in data['fanouts'])
+        model = cls(
+            in_dim=data['W_self0'].shape[0],
+            hidden_dim=data['W_self0'].shape[1],
+            out_dim=data[f'b{len(fanouts) - 1}'].shape[0],
+            fanouts=fanouts
+        )
+        for name in model.params:
+            model.params[name] = data[name].astype(np.float32)
+        return model, json.loads(str(data['metadata']))
+
+
+# ============================================
+# Training
+# ============================================
+
+def _sigmoid(x: np.ndarray) -> np.ndarray:
+    return 0.5 * (1.0 + np.tanh(0.5 * x))
+
+
+def auc(pos: np.ndarray, neg: np.ndarray) -> float:
+    """ROC AUC of positive vs negative scores (rank formula)."""
+    scores = np.concatenate([pos, neg])
+    ranks = np.empty(len(scores))
+    ranks[np.argsort(scores, kind='stable')] = np.arange(1, len(scores) + 1)
+    return float((ranks[:len(pos)].sum() - len(pos) * (len(pos) + 1) / 2) / (len(pos) * len(neg)))
+
+
+def train_link_prediction(
+    features: np.ndarray,
+    pairs: np.ndarray,
+    pair_counts: Optional[np.ndarray] = None,
+    fanouts: Sequence[int] = DEFAULT_FANOUTS,
+    hidden_dim: int = DEFAULT_HIDDEN,
+    out_dim: int = DEFAULT_DIM,
+    epochs: int = 5,
+    batch_size: int = 512,
+    lr: float = 0.01,
+    val_fraction: float = 0.1,
+    seed: int = 0,
+    log=print
+) -> Tuple[GraphSAGE, NeighborSampler, Dict[str, float]]:
+    """
+    Train GraphSAGE to score node pairs as couplings
+
+    Held-out pairs are removed from the message-passing graph and, given
+    pair_counts, from the degree features, so validation AUC measures
+    hidden-coupling recovery, not memorization.
+
+    Args:
+        features: [N, F] node features
+        pairs: [E, 2] undirected coupling pairs
+        pair_counts: Per-pair relationship counts from graph_from_cache(); the
+                     last pair_counts.shape[1] feature columns are rebuilt
+                     from the training pairs only
+        val_fraction: Share of pairs held out for validation
+
+    Returns:
+        (model, sampler over the full graph for inference, metrics)
+    """
+    rng = np.random.default_rng(seed)
+    n = len(features)
+    full_pairs = pairs
+    order = rng.permutation(len(pairs))
+    pairs = pairs[order]
+    n_val = int(len(pairs) * val_fraction) if len(pairs) >= 20 else 0
+    val, train = pairs[:n_val], pairs[n_val:]
+    if pair_counts is not None and n_val:
+        # Held-out endpoints must not see their true degree
+        features = features.copy()
+        features[:, -pair_counts.shape[1]:] = degree_features(n, train, pair_counts[order][n_val:])
+
+    def sampler_for(p: np.ndarray) -> NeighborSampler:
+        src = np.concatenate([p[:, 0], p[:, 1]])
+        dst = np.concatenate([p[:, 1], p[:, 0]])
+        return NeighborSampler(*build_csr(n, src, dst), seed=seed)
+
+    train_sampler = sampler_for(train)
+    model = GraphSAGE(features.shape[1], hidden_dim, out_dim, fanouts, seed=seed)
+    metrics: Dict[str, float] = {}
+
+    for epoch in range(epochs):
+        order = rng.permutation(len(train))
+        losses = []
+        for start in range(0, len(order), batch_size):
+            batch = train[order[start:start + batch_size]]
+            b = len(batch)
+            u, v = batch[:, 0], batch[:, 1]
+            negatives = rng.integers(0, n, size=b)
+
+            seeds = np.concatenate([u, v, negatives])
+            emb, saved = model.forward(features, train_sampler.sample_layers(seeds, model.fanouts))
+            e_u, e_v, e_n = emb[:b], emb[b:2 * b], emb[2 * b:]
+            pos = (e_u * e_v).sum(axis=1)
+            neg = (e_u * e_n).sum(axis=1)
+            losses.append(float(np.logaddexp(0, -pos).mean() + np.logaddexp(0, neg).mean()))
+
+            d_pos = (-_sigmoid(-pos) / b)[:, None]
+            d_neg = (_sigmoid(neg) / b)[:, None]
+            grad = np.concatenate([d_pos * e_v + d_neg * e_n, d_pos * e_u, d_neg * e_u])
+            model.apply_gradients(model.backward(grad.astype(np.float32), saved), lr=lr)
+
+        metrics["loss"] = float(np.mean(losses)) if losses else 0.0
+        if len(val):
+            emb = model.embed(features, train_sampler)
+            pos = (emb[val[:, 0]] * emb[val[:, 1]]).sum(axis=1)
+            neg_pairs = rng.integers(0, n, size=(len(val), 2))
+            neg = (emb[neg_pairs[:, 0]] * emb[neg_pairs[:, 1]]).sum(axis=1)
+            metrics["val_auc"] = auc(pos, neg)
+        log(f"  epoch {epoch + 1}/{epochs}  loss {metrics['loss']:.4f}" +
+            (f"  val AUC {metrics['val_auc']:.3f}" if "val_auc" in metrics else ""))
+
+    return model, sampler_for(full_pairs), metrics
+
+
+def score_candidates(
+    embeddings: np.ndarray,
+    known_pairs: np.ndarray,
+    top_k: int = 5,
+    min_score: float = 0.9,
+    batch_size: int = 1024
+) -> List[Tuple[int, int, float]]:
+    """
+    Highest-scoring unlinked pairs
+
+    Args:
+        embeddings: [N, D] node embeddings
+        known_pairs: [E, 2] pairs that already have a relationship
+        top_k: Candidates kept per node
+        min_score: Minimum sigmoid(dot) score
+
+    Returns:
+        (a, b, score) with a < b, best first
+    """
+    n = len(embeddings)
+    # Known neighbors are masked before selection: a trained model scores
+    # them highest, so filtering afterwards would leave hubs no candidates
+    known_ptr, known_nbrs = build_csr(
+        n,
+        np.concatenate([known_pairs[:, 0], known_pairs[:, 1]]),
+        np.concatenate([known_pairs[:, 1], known_pairs[:, 0]])
+    )
+    k = min(top_k, n)
+    found: Dict[Tuple[int, int], float] = {}
+    for start in range(0, n, batch_size):
+        rows = np.arange(start, min(start + batch_size, n))
+        scores = embeddings[rows] @ embeddings.T
+        scores[np.arange(len(rows)), rows] = -np.inf
+        counts = known_ptr[rows + 1] - known_ptr[rows]
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        scores[np.repeat(np.arange(len(rows)), counts), known_nbrs[np.repeat(known_ptr[rows], counts) + offsets]] = -np.inf
+        if k < n:
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            top = np.broadcast_to(np.arange(n), (len(rows), n))
+        for r, row in enumerate(rows.tolist()):
+            kept = 0
+            for col in top[r][np.argsort(-scores[r, top[r]])].tolist():
+                if scores[r, col] == -np.inf:
+                    break
+                pair = (min(row, col), max(row, col))
+                score = float(_sigmoid(scores[r, col]))
+                if score < min_score or kept >= top_k:
+                    break
+                found[pair] = max(found.get(pair, 0.0), score)
+                kept += 1
+    return sorted(((a, b, s) for (a, b), s in found.items()), key=lambda c: -c[2])
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+HTML-to-text conversion for PROVES Library snapshots
+Shared stripped-text view with a text offset -> raw byte offset map
+
+The extractor shows the LLM stripped text (drop <script>/<style> blocks,
+replace tags with a space, collapse whitespace), so evidence quotes are
+taken from that text. TextView produces exactly that text and can map any
+span of it back to its UTF-8 byte range in the raw snapshot payload.
+
+Views are cached per snapshot (keyed by content_hash), so verifying many
+quotes against one page converts the page once. The text is also persisted
+in the snapshot_text table, tagged with NORMALIZER_VERSION.
+"""
+import re
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+_SCRIPT = re.compile(r'<script[^>]*>.*?</script>', re.DOTALL)
+_STYLE = re.compile(r'<style[^>]*>.*?</style>', re.DOTALL)
+_TAG = re.compile(r'<[^>]+>')
+_WHITESPACE = re.compile(r'\s+')
+
+# One-pass tokenizer for the offset map: dropped blocks, tags, whitespace runs
+_MARKUP = re.compile(
+    r'(?P<drop><script[^>]*>.*?</script>|<style[^>]*>.*?</style>)|<[^>]+>|\s+',
+    re.DOTALL
+)
+
+# Number of converted snapshots kept per process
+_CACHE_SIZE = 32
+
+# Bump whenever strip_html() or normalize_text() output changes, so stored
+# snapshot_text rows from the old conversion are recomputed
+NORMALIZER_VERSION = 1
+
+
+def strip_html(content: str) -> str:
+    """
+    Strip HTML to whitespace-collapsed text
+
+    This is the conversion used by fetch_webpage; evidence quotes are
+    verified against the same output.
+    """
+    text = _SCRIPT.sub('', content)
+    text = _STYLE.sub('', text)
+    text = _TAG.sub(' ', text)
+    return _WHITESPACE.sub(' ', text).strip()
+
+
+def normalize_text(text: str) -> str:
+    """
+    STRICT formatting-only normalization (line endings, whitespace runs)
+
+    strip_html() output is already normalized; this is applied to evidence
+    quotes before the fallback match.
+    """
+    text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return _WHITESPACE.sub(' ', text).strip()
+
+
+def _build_offset_map(content: str) -> Tuple[str, array, array]:
+    """
+    Tokenize content once and record where each text segment came from
+
+    Returns:
+        (text, seg_text, seg_raw) where text segment k starts at text offset
+        seg_text[k] and raw character offset seg_raw[k]. Collapsed spaces are
+        one-character segments pointing at the start of the markup or
+        whitespace run they replace.
+    """
+    out = []
+    seg_text = array('I')
+    seg_raw = array('I')
+    text_len = 0
+    pos = 0
+    pending = -1  # raw offset of a collapsed space not yet emitted
+
+    for match in _MARKUP.finditer(content):
+        start = match.start()
+        if start > pos:
+            if pending != -1 and text_len:
+                out.append(' ')
+                seg_text.append(text_len)
+                seg_raw.append(pending)
+                text_len += 1
+            seg_text.append(text_len)
+            seg_raw.append(pos)
+            out.append(content[pos:start])
+            text_len += start - pos
+            pending = -1
+        if pending == -1 and match.group('drop') is None:
+            pending = start
+        pos = match.end()
+
+    if pos < len(content):
+        if pending != -1 and text_len:
+            out.append(' ')
+            seg_text.append(text_len)
+            seg_raw.append(pending)
+        seg_text.append(len(''.join(out)))
+        seg_raw.append(pos)
+        out.append(content[pos:])
+
+    return ''.join(out), seg_text, seg_raw
+
+
+class TextView:
+    """Stripped text of a snapshot plus a lazily built raw offset map"""
+
+    __slots__ = ('content', 'text', '_seg_text', '_seg_raw', '_mapped', '_is_ascii')
+
+    def __init__(self, content: str):
+        self.content = content
+        self.text = strip_html(content)
+        self._seg_text = None
+        self._seg_raw = None
+        self._mapped = False
+        self._is_ascii = content.isascii()
+
+    def _ensure_map(self) -> bool:
+        """Build the offset map on first use. False if it cannot be aligned."""
+        if not self._mapped:
+            self._mapped = True
+            mapped_text, seg_text, seg_raw = _build_offset_map(self.content)
+            # Malformed nesting (e.g. "</style>" inside a script block) can make
+            # the one-pass tokenizer disagree with strip_html; no map then.
+            if mapped_text == self.text:
+                self._seg_text = seg_text
+                self._seg_raw = seg_raw
+        return self._seg_text is not None
+
+    def _raw_char(self, text_offset: int) -> int:
+        """Raw character offset for a character offset in the text."""
+        k = bisect_right(self._seg_text, text_offset) - 1
+        return self._seg_raw[k] + (text_offset - self._seg_text[k])
+
+    def _to_bytes(self, char_offset: int) -> int:
+        """Raw character offset -> UTF-8 byte offset."""
+        if self._is_ascii:
+            return char_offset
+        return len(self.content[:char_offset].encode('utf-8'))
+
+    def raw_span(self, start: int, end: int) -> Optional[Tuple[int, int]]:
+        """
+        Raw UTF-8 byte range [raw_start, raw_end) covering text[start:end]
+
+        Args:
+            start: Start character offset in the text
+            end: End character offset (exclusive)
+
+        Returns:
+            (raw_start, raw_end), or None if the span is empty/out of range
+            or the snapshot could not be mapped
+        """
+        if start < 0 or end > len(self.text) or start >= end:
+            return None
+        if not self._ensure_map():
+            return None
+        raw_start = self._raw_char(start)
+        raw_end = self._raw_char(end - 1) + 1
+        return self._to_bytes(raw_start), self._to_bytes(raw_end)
+
+    def find(self, needle: str) -> Optional[Tuple[int, int]]:
+        """Find needle in the text and return its raw byte range."""
+        if not needle:
+            return None
+        pos = self.text.find(needle)
+        if pos == -1:
+            return None
+        return self.raw_span(pos, pos + len(needle))
+
+
+_cache: 'OrderedDict[str, TextView]' = OrderedDict()
+
+
+def get_text_view(content: str, cache_key: Optional[str] = None) -> TextView:
+    """
+    Get the stripped-text view for a snapshot, cached per snapshot
+
+    Args:
+        content: Raw snapshot content
+        cache_key: Snapshot content_hash (or id); no caching if None
+
+    Returns:
+        TextView for the content
+    """
+    if cache_key is None:
+        return TextView(content)
+
+    view = _cache.get(cache_key)
+    if view is not None:
+        _cache.move_to_end(cache_key)
+        return view
+
+    view = TextView(content)
+    _cache[cache_key] = view
+    if len(_cache) > _CACHE_SIZE:
+        _cache.popitem(last=False)
+    return view
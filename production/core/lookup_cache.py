@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Lookup Cache for PROVES Library
+Per-process cache of pipeline run ids and source_url -> latest snapshot
+
+Every store call used to look up (or create) the active pipeline run and
+every candidate of a page looked up the same latest snapshot by URL. Both
+answers rarely change within a process:
+
+- pipeline run ids are cached per run_name until explicitly invalidated
+- url -> latest snapshot id is cached for a short TTL, and updated in place
+  when this process captures a new snapshot
+
+Lookups take the caller's connection, so they run in the caller's
+transaction like the queries they replace.
+"""
+import threading
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+# Seconds a url -> snapshot answer is trusted (another process may capture
+# a newer snapshot of the same page)
+SNAPSHOT_TTL = 60.0
+
+
+class LookupCache:
+    """Process-local run id and latest-snapshot cache with explicit invalidation"""
+
+    def __init__(self, snapshot_ttl: float = SNAPSHOT_TTL):
+        self.snapshot_ttl = snapshot_ttl
+        self._lock = threading.Lock()
+        # run_name -> pipeline_runs.id
+        self._runs: Dict[str, str] = {}
+        # source_url -> (raw_snapshots.id, monotonic time cached)
+        self._snapshots: Dict[str, Tuple[str, float]] = {}
+
+    # ------------------------------------------------------------------
+    # Pipeline runs
+    # ------------------------------------------------------------------
+
+    def pipeline_run(self, conn, run_name: str, triggered_by: str) -> str:
+        """
+        Active (score_status = 'pending') pipeline run for run_name, created if missing
+
+        Only runs found by SELECT are cached: a run created here belongs to
+        the caller's open transaction and would be a dangling id if that
+        transaction rolled back. The next call finds it committed.
+        """
+        with self._lock:
+            run_id = self._runs.get(run_name)
+        if run_id:
+            return run_id
+
+        with conn.cursor() as cur:
+            cur.execute("""
+                SELECT id FROM pipeline_runs
+                WHERE run_name = %s AND score_status = 'pending'
+                ORDER BY created_at DESC LIMIT 1
+            """, (run_name,))
+            existing = cur.fetchone()
+            if existing:
+                run_id = str(existing[0])
+                with self._lock:
+                    self._runs[run_name] = run_id
+                return run_id
+
+            cur.execute("""
+                INSERT INTO pipeline_runs (run_name, run_type, triggered_by)
+                VALUES (%s, 'extraction', %s)
+                RETURNING id
+            """, (run_name, triggered_by))
+            return str(cur.fetchone()[0])
+
+    def invalidate_pipeline_run(self, run_name: Optional[str] = None) -> None:
+        """Forget the cached run for run_name (all runs if None), e.g. after scoring it."""
+        with self._lock:
+            if run_name is None:
+                self._runs.clear()
+            else:
+                self._runs.pop(run_name, None)
+
+    # ------------------------------------------------------------------
+    # Latest snapshot per source URL
+    # ------------------------------------------------------------------
+
+    def latest_snapshots(self, conn, source_urls: Iterable[str]) -> Dict[str, str]:
+        """
+        Latest raw_snapshots id for each URL (one query for all cache misses)
+
+        Returns:
+            {source_url: snapshot_id}; URLs without a snapshot are absent
+            (and not cached, so a snapshot captured later is found)
+        """
+        now = time.monotonic()
+        found: Dict[str, str] = {}
+        missing = []
+        with self._lock:
+            for url in set(source_urls):
+                cached = self._snapshots.get(url)
+                if cached and now - cached[1] < self.snapshot_ttl:
+                    found[url] = cached[0]
+                else:
+                    missing.append(url)
+
+        if missing:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    SELECT DISTINCT ON (source_url) source_url, id::text
+                    FROM raw_snapshots
+                    WHERE source_url = ANY(%s)
+                    ORDER BY source_url, captured_at DESC
+                """, (sorted(missing),))
+                rows = cur.fetchall()
+            with self._lock:
+                for url, snapshot_id in rows:
+                    self._snapshots[url] = (snapshot_id, now)
+                    found[url] = snapshot_id
+        return found
+
+    def latest_snapshot(self, conn, source_url: str) -> Optional[str]:
+        """Latest raw_snapshots id for source_url, or None."""
+        return self.latest_snapshots(conn, [source_url]).get(source_url)
+
+    def remember_snapshot(self, source_url: str, snapshot_id: str) -> None:
+        """Record a snapshot this process just captured (call after commit)."""
+        with self._lock:
+            self._snapshots[source_url] = (str(snapshot_id), time.monotonic())
+
+    def invalidate_snapshot(self, source_url: Optional[str] = None) -> None:
+        """Forget the cached snapshot for source_url (all URLs if None)."""
+        with self._lock:
+            if source_url is None:
+                self._snapshots.clear()
+            else:
+                self._snapshots.pop(source_url, None)
+
+
+# Process-wide cache instance
+_cache: Optional[LookupCache] = None
+
+
+def get_lookup_cache() -> LookupCache:
+    """Get or create the process-wide lookup cache."""
+    global _cache
+    if _cache is None:
+        _cache = LookupCache()
+    return _cache
+
+
+def get_or_create_pipeline_run(
+    conn,
+    run_name: str = "curator_extraction",
+    triggered_by: str = "storage_agent"
+) -> str:
+    """Get or create a pipeline run for tracking (cached per process). Returns run_id."""
+    return get_lookup_cache().pipeline_run(conn, run_name, triggered_by)
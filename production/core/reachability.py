@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Reachability Index for PROVES Library
+"Does a failure of A reach B?" per cascade_domain, without re-traversing
+
+Built once per domain from the graph cache (graph_cache.py):
+
+1. Tarjan SCC condensation of the domain's edges (nodes in a cycle reach
+   each other, so they share one component)
+2. a transitive-closure bitset per component, filled in the reverse
+   topological order Tarjan emits components in:
+   reach[c] = {c} | union of reach[successor]
+
+reaches() is then one bit test. The closure is ncomp^2 bits, so a domain
+with more than MAX_CLOSURE_COMPONENTS components keeps only the
+condensation DAG and answers reaches() with a BFS over it, pruned by the
+topological numbering (a component only reaches lower-numbered ones).
+Hop distances come from one BFS per source node, memoized, so repeated
+questions from the same source are lookups.
+
+GraphManager.create_relationship() feeds new edges to add_edge(), which
+updates the closure in place (OR the target's row into every ancestor of
+the source) unless the edge closes a new cycle; that case, and any change
+pulled in by a cache refresh, rebuilds the domain on its next query.
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from graph_cache import GraphCache, get_graph_cache
+
+# Cached BFS distance arrays (per domain and source node)
+DISTANCE_MEMO_SIZE = 256
+# Largest component count that gets a closure bitset (8192^2 bits = 8 MB)
+MAX_CLOSURE_COMPONENTS = 8192
+
+
+def strongly_connected_components(n: int, indptr: np.ndarray, targets: np.ndarray) -> Tuple[np.ndarray, int]:
+    """
+    Iterative Tarjan SCC over a CSR adjacency, O(V + E)
+
+    Only nodes with outgoing edges (and what they reach) are visited.
+    Components are numbered in reverse topological order: successors of a
+    component always have smaller numbers.
+
+    Returns:
+        (component per node, -1 for unvisited nodes; number of components)
+    """
+    targets = targets.tolist()
+    ptr = indptr.tolist()
+    index = [-1] * n
+    low = [0] * n
+    on_stack = [False] * n
+    stack = []
+    comp = np.full(n, -1, dtype=np.int32)
+    counter = 0
+    ncomp = 0
+    for root in np.flatnonzero(np.diff(indptr)).tolist():
+        if index[root] != -1:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        work = [[root, ptr[root]]]
+        while work:
+            frame = work[-1]
+            v, i = frame
+            if i < ptr[v + 1]:
+                frame[1] += 1
+                w = targets[i]
+                if index[w] == -1:
+                    index[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack[w] = True
+                    work.append([w, ptr[w]])
+                elif on_stack[w]:
+                    low[v] = min(low[v], index[w])
+                continue
+            work.pop()
+            if work:
+                u = work[-1][0]
+                low[u] = min(low[u], low[v])
+            if low[v] == index[v]:
+                while True:
+                    x = stack.pop()
+                    on_stack[x] = False
+                    comp[x] = ncomp
+                    if x == v:
+                        break
+                ncomp += 1
+    return comp, ncomp
+
+
+class _DomainIndex:
+    """Condensation + closure bitsets for one cascade_domain"""
+
+    def __init__(self, cache: GraphCache, cascade_domain: str):
+        self.cache = cache
+        self.cascade_domain = cascade_domain
+        self.version = cache.version
+        # Node position -> component (-1 = no edges in this domain)
+        self.comp = np.full(cache.num_nodes, -1, dtype=np.int32)
+        self.num_components = 0
+        # Row c, bit k: component c reaches component k (np.packbits layout);
+        # None above MAX_CLOSURE_COMPONENTS
+        self.bits: Optional[np.ndarray] = np.zeros((0, 0), dtype=np.uint8)
+        # Condensation DAG (CSR) plus edges added since the build
+        self.succ_indptr = np.zeros(1, dtype=np.int64)
+        self.succ = np.empty(0, dtype=np.int32)
+        self.extra_succ: Dict[int, List[int]] = {}
+        # False once an added edge breaks "successors have smaller numbers"
+        self.topological = True
+        self.stale = False
+        self._build()
+
+    def _build(self) -> None:
+        indptr, edges = self.cache.adjacency('outgoing', self.cascade_domain)
+        self.comp, ncomp = strongly_connected_components(self.cache.num_nodes, indptr, self.cache.dst[edges])
+        comp = self.comp
+
+        self.num_components = ncomp
+        ids = np.arange(ncomp)
+
+        # Condensation edges; Tarjan numbers successors before predecessors
+        src_comp = comp[self.cache.src[edges]]
+        dst_comp = comp[self.cache.dst[edges]]
+        cross = src_comp != dst_comp
+        links = np.unique(np.stack([src_comp[cross], dst_comp[cross]], axis=1), axis=0)
+        src_comp, dst_comp = links[:, 0], links[:, 1]
+        self.succ_indptr = np.searchsorted(src_comp, np.arange(ncomp + 1), side='left')
+        self.succ = dst_comp.astype(np.int32)
+
+        if ncomp > MAX_CLOSURE_COMPONENTS:
+            self.bits = None
+            return
+        self.bits = np.zeros((ncomp, (ncomp + 7) // 8), dtype=np.uint8)
+        self.bits[ids, ids >> 3] = 0x80 >> (ids & 7)
+        bounds = self.succ_indptr.tolist()
+        for c in range(ncomp):
+            succ = self.succ[bounds[c]:bounds[c + 1]]
+            if len(succ):
+                self.bits[c] |= np.bitwise_or.reduce(self.bits[succ], axis=0)
+
+    def _bit(self, a: int, b: int) -> bool:
+        if self.bits is None:
+            return self._search(a, b)
+        return bool(self.bits[a, b >> 3] & (0x80 >> (b & 7)))
+
+    def _search(self, a: int, b: int) -> bool:
+        """Component a reaches component b: BFS over the condensation DAG."""
+        if a == b:
+            return True
+        if self.topological and b > a:
+            return False
+        ptr = self.succ_indptr
+        built = len(ptr) - 1
+        seen = {a}
+        frontier = [a]
+        while frontier:
+            found = []
+            for c in frontier:
+                if c < built:
+                    found.extend(self.succ[ptr[c]:ptr[c + 1]].tolist())
+                found.extend(self.extra_succ.get(c, ()))
+            next_frontier = []
+            for c in found:
+                if c == b:
+                    return True
+                # Below b nothing can lead back up to it
+                if c not in seen and not (self.topological and c < b):
+                    seen.add(c)
+                    next_frontier.append(c)
+            frontier = next_frontier
+        return False
+
+    def reaches(self, s: int, t: int) -> bool:
+        if s == t:
+            return True
+        cs = self.comp[s] if s < len(self.comp) else -1
+        ct = self.comp[t] if t < len(self.comp) else -1
+        if cs < 0 or ct < 0:
+            return False
+        return self._bit(cs, ct)
+
+    def _new_component(self, node: int) -> int:
+        """Singleton component for a node that had no edges in this domain."""
+        if node >= len(self.comp):
+            self.comp = np.concatenate([self.comp, np.full(node + 1 - len(self.comp), -1, dtype=np.int32)])
+        c = self.num_components
+        if self.bits is not None and c >= MAX_CLOSURE_COMPONENTS:
+            # Grown past the bitset limit: search the condensation instead
+            self.bits = None
+        if self.bits is not None:
+            if c >= len(self.bits) or (c >> 3) >= self.bits.shape[1]:
+                capacity = min(max(8, 2 * (c + 1)), MAX_CLOSURE_COMPONENTS)
+                grown = np.zeros((capacity, (capacity + 7) // 8), dtype=np.uint8)
+                grown[:self.bits.shape[0], :self.bits.shape[1]] = self.bits
+                self.bits = grown
+            self.bits[c, c >> 3] = 0x80 >> (c & 7)
+        self.comp[node] = c
+        self.num_components += 1
+        return c
+
+    def add_edge(self, s: int, t: int) -> None:
+        """Fold a new s -> t edge into the closure (or mark stale if it closes a cycle)."""
+        cs = self.comp[s] if s < len(self.comp) else -1
+        ct = self.comp[t] if t < len(self.comp) else -1
+        cs = cs if cs >= 0 else self._new_component(s)
+        ct = ct if ct >= 0 else self._new_component(t)
+        if self._bit(cs, ct):
+            return
+        if self._bit(ct, cs):
+            # New cycle: components merge, rebuild on next query
+            self.stale = True
+            return
+        self.extra_succ.setdefault(int(cs), []).append(int(ct))
+        if ct > cs:
+            self.topological = False
+        if self.bits is None:
+            return
+        rows = self.bits[:self.num_components]
+        ancestors = np.flatnonzero(rows[:, cs >> 3] & (0x80 >> (cs & 7)))
+        rows[ancestors] |= rows[ct]
+
+
+class ReachabilityIndex:
+    """Per-domain reachability and hop distance over the graph cache"""
+
+    def __init__(self, cache: Optional[GraphCache] = None):
+        self.cache = cache or get_graph_cache()
+        self._domains: Dict[str, _DomainIndex] = {}
+        self._distances: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    def _domain(self, cascade_domain: str) -> _DomainIndex:
+        """Domain index, rebuilt if the graph changed outside add_edge()."""
+        self.cache.ensure_fresh()
+        with self._lock:
+            index = self._domains.get(cascade_domain)
+            if index is None or index.stale or index.version != self.cache.version:
+                index = _DomainIndex(self.cache, cascade_domain)
+                self._domains[cascade_domain] = index
+                self._drop_distances(cascade_domain)
+            return index
+
+    def _drop_distances(self, cascade_domain: str) -> None:
+        for key in [k for k in self._distances if k[0] == cascade_domain]:
+            del self._distances[key]
+
+    def reaches(self, source_node_id: Any, target_node_id: Any, cascade_domain: str) -> bool:
+        """
+        True if a failure of source can cascade to target within the domain
+
+        Follows relationships source -> target, like find_cascade_path().
+        """
+        index = self._domain(cascade_domain)
+        s = self.cache.node_index(source_node_id)
+        t = self.cache.node_index(target_node_id)
+        if s is None or t is None:
+            return False
+        with self._lock:
+            return index.reaches(s, t)
+
+    def hop_distance(self, source_node_id: Any, target_node_id: Any, cascade_domain: str) -> Optional[int]:
+        """
+        Fewest relationships from source to target within the domain
+
+        Returns:
+            Hop count (0 for the same node), or None if target is unreachable
+        """
+        if not self.reaches(source_node_id, target_node_id, cascade_domain):
+            return None
+        s = self.cache.node_index(source_node_id)
+        t = self.cache.node_index(target_node_id)
+        key = (cascade_domain, s)
+        with self._lock:
+            dist = self._distances.get(key)
+            if dist is not None:
+                self._distances.move_to_end(key)
+        if dist is None:
+            dist = self._bfs(s, cascade_domain)
+            with self._lock:
+                self._distances[key] = dist
+                while len(self._distances) > DISTANCE_MEMO_SIZE:
+                    self._distances.popitem(last=False)
+        return int(dist[t]) if t < len(dist) and dist[t] >= 0 else None
+
+    def _bfs(self, s: int, cascade_domain: str) -> np.ndarray:
+        """Hop distance from node s to every node (-1 = unreachable)."""
+        indptr, edges = self.cache.adjacency('outgoing', cascade_domain)
+        dist = np.full(self.cache.num_nodes, -1, dtype=np.int32)
+        dist[s] = 0
+        frontier = np.array([s], dtype=np.int32)
+        d = 0
+        while len(frontier):
+            d += 1
+            out = np.concatenate([edges[indptr[u]:indptr[u + 1]] for u in frontier.tolist()])
+            targets = np.unique(self.cache.dst[out])
+            frontier = targets[dist[targets] < 0]
+            dist[frontier] = d
+        return dist
+
+    def query(self, source_node_id: Any, target_node_id: Any, cascade_domain: str) -> Dict[str, Any]:
+        """reaches() and hop_distance() together."""
+        hops = self.hop_distance(source_node_id, target_node_id, cascade_domain)
+        return {"reachable": hops is not None, "hops": hops}
+
+    def add_edge(self, edge_position: int) -> None:
+        """
+        Apply an edge the graph cache just recorded (GraphManager write-through)
+
+        Indexes built before the edge are updated in place; indexes that had
+        already missed another change are left to rebuild.
+        """
+        with self._lock:
+            cache = self.cache
+            domain = cache.edge(edge_position)['cascade_domain']
+            for name, index in self._domains.items():
+                if index.version != cache.version - 1 or index.stale:
+                    continue
+                index.version = cache.version
+                if name == domain:
+                    index.add_edge(int(cache.src[edge_position]), int(cache.dst[edge_position]))
+                    self._drop_distances(name)
+
+
+# Process-wide index instance
+_index: Optional[ReachabilityIndex] = None
+
+
+def get_reachability_index() -> ReachabilityIndex:
+    """Get or create the process-wide reachability index."""
+    global _index
+    if _index is None:
+        _index = ReachabilityIndex()
+    return _index
@@ -889,12 +889,16 @@ class NotionSync:
             # Fetch pending extractions that haven't been synced to Notion yet
             cur.execute("""
                 SELECT
-                    extraction_id, candidate_type, candidate_key, status,
-                    confidence_score, ecosystem, evidence, created_at,
-                    lineage_verified, lineage_confidence
-                FROM staging_extractions
-                WHERE status = 'pending'
-                ORDER BY created_at DESC
+                    s.extraction_id, s.candidate_type, s.candidate_key, s.status,
+                    s.confidence_score, s.ecosystem,
+                    CASE WHEN et.raw_text IS NULL THEN s.evidence
+                         ELSE jsonb_build_object('raw_text', et.raw_text) || COALESCE(s.evidence, '{}'::jsonb)
+                    END AS evidence,
+                    s.created_at, s.lineage_verified, s.lineage_confidence
+                FROM staging_extractions s
+                LEFT JOIN evidence_texts et ON et.evidence_checksum = s.evidence_checksum
+                WHERE s.status = 'pending'
+                ORDER BY s.created_at DESC
                 LIMIT %s
             """, (limit,))
 
@@ -0,0 +1,120 @@
+"""
+Near-Duplicate Annotation - MinHash/LSH pass over staging_extractions
+
+store_extraction() annotates each new extraction right after it is stored.
+This script covers everything that path missed: extractions stored before
+migration 014, or whose annotation failed. It signs each unsigned extraction
+(oldest first), indexes its LSH bands, and records near-duplicate clusters in
+evidence.duplicate_check.
+
+Usage:
+    # One pass over all unsigned extractions
+    python production/scripts/annotate_near_duplicates.py
+
+    # Keep running, picking up new extractions as they arrive
+    python production/scripts/annotate_near_duplicates.py --continuous --interval 30
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import psycopg
+
+# Setup paths
+production_root = Path(__file__).parent.parent
+sys.path.insert(0, str(production_root))
+sys.path.insert(0, str(production_root / 'Version 3'))
+
+from curator.config import config
+from storage_v3 import annotate_near_duplicates
+
+
+def annotate_pending(conn, batch_size: int = 200) -> dict:
+    """
+    Sign and annotate every extraction without a MinHash signature.
+
+    Returns:
+        Counts: processed, with_near_duplicates, failed
+    """
+    stats = {"processed": 0, "with_near_duplicates": 0, "failed": 0}
+    failed_ids = set()
+
+    while True:
+        with conn.cursor() as cur:
+            cur.execute("""
+                SELECT extraction_id::text FROM staging_extractions
+                WHERE minhash_signature IS NULL
+                  AND NOT (extraction_id::text = ANY(%s))
+                ORDER BY created_at ASC
+                LIMIT %s
+            """, (list(failed_ids), batch_size))
+            batch = [row[0] for row in cur.fetchall()]
+
+        if not batch:
+            return stats
+
+        for extraction_id in batch:
+            try:
+                near = annotate_near_duplicates(conn, extraction_id)
+                stats["processed"] += 1
+                if near:
+                    stats["with_near_duplicates"] += 1
+                    keys = ', '.join(n['candidate_key'] for n in near)
+                    print(f"  {extraction_id}: {len(near)} near-duplicate(s) - {keys}")
+            except Exception as e:
+                conn.rollback()
+                failed_ids.add(extraction_id)
+                stats["failed"] += 1
+                print(f"  [ERROR] {extraction_id}: {e}")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Annotate near-duplicate staging_extractions using MinHash/LSH"
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=200,
+        help="Extractions fetched per query (default: 200)"
+    )
+    parser.add_argument(
+        "--continuous",
+        action="store_true",
+        help="Keep polling for new unsigned extractions"
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=30.0,
+        help="Seconds between polls in --continuous mode (default: 30)"
+    )
+
+    args = parser.parse_args()
+
+    print(f"\n{'='*80}")
+    print("NEAR-DUPLICATE ANNOTATION (MinHash/LSH)")
+    print(f"{'='*80}")
+
+    conn = psycopg.connect(config.NEON_DATABASE_URL)
+    try:
+        while True:
+            stats = annotate_pending(conn, args.batch_size)
+            print(f"\nProcessed: {stats['processed']}")
+            print(f"  With near-duplicates: {stats['with_near_duplicates']}")
+            print(f"  Failed: {stats['failed']}")
+
+            if not args.continuous:
+                break
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        print("\nStopped.")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Graph Metrics - Recompute cached centrality for coupling-hub review
+
+Refreshes kg_node_metrics (core/graph_metrics.py): PageRank, in/out degree,
+betweenness and articulation points over depends_on / requires edges, per
+cascade_domain and for all edges together. Domains whose edges have not
+changed since the last run are skipped unless --force is given.
+
+Usage:
+    python production/scripts/compute_graph_metrics.py
+    python production/scripts/compute_graph_metrics.py --force --domains power all
+    python production/scripts/compute_graph_metrics.py --top 20 --metric betweenness
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Setup paths
+production_root = Path(__file__).parent.parent
+sys.path.insert(0, str(production_root / 'core'))
+
+from graph_metrics import ALL_DOMAINS, get_graph_metrics
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Recompute cached graph centrality metrics (kg_node_metrics)"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Recompute every domain, changed or not"
+    )
+    parser.add_argument(
+        "--domains",
+        nargs="+",
+        help=f"Only these cascade domains ('{ALL_DOMAINS}' = every edge)"
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=10,
+        help="Print this many top nodes per recomputed domain (default: 10)"
+    )
+    parser.add_argument(
+        "--metric",
+        choices=["pagerank", "betweenness", "in_degree", "out_degree"],
+        default="pagerank",
+        help="Ranking metric for --top (default: pagerank)"
+    )
+
+    args = parser.parse_args()
+
+    print(f"\n{'='*80}")
+    print("GRAPH METRICS")
+    print(f"{'='*80}")
+
+    metrics = get_graph_metrics()
+    start = time.monotonic()
+    written = metrics.refresh_metrics(force=args.force, domains=args.domains)
+    print(f"Recomputed {len(written)} domain(s) in {time.monotonic() - start:.1f}s")
+
+    if not written:
+        print("No dependency edges changed since the last run.")
+        return
+
+    for domain, count in written.items():
+        print(f"\n{domain}: {count} node(s)")
+        for row in metrics.top_nodes(domain, args.metric, args.top):
+            flag = "  [articulation point]" if row['is_articulation_point'] else ""
+            print(f"  {row[args.metric]:>10.4g}  {row['name']} ({row['node_type']}){flag}")
+
+
+if __name__ == "__main__":
+    main()
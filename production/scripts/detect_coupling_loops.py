@@ -0,0 +1,68 @@
+"""
+Coupling Loop Detection - Find feedback loops per cascade domain
+
+Runs core/coupling_loops.py over every cascade_domain (or --domains):
+Tarjan SCC to find the components that contain loops, then Johnson's
+elementary-cycle search inside them, capped by --max-cycles per domain and
+--max-length hops per loop. Results go to kg_coupling_loops and
+kg_loop_scans. SCCs are linear in the graph size, so run it after every
+ingest batch (--domains limited to the domains the batch touched) as well
+as for full rescans.
+
+Usage:
+    python production/scripts/detect_coupling_loops.py
+    python production/scripts/detect_coupling_loops.py --domains power timing --max-length 6
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Setup paths
+production_root = Path(__file__).parent.parent
+sys.path.insert(0, str(production_root / 'core'))
+
+from coupling_loops import MAX_CYCLE_LENGTH, MAX_CYCLES, get_coupling_loop_detector
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Detect coupling feedback loops per cascade domain"
+    )
+    parser.add_argument(
+        "--domains",
+        nargs="+",
+        help="Cascade domains to scan (default: all)"
+    )
+    parser.add_argument(
+        "--max-cycles",
+        type=int,
+        default=MAX_CYCLES,
+        help=f"Loops recorded per domain (default: {MAX_CYCLES})"
+    )
+    parser.add_argument(
+        "--max-length",
+        type=int,
+        default=MAX_CYCLE_LENGTH,
+        help=f"Longest loop searched, in relationships (default: {MAX_CYCLE_LENGTH})"
+    )
+
+    args = parser.parse_args()
+
+    print(f"\n{'='*80}")
+    print("COUPLING LOOP DETECTION")
+    print(f"{'='*80}")
+
+    start = time.monotonic()
+    summary = get_coupling_loop_detector().scan(args.domains, args.max_cycles, args.max_length)
+    for domain, result in summary.items():
+        flag = "  [truncated]" if result['truncated'] else ""
+        print(f"  {domain}: {result['loops']} loop(s) in {result['components']} component(s), "
+              f"{result['nodes_in_loops']} node(s){flag}")
+    print(f"\nScanned {len(summary)} domain(s) in {time.monotonic() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,509 @@
+"""
+Graph Export - Stream the knowledge graph to Parquet / NPZ for offline work
+
+Analytics and GNN training (GraphSAGE) need the whole graph as columnar
+files, not ad-hoc full-table pulls. This job streams
+
+- kg_nodes, kg_relationships      (knowledge graph)
+- core_entities, core_equivalences (verified layer)
+
+through server-side cursors, BATCH_SIZE rows at a time, into one Parquet
+file per table (one row group per batch) plus NPZ edge lists
+(src/dst integer arrays with edge features) for kg_relationships and
+core_equivalences. Memory is bounded by the batch size plus the id maps.
+
+Stable integer ids: every node / entity UUID gets the next integer the first
+time it is exported, recorded in an append-only id file (<uuid> per line,
+line number = id). Re-exports, incremental or full, keep the same ids, so
+feature matrices from different runs line up. Categorical columns
+(node_type, relationship_type, ...) get stable integer codes the same way
+(stored in export_state.json).
+
+Incremental export: each table has a watermark column (updated_at, or
+created_at for core_equivalences); a run exports rows past the last
+watermark (minus REFRESH_OVERLAP for in-flight commits) into new part
+files. Parts can repeat a row that changed between runs - readers should
+keep the latest row per uuid. Incremental parts cannot drop deleted rows;
+--full rewrites each exported table as one new part and then removes that
+table's earlier parts, so deletions disappear (a failed run leaves the old
+parts in place).
+
+Output layout (--out, default exports/graph):
+    export_state.json
+    kg_nodes.ids, core_entities.ids
+    <table>/part-<timestamp>.parquet
+    kg_relationships/part-<timestamp>.npz, core_equivalences/part-<timestamp>.npz
+
+Parquet needs pyarrow (pip install pyarrow); without it only NPZ edge lists
+are written.
+
+Usage:
+    python production/scripts/export_graph.py
+    python production/scripts/export_graph.py --full --embeddings
+    python production/scripts/export_graph.py --out /data/proves --tables kg_nodes kg_relationships
+"""
+
+import json
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import psycopg
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+# Setup paths
+production_root = Path(__file__).parent.parent
+project_root = production_root.parent
+sys.path.insert(0, str(production_root))
+
+from curator.config import config
+
+# Rows per server-side fetch (and per Parquet row group)
+BATCH_SIZE = 5000
+
+# Re-read this far behind each watermark (commits in flight at the last run)
+REFRESH_OVERLAP = timedelta(minutes=5)
+
+DEFAULT_OUT = project_root / 'exports' / 'graph'
+
+
+# ============================================================================
+# Stable ids and codes
+# ============================================================================
+
+class IdMap:
+    """UUID -> stable integer id, persisted as an append-only file of UUIDs"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.ids: Dict[str, int] = {}
+        self._new: List[str] = []
+        if path.exists():
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    self.ids[line.strip()] = len(self.ids)
+
+    def get(self, uuid: str) -> int:
+        """Integer id for a UUID (assigned on first sight)."""
+        i = self.ids.get(uuid)
+        if i is None:
+            i = len(self.ids)
+            self.ids[uuid] = i
+            self._new.append(uuid)
+        return i
+
+    def save(self) -> None:
+        if self._new:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(''.join(f"{uuid}\n" for uuid in self._new))
+            self._new = []
+
+
+class Codes:
+    """Categorical value -> stable integer code, per column"""
+
+    def __init__(self, tables: Dict[str, List[str]]):
+        self.tables = tables
+        self._index = {column: {v: i for i, v in enumerate(values)} for column, values in tables.items()}
+
+    def get(self, column: str, value: Optional[str]) -> int:
+        """Code for a value (-1 for NULL)."""
+        if value is None:
+            return -1
+        index = self._index.setdefault(column, {})
+        if value not in index:
+            values = self.tables.setdefault(column, [])
+            index[value] = len(values)
+            values.append(value)
+        return index[value]
+
+
+# ============================================================================
+# Table specs
+# ============================================================================
+
+# Column kinds -> Parquet types (resolved lazily, pyarrow is optional)
+def _arrow_type(kind: str):
+    return {
+        'int32': pa.int32(),
+        'int64': pa.int64(),
+        'float32': pa.float32(),
+        'bool': pa.bool_(),
+        'string': pa.string(),
+        'timestamp': pa.timestamp('us', tz='UTC'),
+        'vector': pa.list_(pa.float32()),
+    }[kind]
+
+
+def _parse_vector(text: Optional[str]) -> Optional[List[float]]:
+    """pgvector text form '[0.1,0.2,...]' -> list of floats."""
+    if not text:
+        return None
+    return [float(x) for x in text.strip('[]').split(',') if x]
+
+
+def _json(value: Any) -> Optional[str]:
+    return None if value is None else json.dumps(value, default=str)
+
+
+def node_columns(rows: List[tuple], state: 'ExportState', embeddings: bool) -> Dict[str, list]:
+    nodes = state.id_maps['kg_nodes']
+    columns = {
+        "node_id": [nodes.get(r[0]) for r in rows],
+        "uuid": [r[0] for r in rows],
+        "name": [r[1] for r in rows],
+        "node_type": [r[2] for r in rows],
+        "node_type_code": [state.codes.get('node_type', r[2]) for r in rows],
+        "description": [r[3] for r in rows],
+        "properties": [_json(r[4]) for r in rows],
+        "created_at": [r[6] for r in rows],
+        "updated_at": [r[7] for r in rows],
+    }
+    if embeddings:
+        columns["embedding"] = [_parse_vector(r[5]) for r in rows]
+    return columns
+
+
+def relationship_columns(rows: List[tuple], state: 'ExportState', embeddings: bool) -> Dict[str, list]:
+    nodes = state.id_maps['kg_nodes']
+    return {
+        "src": [nodes.get(r[1]) for r in rows],
+        "dst": [nodes.get(r[2]) for r in rows],
+        "uuid": [r[0] for r in rows],
+        "relationship_type": [r[3] for r in rows],
+        "relationship_type_code": [state.codes.get('relationship_type', r[3]) for r in rows],
+        "cascade_domain": [r[4] for r in rows],
+        "cascade_domain_code": [state.codes.get('cascade_domain', r[4]) for r in rows],
+        "strength": [None if r[5] is None else float(r[5]) for r in rows],
+        "is_critical": [bool(r[6]) for r in rows],
+        "created_at": [r[7] for r in rows],
+        "updated_at": [r[8] for r in rows],
+    }
+
+
+def entity_columns(rows: List[tuple], state: 'ExportState', embeddings: bool) -> Dict[str, list]:
+    entities = state.id_maps['core_entities']
+    return {
+        "entity_id": [entities.get(r[0]) for r in rows],
+        "uuid": [r[0] for r in rows],
+        "entity_type": [r[1] for r in rows],
+        "entity_type_code": [state.codes.get('entity_type', r[1]) for r in rows],
+        "canonical_key": [r[2] for r in rows],
+        "name": [r[3] for r in rows],
+        "ecosystem": [r[4] for r in rows],
+        "ecosystem_code": [state.codes.get('ecosystem', r[4]) for r in rows],
+        "attributes": [_json(r[5]) for r in rows],
+        "is_current": [bool(r[6]) for r in rows],
+        "updated_at": [r[7] for r in rows],
+    }
+
+
+def equivalence_columns(rows: List[tuple], state: 'ExportState', embeddings: bool) -> Dict[str, list]:
+    entities = state.id_maps['core_entities']
+    return {
+        "src": [entities.get(r[1]) for r in rows],
+        "dst": [entities.get(r[2]) for r in rows],
+        "uuid": [r[0] for r in rows],
+        "equivalence_type": [r[3] for r in rows],
+        "equivalence_type_code": [state.codes.get('equivalence_type', r[3]) for r in rows],
+        "confidence_score": [None if r[4] is None else float(r[4]) for r in rows],
+        "created_at": [r[5] for r in rows],
+    }
+
+
+# query: {where} takes the watermark filter (empty for a full export), built
+#        per run so the planner sees a plain range on the indexed column
+# watermark: position of the watermark column in each row
+# watermark_column: column the watermark filter compares
+# columns: rows -> output columns; schema: Parquet columns
+# npz: edge features written next to src/dst (edge tables only)
+TABLES: Dict[str, Dict[str, Any]] = {
+    "kg_nodes": {
+        "query": """
+            SELECT id::text, name, node_type::text, description, properties,
+                   {embedding}, created_at, updated_at
+            FROM kg_nodes
+            {where}
+        """,
+        "watermark": 7,
+        "watermark_column": "updated_at",
+        "columns": node_columns,
+        "schema": [
+            ("node_id", 'int64'), ("uuid", 'string'), ("name", 'string'),
+            ("node_type", 'string'), ("node_type_code", 'int32'),
+            ("description", 'string'), ("properties", 'string'),
+            ("created_at", 'timestamp'), ("updated_at", 'timestamp'),
+        ],
+    },
+    "kg_relationships": {
+        "query": """
+            SELECT id::text, source_node_id::text, target_node_id::text,
+                   relationship_type::text, cascade_domain::text, strength, is_critical,
+                   created_at, updated_at
+            FROM kg_relationships
+            {where}
+        """,
+        "watermark": 8,
+        "watermark_column": "updated_at",
+        "columns": relationship_columns,
+        "schema": [
+            ("src", 'int64'), ("dst", 'int64'), ("uuid", 'string'),
+            ("relationship_type", 'string'), ("relationship_type_code", 'int32'),
+            ("cascade_domain", 'string'), ("cascade_domain_code", 'int32'),
+            ("strength", 'float32'), ("is_critical", 'bool'),
+            ("created_at", 'timestamp'), ("updated_at", 'timestamp'),
+        ],
+        "npz": {
+            "relationship_type": np.int32, "cascade_domain": np.int32,
+            "strength": np.float32, "is_critical": np.bool_,
+        },
+    },
+    "core_entities": {
+        "query": """
+            SELECT id::text, entity_type::text, canonical_key, name, ecosystem::text,
+                   attributes, is_current, updated_at
+            FROM core_entities
+            {where}
+        """,
+        "watermark": 7,
+        "watermark_column": "updated_at",
+        "columns": entity_columns,
+        "schema": [
+            ("entity_id", 'int64'), ("uuid", 'string'),
+            ("entity_type", 'string'), ("entity_type_code", 'int32'),
+            ("canonical_key", 'string'), ("name", 'string'),
+            ("ecosystem", 'string'), ("ecosystem_code", 'int32'),
+            ("attributes", 'string'), ("is_current", 'bool'), ("updated_at", 'timestamp'),
+        ],
+    },
+    "core_equivalences": {
+        "query": """
+            SELECT id::text, entity_a_id::text, entity_b_id::text,
+                   equivalence_type::text, confidence_score, created_at
+            FROM core_equivalences
+            {where}
+        """,
+        "watermark": 5,
+        "watermark_column": "created_at",
+        "columns": equivalence_columns,
+        "schema": [
+            ("src", 'int64'), ("dst", 'int64'), ("uuid", 'string'),
+            ("equivalence_type", 'string'), ("equivalence_type_code", 'int32'),
+            ("confidence_score", 'float32'), ("created_at", 'timestamp'),
+        ],
+        "npz": {"equivalence_type": np.int32, "confidence_score": np.float32},
+    },
+}
+
+# Nodes before relationships (and entities before equivalences) so ids are
+# assigned in table order
+TABLE_ORDER = ["kg_nodes", "kg_relationships", "core_entities", "core_equivalences"]
+
+
+# ============================================================================
+# Export
+# ============================================================================
+
+class ExportState:
+    """Watermarks, codes and id maps for one output directory"""
+
+    def __init__(self, out_dir: Path):
+        self.out_dir = out_dir
+        self.path = out_dir / 'export_state.json'
+        data = json.loads(self.path.read_text(encoding='utf-8')) if self.path.exists() else {}
+        self.watermarks: Dict[str, Optional[str]] = data.get('watermarks', {})
+        self.codes = Codes(data.get('codes', {}))
+        self.id_maps = {
+            "kg_nodes": IdMap(out_dir / 'kg_nodes.ids'),
+            "core_entities": IdMap(out_dir / 'core_entities.ids'),
+        }
+
+    def since(self, table: str) -> Optional[datetime]:
+        watermark = self.watermarks.get(table)
+        return datetime.fromisoformat(watermark) - REFRESH_OVERLAP if watermark else None
+
+    def save(self) -> None:
+        """Persist id maps first, then the state that references them."""
+        for id_map in self.id_maps.values():
+            id_map.save()
+        tmp = self.path.with_suffix('.tmp')
+        tmp.write_text(json.dumps({"watermarks": self.watermarks, "codes": self.codes.tables}, indent=2), encoding='utf-8')
+        tmp.replace(self.path)
+
+
+def stream_rows(conn, name: str, query: str, params: Optional[tuple], batch_size: int) -> Iterator[List[tuple]]:
+    """Batches from a server-side (named) cursor."""
+    with conn.cursor(name=f"export_{name}") as cur:
+        cur.itersize = batch_size
+        cur.execute(query, params)
+        while True:
+            rows = cur.fetchmany(batch_size)
+            if not rows:
+                return
+            yield rows
+
+
+def export_table(
+    conn,
+    name: str,
+    state: ExportState,
+    stamp: str,
+    batch_size: int,
+    embeddings: bool,
+    replace: bool = False
+) -> Tuple[int, List[Path]]:
+    """
+    Export one table's rows past its watermark
+
+    Args:
+        replace: Remove the table's earlier part files once this run's
+                 parts are written (full export)
+
+    Returns:
+        (rows exported, files written)
+    """
+    spec = TABLES[name]
+    since = state.since(name)
+    query = spec["query"].format(
+        embedding="embedding::text" if embeddings else "NULL::text",
+        where=f"WHERE {spec['watermark_column']} > %s::timestamptz" if since else "",
+    )
+    table_dir = state.out_dir / name
+    table_dir.mkdir(parents=True, exist_ok=True)
+
+    schema = None
+    writer = None
+    parquet_path = table_dir / f"part-{stamp}.parquet"
+    if pa is not None:
+        fields = [(column, _arrow_type(kind)) for column, kind in spec["schema"]]
+        if name == "kg_nodes" and embeddings:
+            fields.append(("embedding", _arrow_type('vector')))
+        schema = pa.schema(fields)
+
+    npz_parts: Dict[str, List[np.ndarray]] = {column: [] for column in ["src", "dst", *spec.get("npz", {})]}
+    count = 0
+    watermark = state.watermarks.get(name)
+    latest = datetime.fromisoformat(watermark) if watermark else None
+
+    try:
+        for rows in stream_rows(conn, name, query, (since,) if since else None, batch_size):
+            columns = spec["columns"](rows, state, embeddings)
+            count += len(rows)
+            for row in rows:
+                value = row[spec["watermark"]]
+                if value is not None and (latest is None or value > latest):
+                    latest = value
+
+            if schema is not None:
+                if writer is None:
+                    writer = pq.ParquetWriter(parquet_path, schema, compression='zstd')
+                writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+
+            if "npz" in spec:
+                npz_parts["src"].append(np.array(columns["src"], dtype=np.int64))
+                npz_parts["dst"].append(np.array(columns["dst"], dtype=np.int64))
+                for column, dtype in spec["npz"].items():
+                    values = columns[f"{column}_code"] if f"{column}_code" in columns else columns[column]
+                    if dtype is np.float32:
+                        values = [np.nan if v is None else v for v in values]
+                    npz_parts[column].append(np.array(values, dtype=dtype))
+    finally:
+        if writer is not None:
+            writer.close()
+
+    written = [parquet_path] if writer is not None else []
+    if "npz" in spec and count:
+        npz_path = table_dir / f"part-{stamp}.npz"
+        np.savez_compressed(npz_path, **{column: np.concatenate(parts) for column, parts in npz_parts.items()})
+        written.append(npz_path)
+
+    if replace:
+        for old in table_dir.glob('part-*'):
+            if old not in written:
+                old.unlink()
+
+    state.watermarks[name] = latest.isoformat() if latest else None
+    return count, written
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Export the knowledge graph to Parquet / NPZ (incremental by watermark)"
+    )
+    parser.add_argument(
+        "--out",
+        type=Path,
+        default=DEFAULT_OUT,
+        help=f"Output directory (default: {DEFAULT_OUT})"
+    )
+    parser.add_argument(
+        "--tables",
+        nargs="+",
+        choices=TABLE_ORDER,
+        default=TABLE_ORDER,
+        help="Tables to export (default: all)"
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Ignore watermarks, export every row and replace the tables' earlier parts "
+             "(integer ids are kept)"
+    )
+    parser.add_argument(
+        "--embeddings",
+        action="store_true",
+        help="Include kg_nodes.embedding as a list<float> column"
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=BATCH_SIZE,
+        help=f"Rows per server-side fetch / row group (default: {BATCH_SIZE})"
+    )
+
+    args = parser.parse_args()
+
+    print(f"\n{'='*80}")
+    print("GRAPH EXPORT")
+    print(f"{'='*80}")
+    if pa is None:
+        print("pyarrow not installed - writing NPZ edge lists only (pip install pyarrow for Parquet)")
+
+    args.out.mkdir(parents=True, exist_ok=True)
+    state = ExportState(args.out)
+    if args.full:
+        for name in args.tables:
+            state.watermarks.pop(name, None)
+    stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+    conn = psycopg.connect(config.NEON_DATABASE_URL)
+    try:
+        for name in [t for t in TABLE_ORDER if t in args.tables]:
+            if pa is None and "npz" not in TABLES[name]:
+                # Nothing to write; leave the watermark for a run with pyarrow
+                print(f"  {name}: skipped (Parquet only)")
+                continue
+            count, written = export_table(
+                conn, name, state, stamp, args.batch_size, args.embeddings, replace=args.full
+            )
+            print(f"  {name}: {count} row(s)" + (f" -> {', '.join(p.name for p in written)}" if written else ""))
+        conn.commit()
+        state.save()
+        print(f"\nIds: {len(state.id_maps['kg_nodes'].ids)} node(s), {len(state.id_maps['core_entities'].ids)} entit(y/ies)")
+        print(f"State: {state.path}")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+"""
+Equivalence Candidate Generator - Propose cross-ecosystem matches in bulk
+
+store_equivalence() only records pairs someone already found. This job
+proposes them: it blocks current core_entities by entity_type plus
+
+- normalized name tokens (identifier-aware, e.g. LinuxI2cDriver -> linux, i2c, driver)
+- interface attributes: bus type and address
+
+and only compares cross-ecosystem pairs that share a block. Each block is
+scored with one matrix product over embedding-index vectors, plus a bonus
+per shared interface attribute. Oversized blocks (tokens like "component")
+are skipped, so total work grows with block sizes, not n^2.
+
+The top candidates per entity are written to equivalence_candidates for
+review; pairs already in core_equivalences are skipped.
+
+Usage:
+    python production/scripts/generate_equivalence_candidates.py
+    python production/scripts/generate_equivalence_candidates.py --top-k 3 --min-score 0.3 --dry-run
+"""
+
+import sys
+import re
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Set, Tuple
+
+import numpy as np
+import psycopg
+
+# Setup paths
+production_root = Path(__file__).parent.parent
+sys.path.insert(0, str(production_root))
+sys.path.insert(0, str(production_root / 'core'))
+
+from curator.config import config
+from embedding_index import get_embedding_index, tokenize
+
+# Blocks with more entities than this on either side are too generic to be
+# informative (and would reintroduce quadratic cost)
+MAX_BLOCK_SIDE = 300
+
+# Score bonus per shared interface attribute (bus type, address)
+ATTRIBUTE_BONUS = 0.1
+
+# Name tokens that never form a block on their own
+STOP_TOKENS = {
+    'the', 'a', 'an', 'of', 'and', 'for', 'to', 'in', 'on',
+    'component', 'module', 'port', 'type', 'data',
+}
+
+# Attribute keys that carry the bus type / device address
+BUS_KEYS = ('bus', 'bus_type', 'protocol', 'interface', 'interface_type')
+ADDRESS_KEYS = ('address', 'i2c_address', 'addr', 'device_address')
+KNOWN_BUSES = ('i2c', 'spi', 'uart', 'can', 'usb', 'gpio', 'rs485', 'rs422', 'ethernet', 'pwm')
+
+_HEX_OR_INT = re.compile(r'^(0x[0-9a-f]+|\d+)$')
+
+
+def interface_attributes(attributes: Any) -> Dict[str, str]:
+    """Normalized bus type / address from an entity's attributes."""
+    if not isinstance(attributes, dict):
+        return {}
+    found = {}
+    for key in BUS_KEYS:
+        value = attributes.get(key)
+        if isinstance(value, str):
+            lowered = value.lower().replace('²', '2').replace('-', '').replace(' ', '')
+            for bus in KNOWN_BUSES:
+                if bus in lowered:
+                    found['bus'] = bus
+                    break
+        if 'bus' in found:
+            break
+    for key in ADDRESS_KEYS:
+        value = attributes.get(key)
+        if value is None:
+            continue
+        text = str(value).strip().lower()
+        if _HEX_OR_INT.match(text):
+            found['addr'] = hex(int(text, 16 if text.startswith('0x') else 10))
+            break
+    return found
+
+
+def block_keys(entity: Dict[str, Any]) -> Set[str]:
+    """Blocking keys: entity_type combined with name tokens and interface attributes."""
+    etype = entity['entity_type']
+    keys = set()
+    for token in tokenize(f"{entity['canonical_key']} {entity['name'] or ''}"):
+        if len(token) > 1 and token not in STOP_TOKENS:
+            keys.add(f"{etype}|tok:{token}")
+    for attr, value in entity['interface'].items():
+        keys.add(f"{etype}|{attr}:{value}")
+    return keys
+
+
+def load_entities(conn) -> List[Dict[str, Any]]:
+    """Current core_entities with their interface attributes."""
+    with conn.cursor() as cur:
+        cur.execute("""
+            SELECT id::text, canonical_key, name, entity_type::text, ecosystem::text, attributes
+            FROM core_entities
+            WHERE is_current = TRUE
+        """)
+        return [
+            {
+                "id": row[0], "canonical_key": row[1], "name": row[2],
+                "entity_type": row[3], "ecosystem": row[4],
+                "interface": interface_attributes(row[5]),
+            }
+            for row in cur.fetchall()
+        ]
+
+
+def score_blocks(
+    entities: List[Dict[str, Any]],
+    vectors: np.ndarray,
+    min_score: float
+) -> Dict[Tuple[int, int], Tuple[float, Set[str]]]:
+    """
+    Score cross-ecosystem pairs inside each block
+
+    Returns:
+        {(i, j): (score, block keys)} with i < j entity positions
+    """
+    blocks: Dict[str, List[int]] = defaultdict(list)
+    for i, entity in enumerate(entities):
+        for key in block_keys(entity):
+            blocks[key].append(i)
+
+    pairs: Dict[Tuple[int, int], Tuple[float, Set[str]]] = {}
+    skipped = 0
+    for key, members in blocks.items():
+        if len(members) < 2:
+            continue
+        by_eco: Dict[str, List[int]] = defaultdict(list)
+        for i in members:
+            by_eco[entities[i]['ecosystem']].append(i)
+        if len(by_eco) < 2:
+            continue
+        if max(len(m) for m in by_eco.values()) > MAX_BLOCK_SIDE:
+            skipped += 1
+            continue
+
+        ecosystems = sorted(by_eco)
+        for a_pos, eco_a in enumerate(ecosystems):
+            side_a = np.array(by_eco[eco_a], dtype=np.intp)
+            for eco_b in ecosystems[a_pos + 1:]:
+                side_b = np.array(by_eco[eco_b], dtype=np.intp)
+                sims = vectors[side_a] @ vectors[side_b].T
+
+                for ai, bi in zip(*np.nonzero(sims + 2 * ATTRIBUTE_BONUS >= min_score)):
+                    i, j = int(side_a[ai]), int(side_b[bi])
+                    shared = sum(
+                        1 for attr, value in entities[i]['interface'].items()
+                        if entities[j]['interface'].get(attr) == value
+                    )
+                    score = min(1.0, float(sims[ai, bi]) + ATTRIBUTE_BONUS * shared)
+                    if score < min_score:
+                        continue
+                    pair = (i, j) if i < j else (j, i)
+                    best, keys = pairs.get(pair, (0.0, set()))
+                    keys.add(key)
+                    pairs[pair] = (max(best, score), keys)
+
+    if skipped:
+        print(f"  Skipped {skipped} oversized block(s) (> {MAX_BLOCK_SIDE} per ecosystem)")
+    return pairs
+
+
+def rank_pairs(
+    pairs: Dict[Tuple[int, int], Tuple[float, Set[str]]],
+    top_k: int
+) -> Dict[Tuple[int, int], int]:
+    """Keep pairs in the top_k of either entity; value = best rank."""
+    per_entity: Dict[int, List[Tuple[float, Tuple[int, int]]]] = defaultdict(list)
+    for pair, (score, _) in pairs.items():
+        per_entity[pair[0]].append((score, pair))
+        per_entity[pair[1]].append((score, pair))
+
+    ranks: Dict[Tuple[int, int], int] = {}
+    for candidates in per_entity.values():
+        candidates.sort(key=lambda c: -c[0])
+        for rank, (_, pair) in enumerate(candidates[:top_k], start=1):
+            ranks[pair] = min(ranks.get(pair, rank), rank)
+    return ranks
+
+
+def write_candidates(conn, rows: List[tuple]) -> int:
+    """Upsert candidates, skipping pairs already recorded in core_equivalences."""
+    with conn.cursor() as cur:
+        cur.execute("""
+            SELECT LEAST(entity_a_id, entity_b_id)::text, GREATEST(entity_a_id, entity_b_id)::text
+            FROM core_equivalences
+        """)
+        known = set(cur.fetchall())
+        rows = [row for row in rows if (row[0], row[1]) not in known]
+
+        cur.executemany("""
+            INSERT INTO equivalence_candidates (
+                entity_a_id, entity_b_id, score, candidate_rank, block_keys
+            ) VALUES (%s::uuid, %s::uuid, %s, %s, %s)
+            ON CONFLICT (entity_a_id, entity_b_id) DO UPDATE SET
+                score = EXCLUDED.score,
+                candidate_rank = EXCLUDED.candidate_rank,
+                block_keys = EXCLUDED.block_keys,
+                generated_at = NOW()
+            WHERE equivalence_candidates.status = 'pending'
+        """, rows)
+    conn.commit()
+    return len(rows)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Propose cross-ecosystem equivalence candidates (blocking + embeddings)"
+    )
+    parser.add_argument(
+        "--top-k",
+        type=int,
+        default=5,
+        help="Candidates kept per entity (default: 5)"
+    )
+    parser.add_argument(
+        "--min-score",
+        type=float,
+        default=0.25,
+        help="Minimum pair score (default: 0.25)"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Print the top candidates without writing them"
+    )
+
+    args = parser.parse_args()
+
+    print(f"\n{'='*80}")
+    print("EQUIVALENCE CANDIDATE GENERATION")
+    print(f"{'='*80}")
+
+    conn = psycopg.connect(config.NEON_DATABASE_URL)
+    try:
+        entities = load_entities(conn)
+        print(f"Entities: {len(entities)}")
+
+        index = get_embedding_index()
+        index.refresh()
+        vectors = index.vectors_for([e['id'] for e in entities])
+
+        pairs = score_blocks(entities, vectors, args.min_score)
+        ranks = rank_pairs(pairs, args.top_k)
+        print(f"Scored pairs: {len(pairs)}  Kept: {len(ranks)}")
+
+        rows = []
+        for (i, j), rank in sorted(ranks.items(), key=lambda item: -pairs[item[0]][0]):
+            a, b = sorted((entities[i]['id'], entities[j]['id']))
+            score, keys = pairs[(i, j)]
+            rows.append((a, b, round(score, 4), rank, sorted(keys)))
+
+        if args.dry_run:
+            by_id = {e['id']: e for e in entities}
+            for a, b, score, rank, keys in rows[:25]:
+                ea, eb = by_id[a], by_id[b]
+                print(f"  {score:.2f}  {ea['name']} ({ea['ecosystem']}) <-> {eb['name']} ({eb['ecosystem']})  [{', '.join(keys)}]")
+            return
+
+        written = write_candidates(conn, rows)
+        print(f"Written: {written} candidate(s) to equivalence_candidates")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,422 @@
+"""
+Bulk Repository Ingest - Snapshot a whole framework in one pass
+
+Exploring F' with list_github_directory + fetch_github_file costs one API call
+per directory and per file. This script instead reads a repository archive
+(tarball) or a local git checkout, selects files using the path globs in
+mcp-server/source_registry.yaml, and:
+
+1. Stores every matching file in raw_snapshots (one batched transaction),
+   along with its precomputed snapshot_text
+2. Queues each file's GitHub URL in urls_to_process for extraction
+
+Snapshots use the same source_url / source_type as fetch_github_file, so the
+extractor's read_snapshot() tool and storage's URL -> snapshot lookup work
+without any network access.
+
+Usage:
+    # Local checkout, all registry paths for F'
+    python production/scripts/ingest_repo.py --repo nasa/fprime --branch devel --checkout ../fprime
+
+    # Downloaded archive (one HTTP request), only the I2C topic
+    python production/scripts/ingest_repo.py --repo nasa/fprime --branch devel --download --topic i2c
+
+    # Explicit globs
+    python production/scripts/ingest_repo.py --repo proveskit/flight-software --tarball fs.tar.gz \\
+        --paths "Components/*/" "Topology/"
+"""
+
+import os
+import sys
+import hashlib
+import json
+import tarfile
+import tempfile
+import uuid
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import httpx
+import psycopg
+import yaml
+
+# Setup paths
+production_root = Path(__file__).parent.parent
+project_root = production_root.parent
+sys.path.insert(0, str(production_root))
+sys.path.insert(0, str(production_root / 'Version 3'))
+
+from curator.config import config
+from extractor_v3 import get_or_create_pipeline_run, store_snapshot_text
+
+REGISTRY_PATH = project_root / 'mcp-server' / 'source_registry.yaml'
+
+# Skip files larger than this (generated code, vendored blobs)
+MAX_FILE_BYTES = 1_000_000
+
+
+def detect_ecosystem(owner: str, repo: str) -> str:
+    """Detect ecosystem from repo (same rules as fetch_github_file)."""
+    if owner.lower() == "nasa" and repo.lower() == "fprime":
+        return "fprime"
+    if "proveskit" in owner.lower() or "proveskit" in repo.lower():
+        return "proveskit"
+    if "pysquared" in repo.lower():
+        return "pysquared"
+    return "unknown"
+
+
+def load_registry_globs(owner: str, repo: str, topic: Optional[str] = None) -> List[str]:
+    """
+    Collect path globs for a repository from source_registry.yaml.
+
+    F' uses component paths, risk area search paths, docs paths and the
+    fprime_paths of every query mapping. ProvesKit repos use the repo's own
+    paths plus proveskit_paths / pattern locations.
+
+    Args:
+        owner: GitHub owner (e.g., "nasa")
+        repo: Repository name (e.g., "fprime")
+        topic: Optional query_mappings topic (e.g., "i2c") to restrict paths
+
+    Returns:
+        Sorted, de-duplicated list of globs
+    """
+    with open(REGISTRY_PATH, 'r', encoding='utf-8') as f:
+        registry = yaml.safe_load(f) or {}
+
+    mappings = registry.get('query_mappings', {})
+    if topic:
+        mappings = {topic: mappings.get(topic, {})}
+
+    globs = set()
+    ecosystem = detect_ecosystem(owner, repo)
+
+    if ecosystem == "fprime":
+        fprime = registry.get('fprime', {})
+        for mapping in mappings.values():
+            globs.update(mapping.get('fprime_paths', []))
+        if not topic:
+            globs.update(fprime.get('docs', {}).get('paths', []))
+            for component in fprime.get('components', {}).values():
+                if component.get('path'):
+                    globs.add(component['path'])
+            for area in fprime.get('risk_areas', {}).values():
+                globs.update(area.get('search_paths', []))
+
+    elif ecosystem == "proveskit":
+        proveskit = registry.get('proveskit', {})
+        for mapping in mappings.values():
+            globs.update(mapping.get('proveskit_paths', []))
+        if not topic:
+            for repo_info in proveskit.get('repos', {}).values():
+                if repo_info.get('url', '').rstrip('/').endswith(f"/{repo}"):
+                    globs.update(repo_info.get('paths', []))
+            for pattern in proveskit.get('patterns', {}).values():
+                globs.update(pattern.get('locations', []))
+
+    return sorted(globs)
+
+
+def path_matches(path: str, globs: List[str]) -> bool:
+    """
+    Check a repo-relative path against registry globs.
+
+    "Svc/CmdDispatcher/" matches everything under that directory,
+    "Components/*/commands.fpp" is an fnmatch glob, anything else is an
+    exact file path. An empty glob list matches everything.
+    """
+    if not globs:
+        return True
+    for pattern in globs:
+        if any(ch in pattern for ch in '*?['):
+            if fnmatch(path, pattern) or fnmatch(path, pattern.rstrip('/') + '/*'):
+                return True
+        elif pattern.endswith('/'):
+            if path.startswith(pattern):
+                return True
+        elif path == pattern or path.startswith(pattern + '/'):
+            return True
+    return False
+
+
+def decode_text(data: bytes) -> Optional[str]:
+    """Return file content as text, or None for binary/oversized files."""
+    if len(data) > MAX_FILE_BYTES or b'\x00' in data[:8192]:
+        return None
+    try:
+        return data.decode('utf-8')
+    except UnicodeDecodeError:
+        return None
+
+
+def iter_checkout(checkout_dir: Path, globs: List[str]) -> Iterator[Tuple[str, str]]:
+    """Yield (repo_path, content) for matching files in a local checkout."""
+    for root, dirs, files in os.walk(checkout_dir):
+        dirs[:] = [d for d in dirs if d != '.git']
+        for name in files:
+            full_path = Path(root) / name
+            rel_path = full_path.relative_to(checkout_dir).as_posix()
+            if not path_matches(rel_path, globs):
+                continue
+            content = decode_text(full_path.read_bytes())
+            if content is not None:
+                yield rel_path, content
+
+
+def iter_tarball(tarball_path: Path, globs: List[str]) -> Iterator[Tuple[str, str]]:
+    """
+    Yield (repo_path, content) for matching files in a repository archive.
+
+    GitHub archives wrap everything in a "<repo>-<branch>/" directory,
+    which is stripped so paths line up with the registry globs.
+    """
+    with tarfile.open(tarball_path, mode='r|*') as archive:
+        for member in archive:
+            if not member.isfile():
+                continue
+            parts = member.name.split('/', 1)
+            if len(parts) < 2:
+                continue
+            rel_path = parts[1]
+            if not path_matches(rel_path, globs):
+                continue
+            extracted = archive.extractfile(member)
+            if extracted is None:
+                continue
+            content = decode_text(extracted.read())
+            if content is not None:
+                yield rel_path, content
+
+
+def download_tarball(owner: str, repo: str, branch: str) -> Path:
+    """Download a repository archive with a single HTTP request."""
+    url = f"https://codeload.github.com/{owner}/{repo}/tar.gz/{branch}"
+    headers = {"User-Agent": "PROVES-Library-Curator/1.0"}
+    github_token = os.environ.get("GITHUB_TOKEN")
+    if github_token:
+        headers["Authorization"] = f"token {github_token}"
+
+    fd, tmp_name = tempfile.mkstemp(suffix='.tar.gz')
+    with os.fdopen(fd, 'wb') as tmp_file:
+        with httpx.stream("GET", url, headers=headers, timeout=120.0, follow_redirects=True) as response:
+            response.raise_for_status()
+            for chunk in response.iter_bytes():
+                tmp_file.write(chunk)
+    return Path(tmp_name)
+
+
+def ingest_files(
+    conn,
+    owner: str,
+    repo: str,
+    branch: str,
+    files: Iterator[Tuple[str, str]],
+    queue: bool = True
+) -> Dict[str, int]:
+    """
+    Snapshot files into raw_snapshots and queue them in one transaction.
+
+    Snapshots are de-duplicated on (source_url, content_hash) so re-running
+    against an unchanged checkout is a no-op. A file whose content changed
+    gets a new snapshot and its completed/failed queue entry goes back to
+    pending, so it is extracted again.
+
+    Returns:
+        Counts: matched, stored, unchanged, queued (newly queued or requeued)
+    """
+    ecosystem = detect_ecosystem(owner, repo)
+
+    rows = []
+    for rel_path, content in files:
+        github_url = f"https://github.com/{owner}/{repo}/blob/{branch}/{rel_path}"
+        content_hash = hashlib.sha256(content.encode('utf-8')).hexdigest()
+        rows.append((rel_path, github_url, content, content_hash))
+
+    stats = {"matched": len(rows), "stored": 0, "unchanged": 0, "queued": 0}
+    if not rows:
+        return stats
+
+    try:
+        with conn.cursor() as cur:
+            cur.execute("""
+                SELECT source_url, content_hash FROM raw_snapshots
+                WHERE source_url = ANY(%s) AND status = 'captured'::snapshot_status
+            """, ([row[1] for row in rows],))
+            existing = set(cur.fetchall())
+
+            new_rows = [row for row in rows if (row[1], row[3]) not in existing]
+            stats["unchanged"] = len(rows) - len(new_rows)
+
+            if new_rows:
+                run_id = get_or_create_pipeline_run(conn, "repo_ingest", triggered_by="extractor_agent")
+                cur.executemany("""
+                    INSERT INTO raw_snapshots (
+                        id, source_url, source_type, ecosystem,
+                        content_hash, payload, payload_size_bytes,
+                        captured_by_run_id, status
+                    ) VALUES (
+                        %s::uuid, %s, 'github_file'::source_type, %s::ecosystem_type,
+                        %s, %s::jsonb, %s,
+                        %s::uuid, 'captured'::snapshot_status
+                    )
+                """, [
+                    (
+                        str(uuid.uuid4()), github_url, ecosystem,
+                        content_hash, json.dumps({"content": content, "format": "text"}),
+                        len(content.encode('utf-8')), run_id
+                    )
+                    for rel_path, github_url, content, content_hash in new_rows
+                ])
+                store_snapshot_text(cur, {
+                    content_hash: content
+                    for rel_path, github_url, content, content_hash in new_rows
+                }.items())
+                stats["stored"] = len(new_rows)
+
+            if queue:
+                cur.executemany("""
+                    INSERT INTO urls_to_process
+                    (url, status, quality_score, quality_reason,
+                     preview_components, preview_interfaces, preview_keywords, preview_summary)
+                    VALUES (%s, 'pending', %s, %s, %s, %s, %s, %s)
+                    ON CONFLICT (url) DO UPDATE SET
+                        status = 'pending',
+                        quality_reason = EXCLUDED.quality_reason,
+                        preview_summary = EXCLUDED.preview_summary,
+                        processed_at = NULL,
+                        error_message = NULL
+                    WHERE urls_to_process.status IN ('completed', 'failed')
+                """, [
+                    (
+                        github_url, 1.0, f"Bulk repo ingest ({owner}/{repo}@{branch})",
+                        [Path(rel_path).parent.name] if '/' in rel_path else [],
+                        [], [Path(rel_path).suffix.lstrip('.') or 'file'],
+                        f"{rel_path} (snapshot stored by ingest_repo.py - use read_snapshot)"
+                    )
+                    for rel_path, github_url, content, content_hash in new_rows
+                ])
+                # Rows already pending/processing are left alone and not counted
+                stats["queued"] = cur.rowcount
+
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    return stats
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Bulk ingest a repository archive or checkout into raw_snapshots"
+    )
+    parser.add_argument(
+        "--repo",
+        type=str,
+        required=True,
+        help="GitHub repository as owner/name (e.g., nasa/fprime)"
+    )
+    parser.add_argument(
+        "--branch",
+        type=str,
+        default="main",
+        help="Branch the files came from (default: main, use devel for fprime)"
+    )
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument(
+        "--checkout",
+        type=Path,
+        help="Path to a local git checkout"
+    )
+    source.add_argument(
+        "--tarball",
+        type=Path,
+        help="Path to a repository archive (.tar.gz)"
+    )
+    source.add_argument(
+        "--download",
+        action="store_true",
+        help="Download the repository archive from GitHub (one request)"
+    )
+    parser.add_argument(
+        "--paths",
+        nargs="+",
+        help="Path globs to ingest (default: from source_registry.yaml)"
+    )
+    parser.add_argument(
+        "--topic",
+        type=str,
+        help="Restrict registry globs to one query_mappings topic (e.g., i2c)"
+    )
+    parser.add_argument(
+        "--all-files",
+        action="store_true",
+        help="Ignore registry globs and ingest every text file"
+    )
+    parser.add_argument(
+        "--no-queue",
+        action="store_true",
+        help="Store snapshots without queueing them for extraction"
+    )
+
+    args = parser.parse_args()
+
+    owner, _, repo = args.repo.partition('/')
+    if not owner or not repo:
+        print("Error: --repo must look like owner/name (e.g., nasa/fprime)")
+        return
+
+    if args.all_files:
+        globs = []
+    elif args.paths:
+        globs = args.paths
+    else:
+        globs = load_registry_globs(owner, repo, args.topic)
+        if not globs:
+            print(f"Error: No registry paths found for {args.repo}. Use --paths or --all-files.")
+            return
+
+    print(f"\n{'='*80}")
+    print(f"REPO INGEST: {owner}/{repo}@{args.branch}")
+    print(f"{'='*80}")
+    print(f"Path globs: {', '.join(globs) if globs else '(all files)'}")
+
+    downloaded = None
+    if args.checkout:
+        files = iter_checkout(args.checkout, globs)
+    else:
+        tarball = args.tarball
+        if args.download:
+            print("Downloading archive...")
+            tarball = downloaded = download_tarball(owner, repo, args.branch)
+        files = iter_tarball(tarball, globs)
+
+    conn = psycopg.connect(config.NEON_DATABASE_URL)
+    try:
+        stats = ingest_files(conn, owner, repo, args.branch, files, queue=not args.no_queue)
+    finally:
+        conn.close()
+        if downloaded:
+            downloaded.unlink(missing_ok=True)
+
+    print(f"\nMatched files: {stats['matched']}")
+    print(f"  Stored: {stats['stored']}")
+    print(f"  Unchanged: {stats['unchanged']}")
+    print(f"  Queued: {stats['queued']}")
+    print("\nNext step: python \"production/Version 3/process_extractions_v3.py\" --continuous")
+    print()
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\n\nInterrupted by user. Exiting...")
+    except Exception as e:
+        print(f"\n\nFatal error: {e}")
+        import traceback
+        traceback.print_exc()
@@ -0,0 +1,179 @@
+"""
+Coupling Prediction - GraphSAGE link prediction over the knowledge graph
+
+Trains a CPU GraphSAGE model (core/graphsage.py) on the coupling structure
+in kg_relationships and proposes hidden couplings: node pairs the model
+scores as linked but that have no relationship yet.
+
+1. Load nodes and relationships through the in-memory graph cache
+2. Features per node: node_type one-hot, log degree overall and per
+   cascade_domain
+3. Train with minibatch neighbor sampling; a held-out share of the
+   relationships gives a validation AUC
+4. Embed every node and write the top-k unlinked pairs per node (above
+   --min-score) to predicted_couplings for review
+
+The model (weights + feature vocab) is saved so --predict-only can rescore a
+grown graph without retraining.
+
+Usage:
+    python production/scripts/predict_couplings.py
+    python production/scripts/predict_couplings.py --epochs 10 --top-k 3 --dry-run
+    python production/scripts/predict_couplings.py --predict-only --min-score 0.95
+"""
+
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Tuple
+
+import numpy as np
+import psycopg
+
+# Setup paths
+production_root = Path(__file__).parent.parent
+project_root = production_root.parent
+sys.path.insert(0, str(production_root))
+sys.path.insert(0, str(production_root / 'core'))
+
+from curator.config import config
+from graph_cache import get_graph_cache
+from graphsage import (
+    DEFAULT_FANOUTS,
+    GraphSAGE,
+    NeighborSampler,
+    build_csr,
+    graph_from_cache,
+    score_candidates,
+    train_link_prediction,
+)
+
+DEFAULT_MODEL = project_root / '.cache' / 'graphsage_couplings.npz'
+
+
+def write_candidates(conn, rows: List[tuple]) -> int:
+    """
+    Upsert predictions; reviewed rows are left alone
+
+    Returns:
+        Number of rows inserted or updated (reviewed pairs not counted)
+    """
+    with conn.cursor() as cur:
+        cur.executemany("""
+            INSERT INTO predicted_couplings (node_a_id, node_b_id, score, model_version)
+            VALUES (%s::uuid, %s::uuid, %s, %s)
+            ON CONFLICT (node_a_id, node_b_id) DO UPDATE SET
+                score = EXCLUDED.score,
+                model_version = EXCLUDED.model_version,
+                generated_at = NOW()
+            WHERE predicted_couplings.status = 'pending'
+        """, rows)
+        written = cur.rowcount
+    conn.commit()
+    return written
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Train GraphSAGE on kg_relationships and propose hidden couplings"
+    )
+    parser.add_argument(
+        "--model",
+        type=Path,
+        default=DEFAULT_MODEL,
+        help=f"Model file (default: {DEFAULT_MODEL})"
+    )
+    parser.add_argument(
+        "--predict-only",
+        action="store_true",
+        help="Load --model instead of training"
+    )
+    parser.add_argument(
+        "--epochs",
+        type=int,
+        default=5,
+        help="Training epochs (default: 5)"
+    )
+    parser.add_argument(
+        "--fanouts",
+        type=int,
+        nargs="+",
+        default=list(DEFAULT_FANOUTS),
+        help=f"Neighbors sampled per layer (default: {' '.join(map(str, DEFAULT_FANOUTS))})"
+    )
+    parser.add_argument(
+        "--top-k",
+        type=int,
+        default=5,
+        help="Candidates kept per node (default: 5)"
+    )
+    parser.add_argument(
+        "--min-score",
+        type=float,
+        default=0.9,
+        help="Minimum link probability (default: 0.9)"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Print the top candidates without writing them"
+    )
+
+    args = parser.parse_args()
+
+    print(f"\n{'='*80}")
+    print("COUPLING PREDICTION (GraphSAGE)")
+    print(f"{'='*80}")
+
+    cache = get_graph_cache()
+    if args.predict_only:
+        model, metadata = GraphSAGE.load(args.model)
+        features, pairs, _, _ = graph_from_cache(cache, metadata['vocab'])
+        model_version = metadata['model_version']
+        src = np.concatenate([pairs[:, 0], pairs[:, 1]])
+        dst = np.concatenate([pairs[:, 1], pairs[:, 0]])
+        sampler = NeighborSampler(*build_csr(len(features), src, dst), seed=0)
+        print(f"Loaded {args.model} ({model_version})")
+    else:
+        features, pairs, vocab, pair_counts = graph_from_cache(cache)
+        print(f"Nodes: {len(features)}  Couplings: {len(pairs)}  Features: {features.shape[1]}")
+        if not len(pairs):
+            print("No relationships to learn from.")
+            return
+        model, sampler, metrics = train_link_prediction(
+            features, pairs, pair_counts, fanouts=args.fanouts, epochs=args.epochs
+        )
+        model_version = f"graphsage-{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}"
+        args.model.parent.mkdir(parents=True, exist_ok=True)
+        model.save(args.model, {"vocab": vocab, "model_version": model_version, "metrics": metrics})
+        print(f"Saved {args.model} ({model_version})")
+
+    embeddings = model.embed(features, sampler)
+    candidates: List[Tuple[int, int, float]] = score_candidates(
+        embeddings, pairs, top_k=args.top_k, min_score=args.min_score
+    )
+    print(f"Candidates: {len(candidates)} (score >= {args.min_score})")
+
+    if args.dry_run:
+        for a, b, score in candidates[:25]:
+            print(f"  {score:.3f}  {cache.node_name(a)} ({cache.node_type(a)}) <-> {cache.node_name(b)} ({cache.node_type(b)})")
+        return
+
+    rows = []
+    for a, b, score in candidates:
+        id_a, id_b = sorted((cache.node_id(a), cache.node_id(b)))
+        rows.append((id_a, id_b, round(score, 4), model_version))
+
+    conn = psycopg.connect(config.NEON_DATABASE_URL)
+    try:
+        written = write_candidates(conn, rows)
+        print(f"Written: {written} of {len(rows)} candidate(s) to predicted_couplings "
+              f"(reviewed pairs left alone)")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -133,6 +133,29 @@ class ProgressReportAgent:
         """)
         state['extractions_last_7_days'] = result['count'] if result else 0
 
+        # Coupling loops (latest scan per cascade domain)
+        results = db.fetch_all("""
+            SELECT cascade_domain, loops_found, truncated
+            FROM kg_loop_scans
+            ORDER BY cascade_domain
+        """)
+        state['loops_by_domain'] = {
+            row['cascade_domain']: f"{row['loops_found']}+" if row['truncated'] else row['loops_found']
+            for row in results
+        }
+
+        results = db.fetch_all("""
+            SELECT cascade_domain, node_names
+            FROM kg_coupling_loops
+            WHERE is_active AND has_critical_edge
+            ORDER BY loop_length, cascade_domain
+            LIMIT 10
+        """)
+        state['critical_loops'] = [
+            f"[{row['cascade_domain']}] " + " -> ".join(row['node_names'] + row['node_names'][:1])
+            for row in results
+        ]
+
         return state
 
     def generate_report(self, report_type: str = 'full') -> str:
@@ -248,6 +271,13 @@ By Type:
 
 By Category:
 {self._format_dict(state['suggestions_by_category'])}
+
+## Coupling Loops
+By Domain:
+{self._format_dict(state['loops_by_domain'])}
+
+Critical Loops:
+{self._format_list(state['critical_loops'])}
 """
 
     def _format_dict(self, d: Dict) -> str:
@@ -256,6 +286,12 @@ By Category:
             return "  (none)"
         return "\n".join(f"  - {k}: {v}" for k, v in d.items())
 
+    def _format_list(self, items: List[str]) -> str:
+        """Format list for display"""
+        if not items:
+            return "  (none)"
+        return "\n".join(f"  - {item}" for item in items)
+
     def save_report(self, report_content: str):
         """Save report to file with timestamp"""
         timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
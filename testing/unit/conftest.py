@@ -0,0 +1,63 @@
+"""
+Shared setup for the production/core unit tests
+
+The modules under test are pure functions over NumPy arrays and strings, but
+several import db_connector (and through it psycopg) at module level. A stand-in
+db_connector is registered here so the tests run without a database driver and
+never touch Neon; anything that actually queries it fails loudly.
+"""
+import sys
+import threading
+import types
+from pathlib import Path
+
+import pytest
+
+core_root = Path(__file__).parent.parent.parent / 'production' / 'core'
+sys.path.insert(0, str(core_root))
+
+
+class _NoDatabase:
+    """get_db() stand-in: unit tests must not reach the database"""
+
+    def __getattr__(self, name):
+        raise RuntimeError(f"unit tests do not use the database (db.{name})")
+
+
+if 'db_connector' not in sys.modules:
+    _stub = types.ModuleType('db_connector')
+    _stub.get_db = lambda: _NoDatabase()
+    sys.modules['db_connector'] = _stub
+
+
+@pytest.fixture
+def make_cache():
+    """
+    Build a GraphCache from (source, target, domain) triples without a database
+
+    Nodes are named "n<i>"; edges get ids "e<k>" in the order given. A triple
+    may carry a fourth item, a dict of extra columns (strength, is_critical).
+    """
+    from graph_cache import GraphCache
+
+    def build(num_nodes, edges):
+        cache = GraphCache.__new__(GraphCache)
+        cache._lock = threading.RLock()
+        cache.refresh_interval = float('inf')
+        cache._reset()
+        cache._last_refresh = 1.0
+        cache.ensure_fresh = lambda: None
+        for i in range(num_nodes):
+            cache.add_node(f"n{i}", f"node {i}", 'component')
+        for k, (s, t, domain, *extra) in enumerate(edges):
+            cache.add_edge({
+                "id": f"e{k}",
+                "source_node_id": f"n{s}",
+                "target_node_id": f"n{t}",
+                "relationship_type": 'depends_on',
+                "cascade_domain": domain,
+                **(extra[0] if extra else {}),
+            })
+        return cache
+
+    return build
@@ -0,0 +1,99 @@
+"""
+cascade_engine.CascadeEngine against a brute-force BFS
+"""
+from collections import deque
+
+import numpy as np
+import pytest
+
+from cascade_engine import CascadeEngine, path_to
+
+
+def hop_depths(num_nodes, edges, domain, start):
+    adjacency = [[] for _ in range(num_nodes)]
+    for s, t, d, *_ in edges:
+        if d == domain:
+            adjacency[s].append(t)
+    depth = {start: 0}
+    queue = deque([start])
+    while queue:
+        u = queue.popleft()
+        for v in adjacency[u]:
+            if v not in depth:
+                depth[v] = depth[u] + 1
+                queue.append(v)
+    return depth
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_tree_matches_bfs_depths(make_cache, seed):
+    rng = np.random.default_rng(seed)
+    n = 30
+    edges = [
+        (int(s), int(t), ('power', 'data')[int(d)])
+        for s, t, d in zip(rng.integers(0, n, 70), rng.integers(0, n, 70), rng.integers(0, 2, 70))
+    ]
+    engine = CascadeEngine(make_cache(n, edges))
+    for start in range(n):
+        for max_depth in (2, 30):
+            tree = engine.cascade(f"n{start}", 'power', max_depth=max_depth)
+            expected = {
+                f"n{v}": d for v, d in hop_depths(n, edges, 'power', start).items()
+                if 0 < d <= max_depth and v != start
+            }
+            assert {node["node_id"]: node["depth"] for node in tree["nodes"]} == expected
+            by_id = {node["node_id"]: node for node in tree["nodes"]}
+            for node in tree["nodes"]:
+                assert node["via"]["target_node_id"] == node["node_id"]
+                assert node["via"]["source_node_id"] == node["parent_node_id"]
+                parent = by_id.get(node["parent_node_id"])
+                assert (parent["depth"] if parent else 0) == node["depth"] - 1
+                path = path_to(tree, node["node_id"])
+                assert len(path) == node["depth"]
+                assert path[0]["source_node_id"] == f"n{start}"
+            truncated = any(d > max_depth for d in hop_depths(n, edges, 'power', start).values())
+            if truncated:
+                assert tree["truncated"]["depth"]
+
+
+def test_fanout_keeps_critical_then_strongest(make_cache):
+    edges = [
+        (0, 1, 'power', {"strength": 0.1}),
+        (0, 2, 'power', {"strength": 0.9}),
+        (0, 3, 'power', {"strength": 0.2, "is_critical": True}),
+        (0, 4, 'power', {"strength": 0.5}),
+    ]
+    tree = CascadeEngine(make_cache(5, edges)).cascade('n0', 'power', max_fanout=2)
+    assert [node["node_id"] for node in tree["nodes"]] == ['n3', 'n2']
+    assert tree["truncated"]["fanout"] == 1
+    assert [e["id"] for e in tree["critical_edges"]] == ['e2']
+
+
+def test_node_cap_and_stop_at_critical(make_cache):
+    edges = [(0, 1, 'power'), (1, 2, 'power', {"is_critical": True}), (2, 3, 'power'), (0, 4, 'power')]
+    engine = CascadeEngine(make_cache(5, edges))
+
+    capped = engine.cascade('n0', 'power', max_nodes=2)
+    assert len(capped["nodes"]) == 2
+    assert capped["truncated"]["nodes"]
+
+    stopped = engine.cascade('n0', 'power', stop_at_critical=True)
+    assert stopped["stopped_at_critical"]
+    assert [node["node_id"] for node in stopped["nodes"]] == ['n1', 'n4', 'n2']
+
+
+def test_unknown_start_and_memo(make_cache):
+    cache = make_cache(3, [(0, 1, 'power')])
+    engine = CascadeEngine(cache)
+    assert engine.cascade('missing', 'power')["root"] is None
+
+    first = engine.cascade('n0', 'power')
+    assert engine.cascade('n0', 'power') is first
+    # A new edge bumps the cache version, so the memo is not reused
+    cache.add_edge({
+        "id": 'x', "source_node_id": 'n1', "target_node_id": 'n2',
+        "relationship_type": 'depends_on', "cascade_domain": 'power',
+    })
+    second = engine.cascade('n0', 'power')
+    assert second is not first
+    assert [node["node_id"] for node in second["nodes"]] == ['n1', 'n2']
@@ -0,0 +1,60 @@
+"""
+coupling_loops.simple_cycles against brute-force cycle enumeration
+"""
+from itertools import permutations
+
+import numpy as np
+import pytest
+
+from coupling_loops import simple_cycles
+
+
+def brute_force_cycles(adjacency, max_length):
+    """Every elementary cycle up to max_length, rotated to start at its smallest node."""
+    nodes = sorted(adjacency)
+    edges = {(v, w) for v in adjacency for w in adjacency[v]}
+    found = set()
+    for length in range(1, max_length + 1):
+        for path in permutations(nodes, length):
+            if path[0] != min(path):
+                continue
+            if all((path[i], path[(i + 1) % length]) in edges for i in range(length)):
+                found.add(path)
+    return found
+
+
+def random_adjacency(rng, num_nodes, num_edges):
+    adjacency = {v: [] for v in range(num_nodes)}
+    for s, t in zip(rng.integers(0, num_nodes, num_edges), rng.integers(0, num_nodes, num_edges)):
+        if int(t) not in adjacency[int(s)]:
+            adjacency[int(s)].append(int(t))
+    return adjacency
+
+
+@pytest.mark.parametrize('seed', range(10))
+@pytest.mark.parametrize('max_length', [2, 3, 5, 7])
+def test_cycles_match_brute_force(seed, max_length):
+    rng = np.random.default_rng(seed)
+    adjacency = random_adjacency(rng, 7, 16)
+    cycles, truncated = simple_cycles(adjacency, max_cycles=10_000, max_length=max_length)
+
+    assert not truncated
+    as_tuples = [tuple(c) for c in cycles]
+    assert len(as_tuples) == len(set(as_tuples)), "cycle reported twice"
+    assert set(as_tuples) == brute_force_cycles(adjacency, max_length)
+
+
+def test_complete_graph_count():
+    # K4 with both directions: 6 two-cycles, 8 three-cycles, 6 four-cycles
+    adjacency = {v: [w for w in range(4) if w != v] for v in range(4)}
+    cycles, truncated = simple_cycles(adjacency)
+    assert not truncated
+    assert sorted(len(c) for c in cycles) == [2] * 6 + [3] * 8 + [4] * 6
+
+
+def test_max_cycles_truncates():
+    adjacency = {v: [w for w in range(5) if w != v] for v in range(5)}
+    cycles, truncated = simple_cycles(adjacency, max_cycles=10)
+    assert truncated
+    assert len(cycles) == 10
+    assert len({tuple(c) for c in cycles}) == 10
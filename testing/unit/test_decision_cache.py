@@ -0,0 +1,121 @@
+"""
+decision_cache.DecisionCache against in-memory validation_decisions / core_entities
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import decision_cache
+from decision_cache import DecisionCache, evidence_checksum, fingerprint, normalize_key
+
+NOW = datetime.now(timezone.utc)
+EVIDENCE = evidence_checksum("The I2C driver retries three times.")
+
+
+class FakeDB:
+    """Decision rows (already joined to staging_extractions) and core entity rows"""
+
+    def __init__(self):
+        self.decisions = []
+        self.entities = []
+
+    def decide(self, decision, at, key='I2C_Driver', decider='agent', checksum=EVIDENCE):
+        self.decisions.append({
+            "decision_id": f"d{len(self.decisions)}", "extraction_id": f"x{len(self.decisions)}",
+            "decision": decision, "decision_reason": None, "decided_by": 'tester',
+            "decider_type": decider, "created_at": at,
+            "candidate_type": 'component', "candidate_key": key, "evidence_checksum": checksum,
+        })
+
+    def change(self, at, key='i2c_driver'):
+        self.entities.append({"canonical_key": key, "updated_at": at})
+
+    def fetch_iter(self, query, params=None):
+        rows, stamp = (self.decisions, 'created_at') if 'validation_decisions' in query else (self.entities, 'updated_at')
+        since = params[0]
+        return iter([dict(r) for r in sorted(rows, key=lambda r: r[stamp]) if since is None or r[stamp] > since])
+
+
+@pytest.fixture
+def db(monkeypatch):
+    fake = FakeDB()
+    monkeypatch.setattr(decision_cache, 'get_db', lambda: fake)
+    return fake
+
+
+def lookup(cache, key='i2c driver', checksum=EVIDENCE):
+    cache.refresh()
+    return cache.lookup('Component', key, checksum)['status']
+
+
+def test_fingerprint_normalizes_key_and_type():
+    assert normalize_key(' I2C__Driver ') == 'i2c driver'
+    assert fingerprint('Component', 'I2C-Driver', EVIDENCE) == fingerprint('component', 'i2c driver', EVIDENCE)
+    assert fingerprint('component', 'i2c driver', EVIDENCE) != fingerprint('component', 'i2c driver', None)
+
+
+def test_miss_hit_undecided_expired(db):
+    cache = DecisionCache(refresh_interval=float('inf'))
+    assert lookup(cache) == 'miss'
+
+    db.decide('defer', NOW - timedelta(hours=2))
+    assert lookup(cache) == 'undecided'
+
+    db.decide('reject', NOW - timedelta(hours=1))
+    assert lookup(cache) == 'hit'
+    assert lookup(cache, checksum=evidence_checksum("other evidence")) == 'miss'
+
+    old = DecisionCache(ttl=timedelta(minutes=30), refresh_interval=float('inf'))
+    assert lookup(old) == 'expired'
+
+
+def test_human_verdict_outranks_later_agent_verdict(db):
+    db.decide('reject', NOW - timedelta(hours=3), decider='human_reviewer')
+    db.decide('accept', NOW - timedelta(hours=1))
+    cache = DecisionCache(refresh_interval=float('inf'))
+    cache.refresh()
+    assert cache.lookup('component', 'I2C_Driver', EVIDENCE)['verdict'] == 'rejected'
+
+
+@pytest.mark.parametrize('entities_first', [False, True])
+def test_accept_survives_its_own_promotion(db, entities_first):
+    decided = NOW - timedelta(hours=3)
+    cache = DecisionCache(refresh_interval=float('inf'))
+    if entities_first:
+        # Entity change already seen when the decision arrives: the key is
+        # not tracked yet, so it is picked up on the overlap re-read
+        db.change(decided + timedelta(minutes=2))
+        cache.refresh()
+        db.decide('accept', decided)
+    else:
+        db.decide('accept', decided)
+        cache.refresh()
+        db.change(decided + timedelta(minutes=2))
+    assert lookup(cache) == 'hit'
+
+    # A later edit of the promoted entity invalidates the verdict
+    db.change(decided + timedelta(hours=2))
+    assert lookup(cache) == 'invalidated'
+
+
+def test_reject_invalidated_by_any_later_change(db):
+    decided = NOW - timedelta(hours=3)
+    db.decide('reject', decided)
+    cache = DecisionCache(refresh_interval=float('inf'))
+    assert lookup(cache) == 'hit'
+
+    db.change(decided - timedelta(minutes=5))
+    assert lookup(cache) == 'hit'
+    db.change(decided + timedelta(minutes=2))
+    assert lookup(cache) == 'invalidated'
+
+
+def test_overlap_reread_keeps_state(db):
+    decided = NOW - timedelta(minutes=1)
+    db.decide('accept', decided)
+    cache = DecisionCache(refresh_interval=float('inf'))
+    cache.refresh()
+    db.change(decided + timedelta(seconds=10))
+    for _ in range(3):
+        assert lookup(cache) == 'hit'
+    assert cache.refresh() == 2
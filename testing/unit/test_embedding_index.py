@@ -0,0 +1,85 @@
+"""
+embedding_index.EmbeddingIndex against an in-memory core_entities
+"""
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+import embedding_index
+from embedding_index import EmbeddingIndex, tokenize
+
+T0 = datetime(2026, 1, 1, 12, 0, 0)
+
+
+class FakeDB:
+    def __init__(self):
+        self.rows = {}
+
+    def entity(self, entity_id, key, name, ecosystem='fprime', entity_type='component',
+               description=None, is_current=True, at=T0):
+        self.rows[entity_id] = {
+            "id": entity_id, "canonical_key": key, "name": name, "entity_type": entity_type,
+            "ecosystem": ecosystem, "attributes": {"description": description} if description else {},
+            "is_current": is_current, "updated_at": at,
+        }
+
+    def fetch_all(self, query, params=None):
+        since = params[0] if params else None
+        rows = [
+            dict(r) for r in self.rows.values()
+            if (since is None and r['is_current']) or (since is not None and r['updated_at'] > since)
+        ]
+        return sorted(rows, key=lambda r: r['updated_at'])
+
+
+@pytest.fixture
+def db(monkeypatch):
+    fake = FakeDB()
+    fake.entity('1', 'Drv::LinuxI2cDriver', 'LinuxI2cDriver', description='I2C bus driver for Linux')
+    fake.entity('2', 'Svc::CmdDispatcher', 'CmdDispatcher', description='Routes commands to components')
+    fake.entity('3', 'I2CManager', 'I2C Manager', ecosystem='proveskit', description='Manages the I2C bus')
+    fake.entity('4', 'PowerMonitor', 'Power Monitor', ecosystem='proveskit', description='Reads battery power')
+    monkeypatch.setattr(embedding_index, 'get_db', lambda: fake)
+    return fake
+
+
+def test_tokenize():
+    assert tokenize('Drv::LinuxI2cDriver') == ['driver', 'linux', 'i2c', 'driver']
+    assert tokenize('I2CManager') == ['i2c', 'manager']
+
+
+def test_first_embed_uses_corpus_idf(db):
+    index = EmbeddingIndex(path=None)
+    # No search() has run yet: embed() itself must load the corpus IDF
+    query = index.embed('PowerMonitor Power Monitor', 'component Reads battery power')
+    np.testing.assert_allclose(query, index.vector_for('4'), atol=1e-6)
+    assert index.search(query, k=1)[0]['id'] == '4'
+
+
+def test_cross_ecosystem_neighbors(db):
+    index = EmbeddingIndex(path=None)
+    results = index.search(index.vector_for('3'), k=2, exclude_ecosystem='proveskit')
+    assert [r['id'] for r in results][0] == '1'
+    assert all(r['ecosystem'] == 'fprime' for r in results)
+    assert index.search(index.vector_for('3'), k=5, exclude_ids=['3'], min_score=0.99) == []
+
+
+def test_incremental_refresh_upserts_and_drops(db):
+    index = EmbeddingIndex(path=None)
+    index.refresh()
+    db.entity('5', 'Svc::TlmChan', 'TlmChan', description='Telemetry channel storage', at=T0 + timedelta(minutes=1))
+    db.entity('2', 'Svc::CmdDispatcher', 'CmdDispatcher', is_current=False, at=T0 + timedelta(minutes=1))
+    index.refresh()
+    assert index.entity('5')['canonical_key'] == 'Svc::TlmChan'
+    assert index.vector_for('2') is None
+    assert '2' not in [r['id'] for r in index.search(index.embed('CmdDispatcher'), k=5)]
+
+
+def test_save_and_load(db, tmp_path):
+    path = tmp_path / 'embeddings.npz'
+    index = EmbeddingIndex(path=path)
+    index.refresh()
+    loaded = EmbeddingIndex(path=path)
+    np.testing.assert_array_equal(loaded.vectors_for(['1', '3', 'missing']), index.vectors_for(['1', '3', 'missing']))
+    assert not loaded.vectors_for(['missing']).any()
@@ -0,0 +1,29 @@
+"""
+entity_index trigram similarity against pg_trgm
+"""
+import pytest
+
+from entity_index import similarity, trigrams
+
+
+def test_trigrams_match_show_trgm():
+    # SELECT show_trgm('Cat'), show_trgm('two words')
+    assert trigrams('Cat') == {'  c', ' ca', 'cat', 'at '}
+    assert trigrams('two words') == {
+        '  t', ' tw', 'two', 'wo ', '  w', ' wo', 'wor', 'ord', 'rds', 'ds ',
+    }
+    # Non-alphanumerics separate words
+    assert trigrams('foo-bar_baz!') == trigrams('foo bar baz')
+    assert trigrams('--') == frozenset()
+
+
+@pytest.mark.parametrize('a, b, expected', [
+    ('word', 'two words', 4 / 11),   # pg_trgm documentation: 0.36363637
+    ('word', 'word', 1.0),
+    ('Word', 'WORD', 1.0),
+    ('abc', 'xyz', 0.0),
+    ('', 'abc', 0.0),
+])
+def test_similarity_matches_pg_trgm(a, b, expected):
+    assert similarity(a, b) == pytest.approx(expected)
+    assert similarity(b, a) == pytest.approx(expected)
@@ -0,0 +1,99 @@
+"""
+evidence_matcher.py against str.find and a full edit-distance table
+"""
+import numpy as np
+import pytest
+
+from evidence_matcher import AhoCorasick, FuzzyIndex, match_quotes
+from html_text import normalize_text
+
+
+def random_text(rng, alphabet, length):
+    return ''.join(alphabet[i] for i in rng.integers(0, len(alphabet), length))
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_aho_corasick_matches_str_find(seed):
+    rng = np.random.default_rng(seed)
+    text = random_text(rng, 'abc', 200)
+    patterns = [random_text(rng, 'abc', int(rng.integers(1, 7))) for _ in range(30)]
+    found = AhoCorasick(patterns).find_first(text)
+    for index, pattern in enumerate(patterns):
+        expected = text.find(pattern)
+        assert found.get(index, -1) == expected, pattern
+
+
+def test_aho_corasick_overlapping_and_duplicate_patterns():
+    found = AhoCorasick(['he', 'she', 'his', 'hers', 'she']).find_first('ushers')
+    assert found == {0: 2, 1: 1, 3: 2, 4: 1}
+
+
+def test_match_quotes_reports_utf8_byte_offsets():
+    text = 'Naïve café reset: the bus ✓ recovers after reset.'
+    quotes = ['café reset', 'bus  ✓\nrecovers', 'after reset.', 'not here', '']
+    results = match_quotes(text, quotes)
+    raw = text.encode('utf-8')
+    assert results[0] == {"match": "exact", "offset": raw.find('café reset'.encode('utf-8'))}
+    assert results[1] == {"match": "normalized", "offset": raw.find('bus ✓ recovers'.encode('utf-8'))}
+    assert results[2] == {"match": "exact", "offset": raw.find(b'after reset.')}
+    assert results[3] == {"match": None, "offset": None}
+    assert results[4] == {"match": "exact", "offset": 0}
+
+
+def best_semi_global(text, quote):
+    """Smallest edit distance between quote and any substring of text."""
+    prev = [0] * (len(text) + 1)
+    for i, qc in enumerate(quote, 1):
+        row = [i] + [0] * len(text)
+        for j, tc in enumerate(text, 1):
+            row[j] = min(prev[j - 1] + (qc != tc), prev[j] + 1, row[j - 1] + 1)
+        prev = row
+    return min(prev)
+
+
+def edit_distance(a, b):
+    prev = list(range(len(b) + 1))
+    for i, ac in enumerate(a, 1):
+        row = [i] + [0] * len(b)
+        for j, bc in enumerate(b, 1):
+            row[j] = min(prev[j - 1] + (ac != bc), prev[j] + 1, row[j - 1] + 1)
+        prev = row
+    return prev[-1]
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_fuzzy_index_finds_best_span(seed):
+    rng = np.random.default_rng(seed)
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    text = random_text(rng, letters + '    ', 3000)
+    text = ' '.join(text.split())
+    start = int(rng.integers(0, len(text) - 80))
+    quote = list(text[start:start + 60].strip())
+
+    # Two edits keep a long unedited run, so seeding always finds the region
+    for _ in range(2):
+        pos = int(rng.integers(1, len(quote) - 1))
+        kind = int(rng.integers(0, 3))
+        letter = letters[int(rng.integers(0, len(letters)))]
+        if kind == 0:
+            quote[pos] = letter
+        elif kind == 1:
+            quote.insert(pos, letter)
+        else:
+            del quote[pos]
+    # find() collapses whitespace runs an edit may have created
+    quote = normalize_text(''.join(quote))
+
+    found = FuzzyIndex(text).find(quote)
+    assert found is not None
+    assert found.distance == best_semi_global(text, quote)
+    assert edit_distance(quote, text[found.start:found.end]) == found.distance
+
+
+def test_fuzzy_index_folds_typography_and_respects_budget():
+    text = 'The watchdog "resets the bus" when the I2C line is held low for 25 ms.'
+    index = FuzzyIndex(text)
+    found = index.find('watchdog “resets the bus” when')
+    assert found == (4, 34, 0)
+    assert index.find('completely unrelated sentence') is None
+    assert index.find('short') is None
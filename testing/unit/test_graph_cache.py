@@ -0,0 +1,144 @@
+"""
+graph_cache.GraphCache refresh against an in-memory stand-in for Neon
+"""
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+import graph_cache
+from graph_cache import GraphCache
+
+T0 = datetime(2026, 1, 1, 12, 0, 0)
+
+
+class FakeDB:
+    """kg_nodes / kg_relationships rows plus the statistics counter GraphCache reads"""
+
+    def __init__(self):
+        self.nodes = {}
+        self.edges = {}
+        self.deleted = 0
+        self.queries = []
+
+    def node(self, i, at=T0):
+        self.nodes[f"n{i}"] = {"id": f"n{i}", "name": f"node {i}", "node_type": 'component', "changed_at": at}
+
+    def edge(self, k, s, t, domain='power', strength=None, at=T0):
+        self.edges[f"e{k}"] = {
+            "id": f"e{k}", "source_node_id": f"n{s}", "target_node_id": f"n{t}",
+            "relationship_type": 'depends_on', "strength": strength, "description": None,
+            "cascade_domain": domain, "is_critical": False, "evidence_entry_id": None,
+            "created_at": T0, "updated_at": at,
+        }
+
+    def fetch_iter(self, query, params=None):
+        self.queries.append(query)
+        rows, stamp = (self.nodes, 'changed_at') if 'FROM kg_nodes' in query else (self.edges, 'updated_at')
+        since = params[0] if params else None
+        return iter([dict(r) for r in rows.values() if since is None or r[stamp] > since])
+
+    def fetch_one(self, query, params=None):
+        self.queries.append(query)
+        if 'pg_stat_user_tables' in query:
+            return {"deleted": self.deleted}
+        return {"nodes": len(self.nodes), "edges": len(self.edges)}
+
+
+@pytest.fixture
+def db(monkeypatch):
+    fake = FakeDB()
+    for i in range(6):
+        fake.node(i)
+    for k, (s, t) in enumerate([(0, 1), (1, 2), (2, 3), (3, 1), (4, 5)]):
+        fake.edge(k, s, t, domain='power' if k % 2 == 0 else 'data')
+    monkeypatch.setattr(graph_cache, 'get_db', lambda: fake)
+    return fake
+
+
+def outgoing(cache, domain=None):
+    indptr, edges = cache.adjacency('outgoing', domain)
+    return {
+        (cache.node_id(i), cache.edge(int(e))['id'])
+        for i in range(cache.num_nodes)
+        for e in edges[indptr[i]:indptr[i + 1]]
+    }
+
+
+def test_adjacency_matches_rows(db):
+    cache = GraphCache()
+    cache.refresh()
+    for domain in (None, 'power', 'data'):
+        expected = {
+            (r['source_node_id'], r['id']) for r in db.edges.values()
+            if domain is None or r['cascade_domain'] == domain
+        }
+        assert outgoing(cache, domain) == expected
+    assert cache.has_edge('n0', 'n1', 'depends_on')
+    assert not cache.has_edge('n1', 'n0', 'depends_on')
+
+
+def test_unchanged_overlap_keeps_version(db):
+    cache = GraphCache()
+    cache.refresh()
+    version = cache.version
+    csr = cache.adjacency('outgoing', 'power')
+
+    # The overlap window re-reads every row; nothing differs
+    assert cache.refresh() == len(db.nodes) + len(db.edges)
+    assert cache.refresh() > 0
+    assert cache.version == version
+    assert cache.adjacency('outgoing', 'power') is csr
+
+
+def test_changed_and_new_edges_bump_version(db):
+    cache = GraphCache()
+    cache.refresh()
+    version = cache.version
+
+    db.edge(0, 0, 1, domain='power', strength=0.7, at=T0 + timedelta(minutes=1))
+    cache.refresh()
+    assert cache.version == version + 1
+    assert cache.edge(cache._edge_index['e0'])['strength'] == pytest.approx(0.7)
+
+    db.edge(9, 5, 0, domain='data', at=T0 + timedelta(minutes=2))
+    cache.refresh()
+    assert cache.version == version + 2
+    assert ('n5', 'e9') in outgoing(cache, 'data')
+
+
+def test_write_through_then_reread_keeps_version(db):
+    cache = GraphCache()
+    cache.refresh()
+    db.edge(7, 0, 2, at=T0 + timedelta(minutes=1))
+    cache.add_edge(dict(db.edges['e7']))
+    version = cache.version
+    cache.refresh()
+    assert cache.version == version
+
+
+def test_refresh_reads_no_counts_until_interval(db, monkeypatch):
+    cache = GraphCache()
+    cache.refresh()
+    db.queries.clear()
+    cache.refresh()
+    assert not any('COUNT(*)' in q for q in db.queries)
+
+    # Backstop: a row removed without moving the counter (e.g. TRUNCATE)
+    del db.edges['e4']
+    monkeypatch.setattr(graph_cache, 'COUNT_CHECK_INTERVAL', 0.0)
+    cache.refresh()
+    assert any('COUNT(*)' in q for q in db.queries)
+    assert cache.num_edges == 4
+    assert 'e4' not in cache._edge_index
+
+
+def test_deletion_counter_forces_full_reload(db):
+    cache = GraphCache()
+    cache.refresh()
+    del db.edges['e1']
+    db.deleted += 1
+    cache.refresh()
+    assert cache.num_edges == 4
+    assert ('n1', 'e1') not in outgoing(cache)
+    np.testing.assert_array_equal(np.sort(cache.src), np.sort([cache.node_index(r['source_node_id']) for r in db.edges.values()]))
@@ -0,0 +1,156 @@
+"""
+graph_metrics.py against dense / brute-force reference implementations
+"""
+from collections import deque
+from itertools import product
+
+import numpy as np
+import pytest
+
+from graph_metrics import articulation_points, betweenness, pagerank
+
+
+def random_graph(rng, num_nodes, num_edges, simple=False):
+    src = rng.integers(0, num_nodes, num_edges)
+    dst = rng.integers(0, num_nodes, num_edges)
+    if simple:
+        pairs = {(int(s), int(t)) for s, t in zip(src, dst) if s != t}
+        src = np.array([s for s, _ in sorted(pairs)], dtype=np.int64)
+        dst = np.array([t for _, t in sorted(pairs)], dtype=np.int64)
+    return src, dst
+
+
+def dense_pagerank(n, src, dst, damping=0.85):
+    """Stationary vector of the Google matrix (parallel edges count twice)."""
+    transition = np.zeros((n, n))
+    for s, t in zip(src, dst):
+        transition[t, s] += 1.0
+    out_degree = transition.sum(axis=0)
+    for s in range(n):
+        transition[:, s] = transition[:, s] / out_degree[s] if out_degree[s] else 1.0 / n
+    google = damping * transition + (1 - damping) / n
+    rank = np.full(n, 1.0 / n)
+    for _ in range(1000):
+        rank = google @ rank
+    return rank
+
+
+def shortest_paths(n, adjacency, s):
+    """(distance, number of shortest paths) from s to every node."""
+    dist = [-1] * n
+    sigma = [0] * n
+    dist[s], sigma[s] = 0, 1
+    queue = deque([s])
+    while queue:
+        u = queue.popleft()
+        for w in adjacency[u]:
+            if dist[w] < 0:
+                dist[w] = dist[u] + 1
+                queue.append(w)
+            if dist[w] == dist[u] + 1:
+                sigma[w] += sigma[u]
+    return dist, sigma
+
+
+def brute_force_betweenness(n, src, dst):
+    adjacency = [[] for _ in range(n)]
+    for s, t in zip(src.tolist(), dst.tolist()):
+        adjacency[s].append(t)
+    paths = [shortest_paths(n, adjacency, s) for s in range(n)]
+    scores = np.zeros(n)
+    for s, t, v in product(range(n), repeat=3):
+        if len({s, t, v}) < 3:
+            continue
+        d_st, sigma_st = paths[s][0][t], paths[s][1][t]
+        d_sv, d_vt = paths[s][0][v], paths[v][0][t]
+        if d_st > 0 and d_sv > 0 and d_vt > 0 and d_sv + d_vt == d_st:
+            scores[v] += paths[s][1][v] * paths[v][1][t] / sigma_st
+    return scores
+
+
+def components(n, edges, removed):
+    parent = list(range(n))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for s, t in edges:
+        if s != removed and t != removed:
+            parent[find(s)] = find(t)
+    touched = {v for e in edges for v in e if v != removed}
+    return len({find(v) for v in touched})
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_pagerank_matches_dense(seed):
+    rng = np.random.default_rng(seed)
+    n = 15
+    src, dst = random_graph(rng, n, 30)
+    rank = pagerank(n, src, dst)
+    assert rank.sum() == pytest.approx(1.0)
+    np.testing.assert_allclose(rank, dense_pagerank(n, src, dst), atol=1e-6)
+
+
+def test_pagerank_warm_start_converges_to_same_result():
+    rng = np.random.default_rng(3)
+    n = 12
+    src, dst = random_graph(rng, n, 25)
+    cold = pagerank(n, src, dst)
+    warm = pagerank(n, src, dst, initial=rng.random(n) + 0.1)
+    np.testing.assert_allclose(warm, cold, atol=1e-6)
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_betweenness_matches_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    n = 12
+    src, dst = random_graph(rng, n, 30, simple=True)
+    np.testing.assert_allclose(betweenness(n, src, dst), brute_force_betweenness(n, src, dst), atol=1e-9)
+
+
+def test_betweenness_sampling_uses_all_sources_when_not_smaller():
+    rng = np.random.default_rng(11)
+    n = 10
+    src, dst = random_graph(rng, n, 25, simple=True)
+    np.testing.assert_allclose(betweenness(n, src, dst, samples=n), betweenness(n, src, dst))
+
+
+def test_sampled_betweenness_is_unbiased():
+    # Half the nodes have no out-edges, so they are never drawn as sources
+    rng = np.random.default_rng(4)
+    n = 40
+    src, dst = random_graph(rng, n // 2, 60, simple=True)
+    dst = np.concatenate([dst, np.arange(n // 2, n)])
+    src = np.concatenate([src, np.arange(n // 2) % (n // 2)])
+    exact = betweenness(n, src, dst)
+    sampled = np.mean([betweenness(n, src, dst, samples=5, seed=s) for s in range(400)], axis=0)
+    assert sampled.sum() == pytest.approx(exact.sum(), rel=0.05)
+    np.testing.assert_allclose(sampled, exact, atol=0.1 * exact.max())
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_articulation_points_match_vertex_removal(seed):
+    rng = np.random.default_rng(seed)
+    n = 14
+    src, dst = random_graph(rng, n, 16)
+    edges = list(zip(src.tolist(), dst.tolist()))
+    mask = articulation_points(n, src, dst)
+    for v in range(n):
+        touched = {u for e in edges for u in e}
+        if v not in touched:
+            assert not mask[v]
+            continue
+        baseline = components(n, edges, removed=-1)
+        # Removing a cut vertex leaves more components than before (an
+        # isolated vertex disappearing entirely lowers the count instead)
+        assert mask[v] == (components(n, edges, removed=v) > baseline), v
+
+
+def test_empty_graph():
+    empty = np.empty(0, dtype=np.int64)
+    assert pagerank(0, empty, empty).shape == (0,)
+    assert not betweenness(3, empty, empty).any()
+    assert not articulation_points(3, empty, empty).any()
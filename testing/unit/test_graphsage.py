@@ -0,0 +1,109 @@
+"""
+graphsage.py: manual backprop against numerical gradients
+"""
+import numpy as np
+import pytest
+
+from graphsage import (
+    GraphSAGE, NeighborSampler, auc, build_csr, degree_features, score_candidates, undirected_pairs,
+)
+from graphsage import _sigmoid
+
+
+def small_graph(rng, num_nodes=12, num_edges=24):
+    src = rng.integers(0, num_nodes, num_edges)
+    dst = rng.integers(0, num_nodes, num_edges)
+    return build_csr(num_nodes, np.concatenate([src, dst]), np.concatenate([dst, src]))
+
+
+@pytest.mark.parametrize('fanouts', [(3,), (3, 2), (2, 2, 2)])
+def test_backward_matches_numerical_gradient(fanouts):
+    rng = np.random.default_rng(0)
+    num_nodes, in_dim = 12, 5
+    features = rng.standard_normal((num_nodes, in_dim))
+    sampler = NeighborSampler(*small_graph(rng, num_nodes), seed=1)
+    layers = sampler.sample_layers(np.array([0, 3, 7, 7]), fanouts)
+
+    model = GraphSAGE(in_dim, hidden_dim=6, out_dim=4, fanouts=fanouts, seed=2)
+    # float64 so central differences are accurate; biases off zero so ReLU
+    # inputs sit away from the kink
+    for name, value in model.params.items():
+        model.params[name] = value.astype(np.float64) + (0.1 if name.startswith('b') else 0.0)
+
+    weights = rng.standard_normal((len(layers[0]), 4))
+    emb, saved = model.forward(features, layers)
+    grads = model.backward(weights, saved)
+
+    eps = 1e-6
+    for name, value in model.params.items():
+        numerical = np.zeros_like(value)
+        for index in np.ndindex(value.shape):
+            original = value[index]
+            value[index] = original + eps
+            up = (model.forward(features, layers)[0] * weights).sum()
+            value[index] = original - eps
+            down = (model.forward(features, layers)[0] * weights).sum()
+            value[index] = original
+            numerical[index] = (up - down) / (2 * eps)
+        np.testing.assert_allclose(grads[name], numerical, rtol=1e-5, atol=1e-7, err_msg=name)
+
+
+def test_sampler_draws_neighbors_and_self_for_isolated():
+    indptr, indices = build_csr(4, np.array([0, 0, 1]), np.array([1, 2, 0]))
+    sampler = NeighborSampler(indptr, indices, seed=0)
+    drawn = sampler.sample(np.array([0, 1, 3]), 5)
+    assert set(drawn[0].tolist()) <= {1, 2}
+    assert set(drawn[1].tolist()) == {0}
+    assert set(drawn[2].tolist()) == {3}
+    layers = sampler.sample_layers(np.array([0, 1]), (3, 2))
+    assert [len(layer) for layer in layers] == [2, 6, 12]
+
+
+def test_undirected_pairs_and_degree_features():
+    pairs = undirected_pairs(np.array([0, 1, 2, 2, 3]), np.array([1, 0, 2, 3, 0]))
+    assert pairs.tolist() == [[0, 1], [0, 3], [2, 3]]
+    counts = np.array([[2, 1], [1, 0], [1, 1]])
+    expected = np.log1p([[3, 1], [2, 1], [1, 1], [2, 1]])
+    np.testing.assert_allclose(degree_features(4, pairs, counts), expected, rtol=1e-6)
+
+
+def test_auc_matches_pairwise_comparison():
+    rng = np.random.default_rng(5)
+    pos = rng.standard_normal(40) + 0.5
+    neg = rng.standard_normal(60)
+    expected = (pos[:, None] > neg[None, :]).mean()
+    assert auc(pos, neg) == pytest.approx(expected)
+
+
+def brute_force_candidates(embeddings, known_pairs, top_k, min_score):
+    n = len(embeddings)
+    known = set(map(tuple, known_pairs.tolist()))
+    found = {}
+    for a in range(n):
+        scored = sorted(
+            ((float(_sigmoid(embeddings[a] @ embeddings[b])), b) for b in range(n)
+             if b != a and (min(a, b), max(a, b)) not in known),
+            reverse=True
+        )
+        for score, b in scored[:top_k]:
+            if score >= min_score:
+                pair = (min(a, b), max(a, b))
+                found[pair] = max(found.get(pair, 0.0), score)
+    return found
+
+
+@pytest.mark.parametrize('batch_size', [3, 1024])
+def test_score_candidates_matches_brute_force(batch_size):
+    rng = np.random.default_rng(8)
+    embeddings = rng.standard_normal((20, 4))
+    # Node 0 is a hub linked to its best-scoring partners
+    hub = np.argsort(-(embeddings[1:] @ embeddings[0]))[:8] + 1
+    known = undirected_pairs(
+        np.concatenate([np.zeros(len(hub), dtype=np.int64), rng.integers(0, 20, 15)]),
+        np.concatenate([hub, rng.integers(0, 20, 15)])
+    )
+    candidates = score_candidates(embeddings, known, top_k=3, min_score=0.2, batch_size=batch_size)
+    expected = brute_force_candidates(embeddings, known, top_k=3, min_score=0.2)
+    assert {(a, b): pytest.approx(s) for a, b, s in candidates} == expected
+    assert any(0 in (a, b) for a, b, _ in candidates)
+    assert [s for _, _, s in candidates] == sorted((s for _, _, s in candidates), reverse=True)
@@ -0,0 +1,78 @@
+"""
+html_text.TextView offset map: every text span maps back to raw bytes that
+strip to the same text
+"""
+import numpy as np
+import pytest
+
+from html_text import TextView, get_text_view, normalize_text, strip_html
+
+TOKENS = [
+    'alpha', 'beta', 'gamma', 'naïve', 'café', '✓ ok', 'I²C', 'bus', 'reset',
+    ' ', '  ', '\n', '\t\n  ', '<p>', '</p>', '<br/>', '<b class="x">', '</b>',
+    '<div\nid="a">', '<script>var x = "<p>";</script>', '<style>p { color: red; }</style>',
+    '<script type="text/javascript">\nif (a > b) {}\n</script>',
+]
+
+
+def random_html(rng, length):
+    return ''.join(TOKENS[i] for i in rng.integers(0, len(TOKENS), length))
+
+
+def test_strip_html():
+    assert strip_html('<p>Hello</p>\n<p>world</p>') == 'Hello world'
+    assert strip_html('a<script>x()</script>b') == 'ab'
+    assert strip_html('a<style>p {}</style> b') == 'a b'
+    assert strip_html('  <b>bold</b>  ') == 'bold'
+
+
+def test_normalize_text():
+    assert normalize_text('a\r\nb\rc\n\n d  ') == 'a b c d'
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_every_span_maps_back(seed):
+    rng = np.random.default_rng(seed)
+    content = random_html(rng, 30)
+    view = TextView(content)
+    raw = content.encode('utf-8')
+    text = view.text
+    assert text == strip_html(content)
+
+    for start in range(len(text)):
+        for end in range(start + 1, len(text) + 1):
+            span = view.raw_span(start, end)
+            assert span is not None
+            # A collapsed space maps to the first raw character of the
+            # markup or whitespace it replaced, so check spans between
+            # visible characters
+            if text[start].isspace() or text[end - 1].isspace():
+                continue
+            raw_start, raw_end = span
+            piece = raw[raw_start:raw_end].decode('utf-8')
+            assert piece[0] == text[start] and piece[-1] == text[end - 1]
+            assert strip_html(piece) == text[start:end]
+
+
+def test_find_returns_raw_byte_range():
+    content = '<html><body><h1>Café  status</h1>\n<p>Bus <b>reset</b> ✓</p></body></html>'
+    view = TextView(content)
+    assert view.text == 'Café status Bus reset ✓'
+    raw = content.encode('utf-8')
+    start, end = view.find('status Bus reset')
+    assert raw[start:end].decode('utf-8') == 'status</h1>\n<p>Bus <b>reset'
+    assert view.find('missing') is None
+    assert view.find('') is None
+
+
+def test_out_of_range_spans():
+    view = TextView('<p>abc</p>')
+    assert view.raw_span(0, 4) is None
+    assert view.raw_span(2, 2) is None
+    assert view.raw_span(-1, 1) is None
+
+
+def test_text_view_cache():
+    first = get_text_view('<p>x</p>', cache_key='hash-1')
+    assert get_text_view('<p>ignored</p>', cache_key='hash-1') is first
+    assert get_text_view('<p>x</p>') is not first
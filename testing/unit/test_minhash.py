@@ -0,0 +1,51 @@
+"""
+minhash.py: signatures estimate Jaccard similarity, bands find close pairs
+"""
+import pytest
+
+from minhash import BANDS, NUM_PERM, band_hashes, estimate_jaccard, shingles, signature
+
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b)
+
+
+def overlapping_sets(shared, only_a, only_b):
+    common = {f"shared {i}" for i in range(shared)}
+    return common | {f"a {i}" for i in range(only_a)}, common | {f"b {i}" for i in range(only_b)}
+
+
+@pytest.mark.parametrize('shared, only_a, only_b', [
+    (100, 0, 0), (90, 10, 10), (60, 20, 20), (40, 40, 40), (10, 50, 60), (0, 50, 50),
+])
+def test_estimate_tracks_true_jaccard(shared, only_a, only_b):
+    a, b = overlapping_sets(shared, only_a, only_b)
+    estimate = estimate_jaccard(signature(a), signature(b))
+    # Standard error at NUM_PERM = 128 is at most 0.045
+    assert abs(estimate - jaccard(a, b)) < 0.15
+
+
+def test_signature_shape_and_range():
+    sig = signature({"one", "two"})
+    assert len(sig) == NUM_PERM
+    assert all(0 <= v < 2 ** 32 for v in sig)
+    assert sig == signature({"two", "one"})
+    assert signature(set()) == [2 ** 32 - 1] * NUM_PERM
+
+
+def test_bands():
+    a, b = overlapping_sets(95, 3, 3)
+    bands_a, bands_b = band_hashes(signature(a)), band_hashes(signature(b))
+    assert len(bands_a) == BANDS
+    assert all(-2 ** 63 <= h < 2 ** 63 for h in bands_a)
+    assert set(bands_a) & set(bands_b)
+    c, d = overlapping_sets(0, 50, 50)
+    assert not set(band_hashes(signature(c))) & set(band_hashes(signature(d)))
+
+
+def test_shingles():
+    result = shingles('i2cBusReset', {"b": "bus stuck low", "a": "reset"}, 'the Bus resets')
+    assert {'key:i2c', 'key:bus', 'key:reset'} <= result
+    assert shingles('k', {"a": "reset", "b": "bus stuck low"}) == shingles('k', '{"a": "reset", "b": "bus stuck low"}')
+    assert shingles('k', None, 'two words') == {'key:k', 'two', 'words'}
+    assert 'a reset b' in result
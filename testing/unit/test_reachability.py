@@ -0,0 +1,143 @@
+"""
+reachability.py against a brute-force transitive closure
+"""
+import numpy as np
+import pytest
+
+import reachability
+from reachability import ReachabilityIndex, strongly_connected_components
+
+DOMAINS = ('power', 'data')
+
+
+def random_edges(rng, num_nodes, num_edges):
+    return [
+        (int(s), int(t), DOMAINS[int(d)])
+        for s, t, d in zip(
+            rng.integers(0, num_nodes, num_edges),
+            rng.integers(0, num_nodes, num_edges),
+            rng.integers(0, len(DOMAINS), num_edges),
+        )
+    ]
+
+
+def closure(num_nodes, edges, domain):
+    """reach[s, t]: a path of one or more edges of the domain leads s -> t."""
+    reach = np.zeros((num_nodes, num_nodes), dtype=bool)
+    for s, t, d in edges:
+        if d == domain:
+            reach[s, t] = True
+    for k in range(num_nodes):
+        reach |= reach[:, k:k + 1] & reach[k:k + 1, :]
+    return reach
+
+
+def hop_distances(num_nodes, edges, domain, source):
+    dist = [-1] * num_nodes
+    dist[source] = 0
+    frontier = [source]
+    while frontier:
+        nxt = []
+        for u in frontier:
+            for s, t, d in edges:
+                if d == domain and s == u and dist[t] < 0:
+                    dist[t] = dist[u] + 1
+                    nxt.append(t)
+        frontier = nxt
+    return dist
+
+
+def assert_matches_closure(index, num_nodes, edges):
+    for domain in DOMAINS:
+        reach = closure(num_nodes, edges, domain)
+        for s in range(num_nodes):
+            for t in range(num_nodes):
+                expected = s == t or bool(reach[s, t])
+                assert index.reaches(f"n{s}", f"n{t}", domain) == expected, (domain, s, t)
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_scc_matches_mutual_reachability(seed):
+    rng = np.random.default_rng(seed)
+    n = 30
+    edges = random_edges(rng, n, 45)
+    src = np.array([s for s, _, _ in edges])
+    dst = np.array([t for _, t, _ in edges])
+    order = np.argsort(src, kind='stable')
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+
+    comp, ncomp = strongly_connected_components(n, indptr, dst[order])
+    reach = closure(n, [(s, t, 'all') for s, t, _ in edges], 'all') | np.eye(n, dtype=bool)
+    visited = np.flatnonzero(comp >= 0)
+
+    # Visited = nodes with outgoing edges plus everything they reach
+    has_out = np.bincount(src, minlength=n) > 0
+    assert set(visited.tolist()) == set(np.flatnonzero(reach[has_out].any(axis=0)).tolist())
+    assert set(comp[visited].tolist()) == set(range(ncomp))
+    for a in visited.tolist():
+        for b in visited.tolist():
+            assert (comp[a] == comp[b]) == (reach[a, b] and reach[b, a])
+            # Reverse topological numbering
+            if reach[a, b] and comp[a] != comp[b]:
+                assert comp[b] < comp[a]
+
+
+@pytest.mark.parametrize('seed', range(5))
+@pytest.mark.parametrize('limit', [2, 6, reachability.MAX_CLOSURE_COMPONENTS])
+def test_reaches_matches_closure(make_cache, monkeypatch, seed, limit):
+    monkeypatch.setattr(reachability, 'MAX_CLOSURE_COMPONENTS', limit)
+    rng = np.random.default_rng(seed)
+    n = 25
+    edges = random_edges(rng, n, 40)
+    index = ReachabilityIndex(make_cache(n, edges))
+    assert_matches_closure(index, n, edges)
+
+
+@pytest.mark.parametrize('seed', range(5))
+@pytest.mark.parametrize('limit', [2, 6, reachability.MAX_CLOSURE_COMPONENTS])
+def test_incremental_edges_match_rebuild(make_cache, monkeypatch, seed, limit):
+    monkeypatch.setattr(reachability, 'MAX_CLOSURE_COMPONENTS', limit)
+    rng = np.random.default_rng(100 + seed)
+    n = 20
+    edges = random_edges(rng, n, 15)
+    cache = make_cache(n, edges)
+    index = ReachabilityIndex(cache)
+    assert_matches_closure(index, n, edges)
+
+    for k, (s, t, domain) in enumerate(random_edges(rng, n, 15)):
+        position = cache.add_edge({
+            "id": f"x{k}",
+            "source_node_id": f"n{s}",
+            "target_node_id": f"n{t}",
+            "relationship_type": 'depends_on',
+            "cascade_domain": domain,
+        })
+        index.add_edge(position)
+        edges.append((s, t, domain))
+        assert_matches_closure(index, n, edges)
+
+
+def test_hop_distance_matches_bfs(make_cache):
+    rng = np.random.default_rng(7)
+    n = 20
+    edges = random_edges(rng, n, 40)
+    index = ReachabilityIndex(make_cache(n, edges))
+    for domain in DOMAINS:
+        for s in range(n):
+            dist = hop_distances(n, edges, domain, s)
+            for t in range(n):
+                expected = dist[t] if dist[t] >= 0 else None
+                assert index.hop_distance(f"n{s}", f"n{t}", domain) == expected
+                assert index.query(f"n{s}", f"n{t}", domain) == {
+                    "reachable": expected is not None, "hops": expected
+                }
+
+
+def test_unknown_nodes_and_domains(make_cache):
+    index = ReachabilityIndex(make_cache(3, [(0, 1, 'power'), (1, 2, 'power')]))
+    assert index.reaches('n0', 'n2', 'power')
+    assert not index.reaches('n2', 'n0', 'power')
+    assert not index.reaches('n0', 'n2', 'data')
+    assert not index.reaches('n0', 'missing', 'power')
+    assert index.hop_distance('n0', 'n0', 'power') == 0
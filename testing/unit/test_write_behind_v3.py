@@ -0,0 +1,155 @@
+"""
+write_behind_v3.WriteBehindBuffer: journaling, rejected-candidate isolation
+and orphan replay, against a stand-in storage_v3
+"""
+import importlib
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+version3_root = Path(__file__).parent.parent.parent / 'production' / 'Version 3'
+
+
+class FakeConnection:
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def wb(monkeypatch):
+    """write_behind_v3 imported against a fake storage_v3 (and psycopg if missing)"""
+    monkeypatch.syspath_prepend(str(version3_root))
+    try:
+        import psycopg
+    except ImportError:
+        psycopg = types.ModuleType('psycopg')
+        psycopg.OperationalError = type('OperationalError', (Exception,), {})
+        monkeypatch.setitem(sys.modules, 'psycopg', psycopg)
+
+    storage = types.ModuleType('storage_v3')
+    storage.stored = {}
+    storage.down = False
+
+    def get_db_connection():
+        if storage.down:
+            raise psycopg.OperationalError("connection refused")
+        return FakeConnection()
+
+    def stage_extractions_bulk(conn, batch):
+        if any(c.get('bad') for c in batch):
+            raise ValueError('invalid input value for enum candidate_type: "bogus"')
+        staged = []
+        for c in batch:
+            if c['extraction_id'] not in storage.stored:
+                storage.stored[c['extraction_id']] = c
+                staged.append((c['extraction_id'], c['candidate_type'], c['candidate_key']))
+        return staged, []
+
+    storage.get_db_connection = get_db_connection
+    storage.stage_extractions_bulk = stage_extractions_bulk
+    monkeypatch.setitem(sys.modules, 'storage_v3', storage)
+    monkeypatch.delitem(sys.modules, 'write_behind_v3', raising=False)
+    module = importlib.import_module('write_behind_v3')
+    module.storage = storage
+    yield module
+    sys.modules.pop('write_behind_v3', None)
+
+
+def buffer(wb, tmp_path):
+    return wb.WriteBehindBuffer(tmp_path, max_batch=1000, max_delay=1e9)
+
+
+def candidates(count, bad=()):
+    return [
+        {"candidate_type": 'component', "candidate_key": f"c{i}", "bad": i in bad}
+        for i in range(count)
+    ]
+
+
+def crash(buf):
+    """
+    Stop the flusher and drop the journal lock without unlinking (process death)
+
+    Call with the database down: the flusher's last attempt fails and it exits.
+    """
+    assert sys.modules['storage_v3'].down
+    with buf._cond:
+        buf._closed = True
+        buf._retry_at = 0.0
+        buf._cond.notify_all()
+    buf._thread.join(5)
+    buf._journal.close()
+
+
+def test_submit_flush_close(wb, tmp_path):
+    buf = buffer(wb, tmp_path)
+    ids = buf.submit(candidates(10), source_url='https://example.org/a')
+    assert buf.pending() == 10
+    assert buf.flush() == 10
+    assert set(wb.storage.stored) == set(ids)
+    assert wb.storage.stored[ids[0]]['source_metadata']['source_url'] == 'https://example.org/a'
+    buf.close()
+    assert not list(tmp_path.glob('journal-*.jsonl'))
+
+
+def test_rejected_candidates_are_isolated(wb, tmp_path):
+    buf = buffer(wb, tmp_path)
+    ids = buf.submit(candidates(10, bad={3, 7}))
+    assert buf.flush() == 8
+    assert buf.pending() == 0
+    assert buf.stats["skipped"] == 2
+    assert set(wb.storage.stored) == set(ids) - {ids[3], ids[7]}
+    buf.close()
+
+
+def test_unreachable_database_keeps_queue(wb, tmp_path):
+    wb.storage.down = True
+    buf = buffer(wb, tmp_path)
+    buf.submit(candidates(3))
+    assert buf.flush() == 0
+    assert buf.pending() == 3
+    assert buf.stats["failed_flushes"] == 1
+    crash(buf)
+
+
+def test_orphaned_journal_is_replayed(wb, tmp_path):
+    wb.storage.down = True
+    dead = buffer(wb, tmp_path)
+    ids = dead.submit(candidates(4))
+    crash(dead)
+
+    wb.storage.down = False
+    buf = buffer(wb, tmp_path)
+    assert buf.stats["replayed"] == 4
+    assert not dead.journal_path.exists()
+    assert buf.flush() == 4
+    assert set(wb.storage.stored) == set(ids)
+    buf.close()
+
+
+def test_live_journal_is_not_taken_over(wb, tmp_path):
+    wb.storage.down = True
+    live = buffer(wb, tmp_path)
+    live.submit(candidates(2))
+    other = buffer(wb, tmp_path)
+    assert other.stats["replayed"] == 0
+    assert live.journal_path.exists()
+    assert other.pending() == 0
+    crash(other)
+    crash(live)
+
+
+def test_journal_appears_locked(wb, tmp_path):
+    stale = tmp_path / '.journal-1-deadbeef.jsonl.tmp'
+    stale.write_text('')
+    buf = buffer(wb, tmp_path)
+    # Created under a temp name and renamed once locked; stale temps are swept
+    assert not list(tmp_path.glob('.journal-*.tmp'))
+    with open(buf.journal_path, 'a', encoding='utf-8') as f:
+        assert not wb._try_lock(f)
+    buf.close()